@@ -20,12 +20,14 @@ if PARENT_DIR not in sys.path:
 
 # Try relative import first (works for package/module run)
 try:
-    from .resume_parser import extract_text_from_pdf_cached, extract_text_from_docx_cached,extract_text
-    from .skill_extractor import extract_skills_cached
+    from .resume_parser import extract_text_from_pdf_cached, extract_text_from_docx_cached,extract_text, upload_digest
+    from .skill_extractor import stream_resume_skills, stream_jd_skills
+    from .json_repair import repair_stats
 except ImportError:
     # Fallback to absolute import (works for script run)
-    from resume_skill_extractor.resume_parser import extract_text_from_pdf_cached , extract_text_from_docx_cached,extract_text
-    from resume_skill_extractor.skill_extractor import extract_skills_cached
+    from resume_skill_extractor.resume_parser import extract_text_from_pdf_cached , extract_text_from_docx_cached,extract_text, upload_digest
+    from resume_skill_extractor.skill_extractor import stream_resume_skills, stream_jd_skills
+    from resume_skill_extractor.json_repair import repair_stats
     
 
 # ----------------- CONFIG -----------------
@@ -252,9 +254,9 @@ jd_text = None
 
 if resume_file:
     if resume_file.name.endswith(".pdf"):
-        resume_text = extract_text_from_pdf_cached(resume_file.read())
+        resume_text = extract_text_from_pdf_cached(resume_file, upload_digest(resume_file))
     elif resume_file.name.endswith(".docx"):
-        resume_text = extract_text_from_docx_cached(resume_file)
+        resume_text = extract_text_from_docx_cached(resume_file, upload_digest(resume_file))
 
 
 if jd_text_input and jd_text_input.strip():
@@ -266,6 +268,20 @@ if jd_text_input and jd_text_input.strip():
 import streamlit as st
 from io import BytesIO
 
+# --- Progressive skill display ---
+def render_skill_stream(placeholder, title, skills_stream):
+    """Re-render `placeholder` as each streamed skill arrives; returns the full list."""
+    skills = []
+    failed_before = repair_stats()["failed"]
+    placeholder.markdown(f"**{title}** …")
+    for skill in skills_stream:
+        skills.append(skill)
+        placeholder.markdown(f"**{title}** ({len(skills)})  \n" + ", ".join(f"`{s}`" for s in skills))
+    placeholder.markdown(f"**{title}** ({len(skills)})  \n" + (", ".join(f"`{s}`" for s in skills) or "None"))
+    if repair_stats()["failed"] > failed_before:
+        st.error(f"⚠️ JSON parsing failed for {title}: the model's reply could not be read (see the logs).")
+    return skills
+
 # --- Initialize analyzed flag ---
 if "analyzed" not in st.session_state:
     st.session_state.analyzed = False
@@ -292,11 +308,16 @@ if analyze_clicked:
     if not resume_text or not jd_text:
         st.warning("⚠ Please provide both Resume and Job Description.")
     else:
+        # Skills appear in these columns one by one as the LLM streams them
+        live_col1, live_col2 = st.columns(2)
         with st.spinner("⏳ Analyzing skills... Please wait."):
-            resume_skills, jd_skills = extract_skills_cached(
-                resume_text, jd_text,
-                model_choice=model_choice,
-                groq_api_key=groq_api_key
+            resume_skills = render_skill_stream(
+                live_col1.empty(), "📄 Resume Skills",
+                stream_resume_skills(resume_text, groq_api_key, model_choice)
+            )
+            jd_skills = render_skill_stream(
+                live_col2.empty(), "📝 Job Description Skills",
+                stream_jd_skills(jd_text, groq_api_key, model_choice)
             )
             resume_vecs, jd_vecs = embed_skills(resume_skills, jd_skills)
             matches, missing, additional, score = find_matches(resume_skills, jd_skills, resume_vecs, jd_vecs)
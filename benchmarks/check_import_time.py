@@ -0,0 +1,70 @@
+"""
+Import-time budget for library modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and fails
+(exit code 1) when the module's cumulative import time exceeds the budget or when
+a heavy dependency (streamlit, langchain, torch, ...) gets imported eagerly.
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --module jd_skill_gap_analyzer.helper --budget-ms 300
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ["jd_skill_gap_analyzer.helper"]
+FORBIDDEN = ["streamlit", "langchain", "langchain_community", "torch", "sentence_transformers",
+             "spacy", "fitz", "fpdf", "resume_skill_extractor.app"]
+
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)")
+
+
+def measure(module, runs=3):
+    """Best-of-N cumulative import time (ms) plus every module imported on the way."""
+    best, imported, rows = None, set(), []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        rows = []
+        for line in proc.stderr.splitlines():
+            m = LINE_RE.match(line)
+            if m:
+                rows.append((int(m.group(2)), m.group(4)))
+        imported = {name for _, name in rows}
+        total = next((us for us, name in rows if name == module), None)
+        if total is not None and (best is None or total < best):
+            best = total
+    return (best or 0) / 1000.0, imported, sorted(rows, reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", action="append", help="module to check (repeatable)")
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for module in args.module or DEFAULT_MODULES:
+        ms, imported, rows = measure(module, args.runs)
+        heavy = sorted(m for m in imported if m.split(".")[0] in FORBIDDEN or m in FORBIDDEN)
+        status = "OK" if ms <= args.budget_ms and not heavy else "FAIL"
+        ok = ok and status == "OK"
+        print(f"{status} {module}: {ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        for us, name in rows[:5]:
+            print(f"    {us / 1000.0:8.1f} ms  {name}")
+        if heavy:
+            print(f"    eagerly imported: {', '.join(heavy)}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Regression check for prompt compaction.
+
+For every document in a corpus folder (.txt/.pdf/.docx), compares the skills
+found in the raw text with the skills found in the compacted prompt text, and
+reports tokens saved. By default skills come from the local dictionary
+(offline, deterministic); --llm also compares real LLM extractions.
+
+    python benchmarks/compaction_regression.py corpus/ --budget 1500
+    python benchmarks/compaction_regression.py corpus/ --llm --model llama-3.1-8b-instant
+
+Exits with code 1 when any document loses a dictionary skill.
+"""
+import os
+import sys
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jd_skill_gap_analyzer.batch_rank import iter_resume_files  # noqa: E402
+from resume_skill_extractor.prompt_compaction import compact_text  # noqa: E402
+from resume_skill_extractor.skill_dictionary import extract_skills_local  # noqa: E402
+
+
+def llm_skills(text, api_key, model):
+    from resume_skill_extractor.skill_extractor import build_skills_prompt, parse_skills, run_prompt
+    prompt = build_skills_prompt(text, "resume_skills", "Resume")
+    return {s.lower() for s in parse_skills(run_prompt(prompt, model, api_key), "resume_skills")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare skills before/after prompt compaction.")
+    parser.add_argument("corpus", help="folder of resumes / JDs")
+    parser.add_argument("--budget", type=int, default=1500, help="prompt token budget")
+    parser.add_argument("--llm", action="store_true", help="also compare LLM extractions")
+    parser.add_argument("--model", default="llama-3.1-8b-instant")
+    parser.add_argument("--groq-api-key", default=os.getenv("GROQ_API_KEY"))
+    args = parser.parse_args(argv)
+
+    docs = failures = 0
+    original = compacted = 0
+    llm_overlap = []
+    for doc_id, text in iter_resume_files(args.corpus):
+        if not text:
+            continue
+        result = compact_text(text, args.budget)
+        docs += 1
+        original += result.original_tokens
+        compacted += result.compacted_tokens
+
+        lost = set(extract_skills_local(text)) - set(extract_skills_local(result.text))
+        line = f"{doc_id}: {result.original_tokens} → {result.compacted_tokens} tokens"
+        if lost:
+            failures += 1
+            line += f"  LOST {sorted(lost)}"
+        if args.llm:
+            before = llm_skills(text, args.groq_api_key, args.model)
+            after = llm_skills(result.text, args.groq_api_key, args.model)
+            jaccard = len(before & after) / len(before | after) if before | after else 1.0
+            llm_overlap.append(jaccard)
+            line += f"  llm jaccard {jaccard:.2f}"
+        print(line)
+
+    if docs:
+        print(f"\n{docs} documents, {original} → {compacted} tokens "
+              f"({100 * (original - compacted) / max(original, 1):.1f}% saved), "
+              f"{failures} with dictionary-skill loss")
+        if llm_overlap:
+            print(f"mean LLM skill-set jaccard: {sum(llm_overlap) / len(llm_overlap):.3f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
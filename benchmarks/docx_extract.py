@@ -0,0 +1,109 @@
+"""
+DOCX text extraction: python-docx vs the streaming zip/iterparse extractor.
+
+  python-docx        the old path (doc.paragraphs only, tables are missed)
+  python-docx+tables python-docx walking paragraphs and table cells in order
+  streaming          resume_skill_extractor.docx_extract
+
+Reports time and peak Python allocations (tracemalloc) per document, and
+checks the streaming text equals the python-docx+tables text. Documents are
+generated with python-docx unless a folder of real .docx files is given.
+
+    python benchmarks/docx_extract.py
+    python benchmarks/docx_extract.py --docx resumes/
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import docx  # python-docx
+from docx.table import Table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_skill_extractor.docx_extract import extract_docx_text  # noqa: E402
+
+LINE = "Built data pipelines with Python, SQL, Apache Spark and Airflow on AWS; deployed with Docker and Kubernetes."
+GRID = ["Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "AWS", "Terraform"]
+
+
+def make_docx(paragraphs, tables):
+    doc = docx.Document()
+    doc.add_heading("Jane Doe", 0)
+    for t in range(tables):
+        for i in range(paragraphs // max(tables, 1)):
+            doc.add_paragraph(f"{t}.{i} {LINE}")
+        table = doc.add_table(rows=4, cols=4)
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cell.text = GRID[(r * 4 + c) % len(GRID)]
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_paragraphs(data):
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join(p.text.strip() for p in doc.paragraphs if p.text.strip())
+
+
+def _block_lines(container):
+    for block in container.iter_inner_content():
+        if isinstance(block, Table):
+            for row in block.rows:
+                for tc in row._tr.tc_lst:  # raw cells: merged cells are not repeated
+                    yield from _block_lines(docx.table._Cell(tc, block))
+        else:
+            yield block.text.strip()
+
+
+def python_docx_with_tables(data):
+    return "\n".join(line for line in _block_lines(docx.Document(io.BytesIO(data))) if line)
+
+
+def measure(fn, data, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    fn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DOCX extraction benchmark.")
+    parser.add_argument("--docx", help="folder of real .docx files instead of generated ones")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.docx:
+        docs = []
+        for name in sorted(os.listdir(args.docx)):
+            if name.lower().endswith(".docx"):
+                with open(os.path.join(args.docx, name), "rb") as f:
+                    docs.append((name, f.read()))
+    else:
+        docs = [(f"{p}p/{t}t", make_docx(p, t)) for p, t in ((20, 1), (200, 5), (5000, 50))]
+
+    print(f"{'document':>12} {'docx ms':>9} {'docx+tbl ms':>12} {'stream ms':>10} "
+          f"{'docx peak KB':>13} {'stream peak KB':>15} {'table lines':>12} {'same text':>10}")
+    for name, data in docs:
+        old_s, old_peak, old = measure(python_docx_paragraphs, data, args.repeats)
+        full_s, _, full = measure(python_docx_with_tables, data, args.repeats)
+        new_s, new_peak, new = measure(lambda d: extract_docx_text(io.BytesIO(d)), data, args.repeats)
+        gained = len(new.splitlines()) - len(old.splitlines())
+        print(f"{name[:12]:>12} {1000 * old_s:9.1f} {1000 * full_s:12.1f} {1000 * new_s:10.1f} "
+              f"{old_peak / 1024:13.0f} {new_peak / 1024:15.0f} {gained:12d} {str(new == full):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
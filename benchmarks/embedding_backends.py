@@ -0,0 +1,135 @@
+"""
+Compare skill embedding backends: parity, throughput, RSS and cold start.
+
+Each backend runs in its own fresh interpreter (SKILL_EMBEDDING_BACKEND=<name>),
+so cold start and peak RSS are measured honestly. The skill vocabulary is the
+local skill dictionary (canonical names + aliases). Parity replays find_matches
+on random resume/JD skill sets with every backend's vectors and counts decisions
+at the threshold that differ from the first backend.
+
+    python benchmarks/embedding_backends.py --backends huggingface onnx
+    SKILL_EMBEDDING_ONNX_DIR=models/minilm-onnx SKILL_EMBEDDING_THREADS=4 \\
+        python benchmarks/embedding_backends.py --backends huggingface onnx --batch-size 64
+
+Exits with code 1 when any match decision changes.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+START = time.perf_counter()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def vocabulary():
+    from resume_skill_extractor.skill_dictionary import SKILL_ALIASES
+    words = []
+    for canonical, aliases in SKILL_ALIASES.items():
+        words.append(canonical)
+        words.extend(aliases)
+    return list(dict.fromkeys(words))
+
+
+# ---------------- WORKER (one backend per process) ----------------
+def run_worker(out_path, passes):
+    import resource
+    import numpy as np
+    from jd_skill_gap_analyzer.embeddings import EMBEDDING_BACKEND, get_embedding_model
+
+    texts = vocabulary()
+    model = get_embedding_model()
+    vectors = np.asarray(model.embed_documents(texts), dtype=np.float32)
+    cold_start = time.perf_counter() - START
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        model.embed_documents(texts)
+    elapsed = time.perf_counter() - start
+
+    np.save(out_path, vectors)
+    print(json.dumps({
+        "backend": EMBEDDING_BACKEND,
+        "cold_start_s": round(cold_start, 2),
+        "texts_per_s": round(passes * len(texts) / elapsed, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+# ---------------- PARITY ----------------
+def decisions(vectors, pairs, threshold):
+    from jd_skill_gap_analyzer.helper import match_skills
+    out = []
+    for resume_idx, jd_idx in pairs:
+        matched, missing, _, _, _ = match_skills(
+            resume_idx.tolist(), jd_idx.tolist(), vectors[resume_idx], vectors[jd_idx], threshold=threshold)
+        out.append(({(j, r) for j, r, _ in matched}, set(missing)))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Embedding backend parity and performance.")
+    parser.add_argument("--backends", nargs="+", default=["huggingface", "onnx"])
+    parser.add_argument("--batch-size", type=int, help="SKILL_EMBEDDING_BATCH_SIZE for the workers")
+    parser.add_argument("--threads", type=int, help="SKILL_EMBEDDING_THREADS for the workers")
+    parser.add_argument("--passes", type=int, default=5, help="throughput passes over the vocabulary")
+    parser.add_argument("--pairs", type=int, default=300, help="random resume/JD skill sets for parity")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.passes)
+        return 0
+
+    import numpy as np
+
+    env = dict(os.environ)
+    if args.batch_size:
+        env["SKILL_EMBEDDING_BATCH_SIZE"] = str(args.batch_size)
+    if args.threads:
+        env["SKILL_EMBEDDING_THREADS"] = str(args.threads)
+
+    results, vectors = [], {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            out = os.path.join(tmp, f"{backend}.npy")
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", out, "--passes", str(args.passes)],
+                env={**env, "SKILL_EMBEDDING_BACKEND": backend}, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{backend}: failed\n{proc.stderr[-2000:]}")
+                continue
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+            vectors[backend] = np.load(out)
+
+    print(f"{'backend':>12} {'cold start':>11} {'texts/s':>9} {'peak RSS':>9}")
+    for r in results:
+        print(f"{r['backend']:>12} {r['cold_start_s']:>10.2f}s {r['texts_per_s']:>9.1f} {r['peak_rss_mb']:>7.1f}MB")
+
+    if len(vectors) < 2:
+        return 0
+    rng = np.random.default_rng(0)
+    n = len(next(iter(vectors.values())))
+    pairs = [(rng.choice(n, rng.integers(5, 30), replace=False), rng.choice(n, rng.integers(5, 20), replace=False))
+             for _ in range(args.pairs)]
+    names = list(vectors)  # first backend is the reference
+    baseline = decisions(vectors[names[0]], pairs, args.threshold)
+    changed = 0
+    for name in names[1:]:
+        a, b = vectors[names[0]], vectors[name]
+        cos = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+        diffs = sum(d != base for d, base in zip(decisions(b, pairs, args.threshold), baseline))
+        changed += diffs
+        print(f"parity {name} vs {names[0]}: min vector cosine {cos.min():.4f}, "
+              f"{diffs}/{len(pairs)} skill sets with a different decision at {args.threshold}")
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
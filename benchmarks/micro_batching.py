@@ -0,0 +1,90 @@
+"""
+Throughput / latency of embedding under concurrent sessions, with and without
+the micro-batcher.
+
+Simulates `--sessions` threads that each embed `--skills` short skill strings
+`--rounds` times. By default the model is a cost model (fixed per-call overhead
+plus per-text cost) so the effect of coalescing is visible without a download;
+--model uses the real embedding backend.
+
+    python benchmarks/micro_batching.py --sessions 32 --wait-ms 5
+    python benchmarks/micro_batching.py --model --sessions 16
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jd_skill_gap_analyzer.micro_batcher import MicroBatcher  # noqa: E402
+
+
+def cost_model(overhead_ms, per_text_ms):
+    lock = threading.Lock()  # one forward pass at a time, like a single model instance
+
+    def embed(texts):
+        with lock:
+            time.sleep((overhead_ms + per_text_ms * len(texts)) / 1000.0)
+        return [np.zeros(384, dtype=np.float32) for _ in texts]
+    return embed
+
+
+def run(embed, sessions, skills, rounds):
+    latencies = []
+    lat_lock = threading.Lock()
+
+    def session(i):
+        for r in range(rounds):
+            texts = [f"skill {i}-{r}-{j}" for j in range(skills)]
+            start = time.perf_counter()
+            embed(texts)
+            with lat_lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1000
+    return sessions * skills * rounds / elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Embedding micro-batching benchmark.")
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--skills", type=int, default=8, help="skills per request")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--wait-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--overhead-ms", type=float, default=8, help="cost model: per forward pass")
+    parser.add_argument("--per-text-ms", type=float, default=0.3, help="cost model: per text")
+    parser.add_argument("--model", action="store_true", help="use the real embedding backend")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        from jd_skill_gap_analyzer.embeddings import get_embedding_model
+        model = get_embedding_model()
+        model.embed_documents(["warm up"])
+        embed = model.embed_documents
+    else:
+        embed = cost_model(args.overhead_ms, args.per_text_ms)
+
+    batcher = MicroBatcher(embed, max_batch_size=args.max_batch, max_wait_ms=args.wait_ms)
+    print(f"{'mode':>12} {'texts/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, fn in (("direct", embed), ("microbatch", batcher)):
+        tput, p50, p99 = run(fn, args.sessions, args.skills, args.rounds)
+        print(f"{name:>12} {tput:9.1f} {p50:8.1f} {p99:8.1f}")
+    print(f"batches: {batcher.stats()}")
+    batcher.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
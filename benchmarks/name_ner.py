@@ -0,0 +1,93 @@
+"""
+Startup and per-document latency of the spaCy name fallback.
+
+  startup   spacy.load of the full en_core_web_sm vs the NER-only pipeline,
+            each in a fresh interpreter
+  per doc   NER over the whole resume (old behaviour) vs the header window
+  batch     header-window NER one document at a time vs one nlp.pipe pass
+
+Also counts documents where header-window NER finds a different name than
+whole-text NER.
+
+    python benchmarks/name_ner.py corpus/
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jd_skill_gap_analyzer.batch_rank import iter_resume_files  # noqa: E402
+from resume_skill_extractor.ner import NER_EXCLUDED_PIPES, SPACY_MODEL, get_nlp, header_window  # noqa: E402
+
+LOAD_SNIPPET = "import time, spacy; t = time.perf_counter(); spacy.load({model!r}{extra}); print(time.perf_counter() - t)"
+
+
+def load_time(extra, runs):
+    code = LOAD_SNIPPET.format(model=SPACY_MODEL, extra=extra)
+    best = None  # (process wall time, spacy.load time) of the fastest run
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - start
+        load = float(out.stdout.strip())
+        if best is None or wall < best[0]:
+            best = (wall, load)
+    return best
+
+
+def first_person(doc):
+    for ent in doc.ents:
+        if ent.label_ == "PERSON" and len(ent.text.split()) >= 2:
+            return ent.text.strip()
+    return "Candidate"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="spaCy name-fallback benchmark.")
+    parser.add_argument("corpus", help="folder of resumes (.pdf/.docx/.txt)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh-interpreter runs for startup timing")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    full_wall, full_load = load_time("", args.runs)
+    trim_wall, trim_load = load_time(f", exclude={NER_EXCLUDED_PIPES!r}", args.runs)
+    print(f"startup  full pipeline: load {full_load:.2f}s (process {full_wall:.2f}s)")
+    print(f"startup  NER only:      load {trim_load:.2f}s (process {trim_wall:.2f}s)")
+
+    texts = [text for _, text in iter_resume_files(args.corpus) if text]
+    if not texts:
+        print("no documents found")
+        return 1
+    import spacy
+    full_nlp = spacy.load(SPACY_MODEL)
+    nlp = get_nlp()
+    headers = [header_window(t) for t in texts]
+
+    start = time.perf_counter()
+    full_names = [first_person(full_nlp(t)) for t in texts]
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    header_names = [first_person(nlp(h)) for h in headers]
+    header_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    piped = [first_person(doc) for doc in nlp.pipe(headers, batch_size=args.batch_size)]
+    pipe_s = time.perf_counter() - start
+
+    n = len(texts)
+    print(f"per doc  full text, full pipeline: {1000 * full_s / n:7.2f} ms")
+    print(f"per doc  header window, NER only:  {1000 * header_s / n:7.2f} ms")
+    print(f"per doc  header window, nlp.pipe:  {1000 * pipe_s / n:7.2f} ms")
+    differing = sum(a != b for a, b in zip(full_names, header_names))
+    print(f"{n} documents; {differing} with a different name from header-window NER; "
+          f"pipe == loop: {piped == header_names}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Near-duplicate grouping at several thresholds.
+
+For a corpus folder (or a synthetic pool of resumes with light edits and exact
+re-submissions), reports how many documents would reuse an earlier extraction
+instead of calling the LLM, the dedup ratio, and the MinHash cost per document.
+On the synthetic pool it also counts misses (an edited copy not grouped with
+its original) and false merges (two different resumes grouped together).
+
+    python benchmarks/near_dup.py
+    python benchmarks/near_dup.py --corpus resumes/
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_skill_extractor.near_dup import group_near_duplicates, minhash_signature  # noqa: E402
+
+VOCAB = ("engineer built pipelines python sql spark airflow aws docker kubernetes team led project data "
+         "model analytics dashboards reporting stakeholders improved latency reduced cost designed "
+         "services api testing mentoring migration platform").split()
+
+
+def synthetic_pool(originals, edited, resubmitted, edit_words, seed=0):
+    """(texts, origin index per text): originals, lightly edited copies and exact re-submissions."""
+    rng = random.Random(seed)
+    base = []
+    for i in range(originals):
+        lines = [" ".join(rng.choice(VOCAB) for _ in range(12)) for _ in range(40)]
+        base.append(f"Candidate {i}\n" + "\n".join(lines))
+    texts, origin = list(base), list(range(originals))
+    for _ in range(edited):
+        i = rng.randrange(originals)
+        words = base[i].split(" ")
+        for _ in range(edit_words):
+            words[rng.randrange(len(words))] = rng.choice(VOCAB)
+        texts.append(" ".join(words))
+        origin.append(i)
+    for _ in range(resubmitted):
+        i = rng.randrange(originals)
+        texts.append(base[i])
+        origin.append(i)
+    return texts, origin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate grouping benchmark.")
+    parser.add_argument("--corpus", help="folder of resumes (.pdf/.docx/.txt)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.85, 0.9, 0.95])
+    parser.add_argument("--originals", type=int, default=500)
+    parser.add_argument("--edited", type=int, default=300)
+    parser.add_argument("--resubmitted", type=int, default=200)
+    parser.add_argument("--edit-words", type=int, default=5, help="words changed per edited copy")
+    args = parser.parse_args(argv)
+
+    origin = None
+    if args.corpus:
+        from jd_skill_gap_analyzer.batch_rank import iter_resume_files
+        texts = [text for _, text in iter_resume_files(args.corpus) if text]
+    else:
+        texts, origin = synthetic_pool(args.originals, args.edited, args.resubmitted, args.edit_words)
+
+    start = time.perf_counter()
+    for text in texts:
+        minhash_signature(text)
+    per_doc = (time.perf_counter() - start) / len(texts)
+    print(f"{len(texts)} documents; MinHash {1000 * per_doc:.2f} ms/doc")
+
+    print(f"{'threshold':>9} {'groups':>7} {'calls saved':>12} {'dedup ratio':>12} {'missed':>7} {'false merges':>13}")
+    for threshold in args.thresholds:
+        reps = group_near_duplicates(texts, threshold)
+        saved = sum(rep != i for i, rep in enumerate(reps))
+        line = f"{threshold:9.2f} {len(texts) - saved:7d} {saved:12d} {saved / len(texts):12.3f}"
+        if origin is not None:
+            missed = sum(rep == i and origin[i] != i for i, rep in enumerate(reps))
+            false = sum(rep != i and origin[rep] != origin[i] for i, rep in enumerate(reps))
+            line += f" {missed:7d} {false:13d}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
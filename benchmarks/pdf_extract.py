@@ -0,0 +1,83 @@
+"""
+PDF text extraction on 1 / 10 / 100-page documents.
+
+Compares the old `text += page.get_text()` loop with the page-streaming
+extractor (joined once), serial and with a process pool. Documents are
+generated with PyMuPDF unless a folder of real PDFs is given.
+
+    python benchmarks/pdf_extract.py --workers 4
+    python benchmarks/pdf_extract.py --pdfs portfolio_pdfs/ --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+import fitz  # PyMuPDF
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_skill_extractor.pdf_extract import extract_pdf_text, get_pdf_pool  # noqa: E402
+
+LINE = "Built data pipelines with Python, SQL, Apache Spark and Airflow on AWS; deployed with Docker and Kubernetes."
+
+
+def make_pdf(pages, lines_per_page=45):
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        for i in range(lines_per_page):
+            page.insert_text((40, 40 + 16 * i), f"{p}.{i} {LINE}"[:110], fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def concat_extract(data):
+    pdf_document = fitz.open(stream=data, filetype="pdf")
+    text = ""
+    for page in pdf_document:
+        text += page.get_text()
+    return text.strip()
+
+
+def timed(fn, repeats):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF extraction benchmark.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pdfs", help="folder of real PDFs instead of generated ones")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.pdfs:
+        docs = []
+        for name in sorted(os.listdir(args.pdfs)):
+            if name.lower().endswith(".pdf"):
+                with open(os.path.join(args.pdfs, name), "rb") as f:
+                    docs.append((name, f.read()))
+    else:
+        docs = [(f"{n} pages", make_pdf(n)) for n in args.pages]
+
+    get_pdf_pool(args.workers).submit(int).result()  # spawn workers outside the timings
+    print(f"{'document':>14} {'concat ms':>10} {'stream ms':>10} {'pool ms':>9} {'same text':>10}")
+    for name, data in docs:
+        concat_s, expected = timed(lambda: concat_extract(data), args.repeats)
+        stream_s, streamed = timed(lambda: extract_pdf_text(data, workers=1).strip(), args.repeats)
+        pool_s, pooled = timed(lambda: extract_pdf_text(data, workers=args.workers).strip(), args.repeats)
+        print(f"{name[:14]:>14} {1000 * concat_s:10.1f} {1000 * stream_s:10.1f} {1000 * pool_s:9.1f} "
+              f"{str(expected == streamed == pooled):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Recall / latency benchmark of the taxonomy ANN index against exact search.
+
+By default runs on a synthetic clustered taxonomy (no model download needed);
+--index benchmarks a real index built with `python -m jd_skill_gap_analyzer.taxonomy_index`,
+querying it with perturbed copies of its own vectors (or with --queries skill names).
+
+    python benchmarks/taxonomy_ann.py --size 50000 --dim 384
+    python benchmarks/taxonomy_ann.py --index taxonomy_index --queries extracted_skills.txt
+
+Reports recall@1 / recall@k versus brute force and per-batch latency for each nprobe.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jd_skill_gap_analyzer.taxonomy_index import SkillTaxonomyIndex, load_taxonomy  # noqa: E402
+
+
+def synthetic_taxonomy(size, dim, seed=0):
+    """Clustered unit vectors, roughly like skill families in embedding space."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, size // 100), dim))
+    vectors = centers[rng.integers(0, len(centers), size)] + 0.6 * rng.normal(size=(size, dim))
+    return [f"skill-{i}" for i in range(size)], vectors.astype(np.float32)
+
+
+def timed(fn, repeats):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Taxonomy ANN recall/latency vs exact search.")
+    parser.add_argument("--index", help="existing index directory (default: build a synthetic one)")
+    parser.add_argument("--queries", help="text file of skill names to embed as queries")
+    parser.add_argument("--size", type=int, default=50000, help="synthetic taxonomy size")
+    parser.add_argument("--dim", type=int, default=384, help="synthetic vector dimension")
+    parser.add_argument("--nlist", type=int)
+    parser.add_argument("--backend", choices=["auto", "numpy", "faiss"], default="numpy")
+    parser.add_argument("--n-queries", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=64, help="queries per search call")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.index:
+            index = SkillTaxonomyIndex.load(args.index)
+        else:
+            names, vectors = synthetic_taxonomy(args.size, args.dim)
+            build_s, index = timed(lambda: SkillTaxonomyIndex.build(
+                names, vectors, tmp, nlist=args.nlist, backend=args.backend), 1)
+            print(f"build: {build_s:.1f} s")
+        print(f"index: {len(index)} skills, dim {index.dim}, {index.backend}, nlist {index.meta['nlist']}")
+
+        if args.queries:
+            from jd_skill_gap_analyzer.embeddings import embed_texts
+            queries = embed_texts(load_taxonomy(args.queries))
+        else:
+            rows = rng.choice(len(index), args.n_queries)
+            if index.vectors is not None:
+                stored = np.asarray(index.vectors[rows])
+            else:
+                stored = index.faiss_index.reconstruct_batch(rows)
+            queries = stored + 0.3 * rng.normal(size=stored.shape) / np.sqrt(index.dim)
+        batches = [queries[i:i + args.batch_size] for i in range(0, len(queries), args.batch_size)]
+
+        exact_s, exact = timed(lambda: [index.search_exact(b, args.k) for b in batches], args.repeats)
+        exact_ids = np.vstack([ids for _, ids in exact])
+        print(f"{'search':>12} {'recall@1':>9} {'recall@' + str(args.k):>9} {'ms/batch':>9} {'speedup':>8}")
+        print(f"{'exact':>12} {1.0:9.3f} {1.0:9.3f} {1000 * exact_s / len(batches):9.2f} {1.0:8.1f}")
+
+        for nprobe in args.nprobe:
+            ann_s, ann = timed(lambda: [index.search(b, args.k, nprobe=nprobe) for b in batches], args.repeats)
+            ann_ids = np.vstack([ids for _, ids in ann])
+            recall1 = float(np.mean(ann_ids[:, 0] == exact_ids[:, 0]))
+            recall_k = float(np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(ann_ids, exact_ids)]))
+            print(f"{'nprobe=' + str(nprobe):>12} {recall1:9.3f} {recall_k:9.3f} "
+                  f"{1000 * ann_s / len(batches):9.2f} {exact_s / ann_s:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Peak memory per document: copied inputs vs zero-copy inputs.
+
+Each mode runs in a fresh interpreter and reports how far peak RSS rose above
+the baseline taken after imports (and after the upload buffer exists, for the
+upload modes; Streamlit holds that buffer either way).
+
+  upload-read    old app path: UploadedFile.read() → bytes, hashed by st.cache_data
+  upload-file    the UploadedFile itself, read in place, cache key = its SHA-256
+  disk-read      old batch path: open(path).read() → bytes
+  disk-path      parser opens the file by path, hash streamed from disk
+  disk-mmap      parser reads an mmap of the file in place
+
+disk-mmap reads in place too, but RSS counts the mapped file pages it touches
+(page cache, shared and reclaimable), so its peak looks like disk-read's.
+
+The default document is a 40-page PDF with an incompressible image per page
+(about 20 MB); pass --pdf to use a real file.
+
+    python benchmarks/zero_copy_inputs.py
+    python benchmarks/zero_copy_inputs.py --pdf portfolio.pdf
+"""
+import io
+import os
+import sys
+import mmap
+import json
+import argparse
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ["upload-read", "upload-file", "disk-read", "disk-path", "disk-mmap"]
+
+
+def make_pdf(path, pages):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_text((40, 40), f"Page {p}: Python, SQL, Apache Spark, Airflow, Docker, Kubernetes", fontsize=9)
+        pixmap = fitz.Pixmap(fitz.csRGB, 420, 420, os.urandom(420 * 420 * 3), False)
+        page.insert_image(fitz.Rect(40, 60, 460, 480), pixmap=pixmap)
+    doc.save(path)
+    doc.close()
+
+
+def peak_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_mode(mode, path):
+    """Child process: extract `path` the way `mode` does and print the peak RSS increase."""
+    import streamlit as st
+    from resume_skill_extractor.pdf_extract import extract_pdf_text
+    from resume_skill_extractor.file_source import source_digest
+    from resume_skill_extractor.resume_parser import extract_text_from_pdf_cached
+
+    @st.cache_data
+    def old_cached(file_bytes):  # the previous extract_text_from_pdf_cached signature
+        return extract_pdf_text(file_bytes).strip()
+
+    upload = None
+    if mode.startswith("upload"):
+        with open(path, "rb") as f:
+            upload = io.BytesIO(f.read())  # what Streamlit's UploadedFile holds
+    base = peak_kb()
+
+    if mode == "upload-read":
+        text = old_cached(upload.read())
+    elif mode == "upload-file":
+        text = extract_text_from_pdf_cached(upload, source_digest(upload))
+    elif mode == "disk-read":
+        with open(path, "rb") as f:
+            text = old_cached(f.read())
+    elif mode == "disk-path":
+        text = extract_text_from_pdf_cached(path)
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = extract_text_from_pdf_cached(mapped)
+    print(json.dumps({"mode": mode, "peak_increase_kb": peak_kb() - base, "chars": len(text)}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zero-copy input memory benchmark.")
+    parser.add_argument("--pdf", help="PDF to extract (default: a generated ~20 MB PDF)")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        run_mode(args.mode, args.pdf)
+        return 0
+
+    path = args.pdf
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(), "large.pdf")
+        make_pdf(path, args.pages)
+    print(f"{os.path.basename(path)}: {os.path.getsize(path) / 2**20:.1f} MB")
+    print(f"{'mode':>14} {'peak +MB':>9} {'chars':>8}")
+    env = {**os.environ, "PDF_EXTRACT_WORKERS": "0"}
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, "--pdf", path, "--mode", mode],
+                             capture_output=True, text=True, check=True, env=env)
+        row = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{mode:>14} {row['peak_increase_kb'] / 1024:9.1f} {row['chars']:8d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
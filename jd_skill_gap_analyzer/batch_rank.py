@@ -0,0 +1,243 @@
+"""
+Batch ranking: score one job description against a pool of resumes.
+
+The JD is extracted and embedded once; resumes are streamed in chunks, each
+chunk's skills extracted concurrently through the bulk dispatcher
+(resume_skill_extractor.async_dispatch) and scored against the cached JD matrix
+with one matrix product. Every scored resume is appended to the output file as soon
+as its chunk finishes, and the top-k rows are returned at the end.
+
+CLI:
+    python -m jd_skill_gap_analyzer.batch_rank --jd jd.txt --resumes resumes/ \\
+        --top-k 20 --output ranked.jsonl
+"""
+import os
+import csv
+import sys
+import json
+import heapq
+import argparse
+import numpy as np
+from jd_skill_gap_analyzer.embeddings import embed_texts
+from jd_skill_gap_analyzer.helper import _normalized_matrix
+from jd_skill_gap_analyzer.taxonomy_index import taxonomy_labels
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+OUTPUT_FIELDS = ["rank", "resume_id", "score", "matched", "missing"]
+
+
+# ---------------- INPUT ----------------
+def load_resume_text(path: str) -> str:
+    """Read a PDF, DOCX or plain-text resume from disk."""
+    lower = path.lower()
+    if lower.endswith(".txt"):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read().strip()
+
+    from resume_skill_extractor.resume_parser import (
+        extract_text_from_pdf_cached, extract_text_from_docx_cached,
+    )
+    # Opened by path: no in-memory copy of the file, cache key streamed from disk
+    if lower.endswith(".pdf"):
+        return extract_text_from_pdf_cached(path)
+    if lower.endswith(".docx"):
+        return extract_text_from_docx_cached(path)
+    return ""
+
+
+def iter_resume_files(directory: str):
+    """Yield (resume_id, text) for every supported file under `directory`, in sorted order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, directory), load_resume_text(path)
+
+
+# ---------------- SCORING ----------------
+def _taxonomy_labels(skills, vectors, label_cache):
+    """taxonomy_labels, looked up once per distinct skill across calls sharing `label_cache`."""
+    if label_cache is None:
+        return taxonomy_labels(skills, vectors)
+    todo = {}
+    for i, skill in enumerate(skills):
+        if skill not in label_cache:
+            todo.setdefault(skill, i)
+    if todo:
+        labels = taxonomy_labels(list(todo), vectors[list(todo.values())])
+        if labels is None:
+            return None
+        label_cache.update(zip(todo, labels))
+    return [label_cache[skill] for skill in skills]
+
+
+def score_chunk(jd_skills, jd_matrix, chunk, threshold=0.7, label_cache=None):
+    """
+    Score a chunk of (resume_id, resume_skills) against a normalized JD matrix.
+    All resume skills in the chunk are embedded in one call and compared with
+    one matrix product; per-resume best matches come from a segmented max.
+    Decisions match helper.match_skills for the same vectors. Pass the same
+    `label_cache` dict for every chunk of a run to map each skill to the
+    taxonomy only once.
+    """
+    all_skills = [skill for _, skills in chunk for skill in skills]
+    n_jd = len(jd_skills)
+    best = np.zeros((n_jd, len(chunk)), dtype=np.float32)
+    vectors = None
+
+    if all_skills and n_jd:
+        vectors = _normalized_matrix(embed_texts(all_skills))
+        sims = jd_matrix @ vectors.T
+        lengths = np.array([len(skills) for _, skills in chunk])
+        non_empty = np.flatnonzero(lengths)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+        best[:, non_empty] = np.maximum.reduceat(sims, offsets, axis=1)
+
+    is_match = np.maximum(best, 0.0) >= threshold
+
+    # SKILL_TAXONOMY_MAPPING: a resume skill on the same taxonomy entry as a JD skill matches it
+    jd_labels = _taxonomy_labels(jd_skills, jd_matrix, label_cache) if vectors is not None else None
+    if jd_labels is not None:
+        jd_by_label = {}
+        for j, label in enumerate(jd_labels):
+            if label is not None:
+                jd_by_label.setdefault(label, []).append(j)
+        owners = np.repeat(np.arange(len(chunk)), [len(skills) for _, skills in chunk])
+        for s, label in enumerate(_taxonomy_labels(all_skills, vectors, label_cache)):
+            for j in jd_by_label.get(label, ()):
+                is_match[j, owners[s]] = True
+    rows = []
+    for c, (resume_id, _) in enumerate(chunk):
+        matched = [jd_skills[j] for j in np.flatnonzero(is_match[:, c])]
+        missing = [jd_skills[j] for j in np.flatnonzero(~is_match[:, c])]
+        score = round((len(matched) / n_jd) * 100, 2) if n_jd else 0.0
+        rows.append({"resume_id": resume_id, "score": score, "matched": matched, "missing": missing})
+    return rows
+
+
+# ---------------- OUTPUT ----------------
+class RankingWriter:
+    """Append scored rows to a .jsonl or .csv file as they are produced."""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_csv = path.lower().endswith(".csv")
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        if self.is_csv:
+            self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS[1:])
+            self._csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self._csv:
+                self._csv.writerow({**row, "matched": "; ".join(row["matched"]),
+                                    "missing": "; ".join(row["missing"])})
+            else:
+                self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------- RANKING ----------------
+def rank_resumes(jd_text, resumes, groq_api_key=None, model_choice="llama-3.1-8b-instant",
+                 top_k=10, threshold=0.7, output_path=None, chunk_size=64, jd_skills=None, mode=None):
+    """
+    Rank `resumes` (iterable of (resume_id, resume_text)) against one JD.
+    Returns the top-k rows sorted by score, each
+    {"rank", "resume_id", "score", "matched", "missing"}.
+    Every scored row is streamed to `output_path` (.jsonl or .csv) when given.
+    Skills are extracted without Streamlit's in-memory cache (it has no bound
+    outside the app); LLM replies still come from the shared SQLite cache.
+    """
+    from resume_skill_extractor.async_dispatch import extract_skills_bulk
+    from resume_skill_extractor.skill_extractor import SKILL_KINDS, extract_document_skills
+    from resume_skill_extractor.skill_canonical import canonicalize_skills
+
+    if jd_skills is None:
+        key, label = SKILL_KINDS["jd"]
+        jd_skills = extract_document_skills(jd_text, key, label, groq_api_key, model_choice, mode)
+    else:
+        jd_skills = canonicalize_skills(jd_skills)
+    jd_matrix = _normalized_matrix(embed_texts(jd_skills)) if jd_skills else None
+
+    writer = RankingWriter(output_path) if output_path else None
+    heap, seq = [], 0
+    label_cache = {}
+
+    def flush(ids, texts):
+        nonlocal seq
+        skills = extract_skills_bulk(texts, kind="resume", groq_api_key=groq_api_key,
+                                     model_choice=model_choice, mode=mode)
+        rows = score_chunk(jd_skills, jd_matrix, list(zip(ids, skills)), threshold, label_cache)
+        if writer:
+            writer.write(rows)
+        for row in rows:
+            # Ties keep input order: earlier resumes rank higher
+            item = (row["score"], -seq, row)
+            seq += 1
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+    try:
+        ids, texts = [], []
+        for resume_id, resume_text in resumes:
+            ids.append(resume_id)
+            texts.append(resume_text or "")
+            if len(ids) >= chunk_size:
+                flush(ids, texts)
+                ids, texts = [], []
+        if ids:
+            flush(ids, texts)
+    finally:
+        if writer:
+            writer.close()
+
+    ranked = [row for _, _, row in sorted(heap, key=lambda item: item[:2], reverse=True)]
+    return [{"rank": i + 1, **row} for i, row in enumerate(ranked)]
+
+
+# ---------------- CLI ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a folder of resumes against one job description.")
+    parser.add_argument("--jd", required=True, help="job description text file")
+    parser.add_argument("--resumes", required=True, help="folder of PDF/DOCX/TXT resumes")
+    parser.add_argument("--output", help="stream every scored resume to this .jsonl or .csv file")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--model", default="llama-3.1-8b-instant")
+    parser.add_argument("--mode", choices=["auto", "augment", "local", "llm"],
+                        help="skill extraction mode (default: SKILL_EXTRACTION_MODE or auto)")
+    parser.add_argument("--groq-api-key", default=os.getenv("GROQ_API_KEY"))
+    args = parser.parse_args(argv)
+
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_text = f.read().strip()
+
+    top = rank_resumes(
+        jd_text, iter_resume_files(args.resumes),
+        groq_api_key=args.groq_api_key, model_choice=args.model,
+        top_k=args.top_k, threshold=args.threshold,
+        output_path=args.output, chunk_size=args.chunk_size, mode=args.mode,
+    )
+
+    for row in top:
+        print(f"{row['rank']:>3}. {row['score']:6.2f}%  {row['resume_id']}  "
+              f"(matched {len(row['matched'])}, missing {len(row['missing'])})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+import contextlib
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+DEFAULT_CACHE_DIR = os.getenv(
+    "SKILL_EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "genai_career_strategist", "skill_embeddings"),
+)
+DEFAULT_CAPACITY = int(os.getenv("SKILL_EMBEDDING_CACHE_SIZE", "50000"))
+DEFAULT_DTYPE = os.getenv("SKILL_EMBEDDING_CACHE_DTYPE", "float16")
+
+KEY_BYTES = 16
+
+
+# ---------------- KEYS ----------------
+def normalize_skill_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a skill string."""
+    return " ".join(str(text).strip().lower().split())
+
+
+def skill_key(text: str, model_name: str) -> bytes:
+    """Content address of a skill embedding: hash of model name + normalized text."""
+    payload = f"{model_name}\x00{normalize_skill_text(text)}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=KEY_BYTES).digest()
+
+
+# ---------------- CACHE ----------------
+class SkillEmbeddingCache:
+    """
+    On-disk, content-addressed store of skill embeddings for one model.
+
+    Layout (one directory per model and dtype):
+      meta.json      model name, vector dim, dtype, capacity, slot count, LRU clock,
+                     write generation
+      keys.npy       (capacity, 16) uint8 hashes, memory-mapped
+      vectors.npy    (capacity, dim) float16/float32 vectors, memory-mapped
+      last_used.npy  (capacity,) int64 LRU ticks, memory-mapped
+      lock           flock target shared by every process using the store
+
+    The cache holds at most `capacity` vectors; when full, the least recently
+    used slot is overwritten. Several processes may share one store: writes
+    take an exclusive file lock and first re-read what other processes wrote
+    (meta.json's generation tells when the key table has to be re-indexed);
+    reads take a shared lock and check the slot still holds the requested key.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, model_name="", capacity=DEFAULT_CAPACITY,
+                 dtype=DEFAULT_DTYPE):
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self.model_name = model_name
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        slug = hashlib.blake2b(f"{model_name}\x00{self.dtype.name}".encode("utf-8"), digest_size=8).hexdigest()
+        self.path = os.path.join(cache_dir, slug)
+
+        self.dim = None
+        self.count = 0
+        self.tick = 0
+        self.generation = -1
+        self.hits = 0
+        self.misses = 0
+        self._index = {}
+        self._keys = self._vectors = self._last_used = None
+        self._lock = threading.Lock()
+        with self._store_lock(shared=True):
+            self._sync()
+
+    # ---------- storage ----------
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    @contextlib.contextmanager
+    def _store_lock(self, shared=False):
+        """Thread lock plus an flock on the store's lock file (shared for reads, exclusive for writes)."""
+        with self._lock:
+            if fcntl is None:  # no flock (Windows): in-process locking only
+                yield
+                return
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._file("lock"), "a+") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_meta(self):
+        try:
+            with open(self._file("meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("model") != self.model_name or meta.get("dtype") != self.dtype.name:
+            return None
+        return meta
+
+    def _sync(self):
+        """Pick up slots, evictions and the clock written by other processes (store lock held)."""
+        meta = self._read_meta()
+        if meta is None:
+            return
+        try:
+            if self._vectors is None:
+                self._keys = np.load(self._file("keys.npy"), mmap_mode="r+")
+                self._vectors = np.load(self._file("vectors.npy"), mmap_mode="r+")
+                self._last_used = np.load(self._file("last_used.npy"), mmap_mode="r+")
+            self.dim = int(meta["dim"])
+            self.capacity = int(meta["capacity"])
+            count, generation = int(meta["count"]), int(meta.get("generation", 0))
+        except (OSError, ValueError, KeyError):
+            self._keys = self._vectors = self._last_used = None
+            return
+
+        if generation != self.generation:
+            self._index = {self._keys[i].tobytes(): i for i in range(count)}
+            self.generation = generation
+        self.count = count
+        # Hits only touch the memory-mapped ticks, so the clock may be ahead of meta.json
+        self.tick = max(self.tick, int(meta["tick"]), int(self._last_used[:count].max(initial=0)))
+
+    def _create(self, dim):
+        """Create the store files (exclusive store lock held, no readable store on disk)."""
+        os.makedirs(self.path, exist_ok=True)
+        open_memmap = np.lib.format.open_memmap
+        self._keys = open_memmap(self._file("keys.npy"), mode="w+", dtype=np.uint8,
+                                 shape=(self.capacity, KEY_BYTES))
+        self._vectors = open_memmap(self._file("vectors.npy"), mode="w+", dtype=self.dtype,
+                                    shape=(self.capacity, dim))
+        self._last_used = open_memmap(self._file("last_used.npy"), mode="w+", dtype=np.int64,
+                                      shape=(self.capacity,))
+        self.dim = dim
+        self.count = 0
+        self.tick = 0
+        self.generation = -1
+        self._index = {}
+
+    def _flush(self):
+        """Persist the arrays, then meta.json with a new generation (exclusive store lock held)."""
+        if self._vectors is None:
+            return
+        for arr in (self._keys, self._vectors, self._last_used):
+            arr.flush()
+        self.generation += 1
+        meta = {
+            "model": self.model_name,
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "capacity": self.capacity,
+            "count": self.count,
+            "tick": self.tick,
+            "generation": self.generation,
+        }
+        tmp = self._file(f"meta.json.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file("meta.json"))
+
+    def flush(self):
+        """Persist memory-mapped arrays and metadata."""
+        with self._store_lock():
+            self._flush()
+
+    # ---------- lookups ----------
+    def _touch(self, slot):
+        self.tick += 1
+        self._last_used[slot] = self.tick
+
+    def _free_slot(self):
+        if self.count < self.capacity:
+            slot = self.count
+            self.count += 1
+            return slot
+        # Full → evict least recently used
+        slot = int(np.argmin(self._last_used[:self.capacity]))
+        self._index.pop(self._keys[slot].tobytes(), None)
+        return slot
+
+    def _get(self, key):
+        slot = self._index.get(key)
+        if slot is not None and self._keys[slot].tobytes() != key:
+            # Another process evicted this slot since our index was built
+            del self._index[key]
+            slot = None
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(slot)
+        return np.array(self._vectors[slot], dtype=np.float32)  # a copy; the slot may be reused
+
+    def _put(self, key, vec):
+        if self._vectors is None:
+            self._create(vec.shape[0])
+        elif vec.shape[0] != self.dim:
+            logger.warning("Not caching a %d-dim vector in a %d-dim store at %s", vec.shape[0], self.dim, self.path)
+            return
+        slot = self._index.get(key)
+        if slot is None or self._keys[slot].tobytes() != key:
+            slot = self._free_slot()
+            self._keys[slot] = np.frombuffer(key, dtype=np.uint8)
+            self._index[key] = slot
+        self._vectors[slot] = vec
+        self._touch(slot)
+
+    def get(self, text):
+        """Return the cached vector for `text` (a float32 copy) or None."""
+        with self._store_lock(shared=True):
+            self._sync()
+            if self._vectors is None:
+                self.misses += 1
+                return None
+            return self._get(skill_key(text, self.model_name))
+
+    def put(self, text, vector):
+        """Store one vector under `text`."""
+        self.put_many([text], [vector])
+
+    def put_many(self, texts, vectors):
+        """Store vectors under one exclusive lock, after syncing with other processes."""
+        with self._store_lock():
+            self._sync()
+            for text, vector in zip(texts, vectors):
+                self._put(skill_key(text, self.model_name), np.asarray(vector, dtype=np.float32).ravel())
+            self._flush()
+
+    def embed(self, texts, embed_fn):
+        """
+        Embed `texts` through the cache.
+        Only unique cache misses are sent to `embed_fn` (list[str] -> list[vector]),
+        in a single call. Returns a float32 array of shape (len(texts), dim).
+        Fresh vectors are rounded through the store dtype, so a skill scores the
+        same on the run that embeds it as on every later, cached run.
+        """
+        texts = list(texts)
+        with self._store_lock(shared=True):
+            self._sync()
+            if self._vectors is None:
+                vectors = [None] * len(texts)
+                self.misses += len(texts)
+            else:
+                vectors = [self._get(skill_key(t, self.model_name)) for t in texts]
+
+        pending = {}
+        for t, vec in zip(texts, vectors):
+            if vec is None:
+                pending.setdefault(normalize_skill_text(t), t)
+
+        if pending:
+            fresh = [np.asarray(vec, dtype=np.float32).astype(self.dtype).astype(np.float32)
+                     for vec in embed_fn(list(pending.values()))]
+            self.put_many(list(pending.values()), fresh)
+            computed = dict(zip(pending, fresh))
+            vectors = [
+                vec if vec is not None else computed[normalize_skill_text(t)]
+                for t, vec in zip(texts, vectors)
+            ]
+
+        if not vectors:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def stats(self):
+        return {"entries": self.count, "capacity": self.capacity,
+                "hits": self.hits, "misses": self.misses}
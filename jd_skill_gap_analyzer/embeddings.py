@@ -0,0 +1,188 @@
+import os
+import logging
+import threading
+import numpy as np
+from jd_skill_gap_analyzer.micro_batcher import MICROBATCH_ENABLED, MicroBatcher
+
+# ---------------- CONFIG ----------------
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = os.getenv("SKILL_EMBEDDING_BACKEND", "huggingface")
+EMBEDDING_BATCH_SIZE = int(os.getenv("SKILL_EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_THREADS = int(os.getenv("SKILL_EMBEDDING_THREADS", "0"))  # 0 = runtime default
+ONNX_MODEL_DIR = os.getenv("SKILL_EMBEDDING_ONNX_DIR", "")
+ONNX_MODEL_FILE = os.getenv("SKILL_EMBEDDING_ONNX_FILE", "model_quantized.onnx")
+MAX_SEQ_LENGTH = 256  # all-MiniLM-L6-v2's sentence-transformers limit
+MODEL_SERVER_URL = os.getenv("MODEL_SERVER_URL", "").rstrip("/")  # see resume_skill_extractor.model_server
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_model = None
+_cache = None
+_batcher = None
+
+
+# ---------------- BACKENDS ----------------
+# Every backend exposes embed_documents(list[str]) -> list/array of vectors
+# for EMBEDDING_MODEL_NAME, so the rest of the app does not care which runs.
+class OnnxEmbeddings:
+    """
+    all-MiniLM-L6-v2 on ONNX Runtime (CPU), typically the int8-quantized export.
+
+    `model_dir` needs tokenizer.json plus the ONNX graph (`model_file`); mean
+    pooling over the attention mask and L2 normalization reproduce the
+    sentence-transformers pipeline.
+    """
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR, model_file=ONNX_MODEL_FILE,
+                 batch_size=EMBEDDING_BATCH_SIZE, threads=EMBEDDING_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        if not model_dir:
+            raise ValueError("SKILL_EMBEDDING_ONNX_DIR must point at the exported ONNX model folder")
+        self.batch_size = max(1, batch_size)
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(os.path.join(model_dir, model_file), options,
+                                            providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _embed_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]  # (batch, tokens, dim)
+        weights = mask[:, :, None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([self._embed_batch(texts[i:i + self.batch_size])
+                          for i in range(0, len(texts), self.batch_size)]).astype(np.float32)
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def _huggingface_backend():
+    from langchain.embeddings import HuggingFaceEmbeddings
+    if EMBEDDING_THREADS:
+        import torch
+        torch.set_num_threads(EMBEDDING_THREADS)
+    return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME,
+                                 encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE})
+
+
+def _onnx_backend():
+    return OnnxEmbeddings()
+
+
+# name → (factory, cache namespace); vectors from different backends never share cache entries
+EMBEDDING_BACKENDS = {
+    "huggingface": (_huggingface_backend, EMBEDDING_MODEL_NAME),
+    "onnx": (_onnx_backend, f"{EMBEDDING_MODEL_NAME}#onnx"),
+}
+
+
+def register_embedding_backend(name, factory, cache_namespace=None):
+    """Add a backend selectable through SKILL_EMBEDDING_BACKEND."""
+    EMBEDDING_BACKENDS[name] = (factory, cache_namespace or f"{EMBEDDING_MODEL_NAME}#{name}")
+
+
+def _backend_entry():
+    if EMBEDDING_BACKEND not in EMBEDDING_BACKENDS:
+        raise ValueError(f"SKILL_EMBEDDING_BACKEND must be one of {sorted(EMBEDDING_BACKENDS)}")
+    return EMBEDDING_BACKENDS[EMBEDDING_BACKEND]
+
+
+def export_onnx_model(model_dir, quantize=True, model_name=EMBEDDING_MODEL_NAME):
+    """
+    Export `model_name` to `model_dir` (model.onnx + tokenizer.json) with optimum,
+    then, unless quantize=False, write the int8 ONNX_MODEL_FILE next to it.
+    """
+    from optimum.exporters.onnx import main_export
+    main_export(model_name, output=model_dir, task="feature-extraction")
+    if quantize:
+        quantize_onnx_model(os.path.join(model_dir, "model.onnx"), os.path.join(model_dir, ONNX_MODEL_FILE))
+    return model_dir
+
+
+def quantize_onnx_model(src_path, dst_path):
+    """Dynamic int8 quantization of an exported ONNX model (weights only; no calibration data)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(src_path, dst_path, weight_type=QuantType.QInt8)
+    return dst_path
+
+
+# ---------------- SHARED PROVIDER ----------------
+def get_embedding_model():
+    """
+    Process-wide embedding backend (SKILL_EMBEDDING_BACKEND), loaded on first use.
+    Importing this module never touches langchain, torch or onnxruntime.
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                factory, _ = _backend_entry()
+                _model = factory()
+    return _model
+
+
+def get_embedding_cache():
+    """Process-wide persistent skill embedding cache for the active backend."""
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                from jd_skill_gap_analyzer.embedding_cache import SkillEmbeddingCache
+                _, namespace = _backend_entry()
+                _cache = SkillEmbeddingCache(model_name=namespace)
+    return _cache
+
+
+def get_micro_batcher():
+    """Process-wide micro-batcher in front of the embedding model (SKILL_EMBEDDING_MICROBATCH)."""
+    global _batcher
+    if _batcher is None:
+        with _lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(lambda batch: get_embedding_model().embed_documents(batch))
+    return _batcher
+
+
+def embed_documents_local(batch):
+    """Embed with this process's model (through the micro-batcher when enabled)."""
+    if MICROBATCH_ENABLED:
+        return get_micro_batcher()(batch)
+    return get_embedding_model().embed_documents(batch)
+
+
+def _embed_misses(batch):
+    if MODEL_SERVER_URL:
+        from resume_skill_extractor.model_server import ModelServerError, remote_embed
+        try:
+            # Only vectors from the same model/backend (and dim) may enter this namespace's cache
+            return remote_embed(batch, namespace=_backend_entry()[1], dim=get_embedding_cache().dim)
+        except ModelServerError as e:
+            logger.warning("%s; embedding in-process instead", e)
+    return embed_documents_local(batch)
+
+
+def embed_texts(texts):
+    """Embed a list of strings through the cache; the model only loads on a miss."""
+    return get_embedding_cache().embed(texts, _embed_misses)
@@ -1,20 +1,7 @@
-import sys
-import os
-from resume_skill_extractor.skill_extractor import extract_skills_cached
-from resume_skill_extractor.app import resume_text, jd_text
-from langchain_community.embeddings import OllamaEmbeddings
-from resume_skill_extractor.resume_parser import extract_candidate_name_llm
 import numpy as np
-import streamlit as st
-from langchain.embeddings import HuggingFaceEmbeddings
-from fpdf import FPDF
-sys.path.append(os.path.abspath("..")) 
-
-# Initialize Embedding model
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")   # default llama2
-
-# Load secrets
-groq_api_key = st.secrets["GROQ_API_KEY"]
+from jd_skill_gap_analyzer.embeddings import embed_texts
+from jd_skill_gap_analyzer.taxonomy_index import taxonomy_labels
+from resume_skill_extractor.skill_canonical import canonical_skill_id
 
 
 def embed_skills(resume_skills, jd_skills):
@@ -24,8 +11,10 @@ def embed_skills(resume_skills, jd_skills):
     if not isinstance(jd_skills, list):
         raise ValueError("jd_skills must be a list of strings")
 
-    resume_vectors = embeddings.embed_documents(resume_skills)
-    jd_vectors = embeddings.embed_documents(jd_skills)
+    # One cache pass for both sides so shared misses hit the model once
+    vectors = embed_texts(resume_skills + jd_skills)
+    resume_vectors = vectors[:len(resume_skills)]
+    jd_vectors = vectors[len(resume_skills):]
 
     return resume_vectors, jd_vectors
 
@@ -37,41 +26,96 @@ def cosine_sim(vec1, vec2):
     return dot / (mag_vec1 * mag_vec2)
 
 
-def find_matches(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold=0.7):
-    if not jd_skills:
-        return [], [], 0.0
-    
+def _normalized_matrix(vectors):
+    """Stack vectors into a float32 matrix with unit-length rows (zero rows stay zero)."""
+    mat = np.asarray(vectors, dtype=np.float32)
+    if mat.ndim != 2:
+        mat = mat.reshape(len(vectors), -1)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def similarity_matrix(resume_vectors, jd_vectors):
+    """Cosine similarity of every JD skill (rows) against every resume skill (columns)."""
+    if len(jd_vectors) == 0 or len(resume_vectors) == 0:
+        return np.zeros((len(jd_vectors), len(resume_vectors)), dtype=np.float32)
+    return _normalized_matrix(jd_vectors) @ _normalized_matrix(resume_vectors).T
+
+
+def match_skills(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold=0.7):
+    """
+    Vectorized matching engine.
+    Returns (matched_skills, missing_skills, additional_skills, score, sim_matrix)
+    where sim_matrix has shape (len(jd_skills), len(resume_skills)).
+    """
+    sims = similarity_matrix(resume_vectors, jd_vectors)
+
+    if sims.shape[1]:
+        best_idx = sims.argmax(axis=1)
+        best_sim = sims[np.arange(sims.shape[0]), best_idx]
+    else:
+        best_idx = np.zeros(sims.shape[0], dtype=np.intp)
+        best_sim = np.zeros(sims.shape[0], dtype=np.float32)
+
+    # A JD skill only gets a resume counterpart when its best similarity is positive
+    has_best = best_sim > 0
+    best_sim = np.where(has_best, best_sim, 0.0)
+    is_match = best_sim >= threshold
+
+    # SKILL_TAXONOMY_MAPPING: skills mapped to the same taxonomy entry match too
+    jd_labels = taxonomy_labels(jd_skills, jd_vectors)
+    resume_labels = taxonomy_labels(resume_skills, resume_vectors) if jd_labels is not None else None
+    if resume_labels:
+        by_label = {}
+        for i, label in enumerate(resume_labels):
+            if label is not None:
+                by_label.setdefault(label, i)
+        for j, label in enumerate(jd_labels):
+            if not is_match[j] and label in by_label:
+                best_idx[j] = by_label[label]
+                best_sim[j] = max(float(sims[j, best_idx[j]]), 0.0)
+                has_best[j] = is_match[j] = True
+
     matched_skills = []
     missing_skills = []
-
     for j, jd_skill in enumerate(jd_skills):
-        best_sim = 0
-        best_resume_skill = None
-
-        for i, resume_skill in enumerate(resume_skills):
-            sim = cosine_sim(resume_vectors[i], jd_vectors[j])
-            if sim > best_sim:
-                best_sim = sim
-                best_resume_skill = resume_skill
-
-        if best_sim >= threshold:
-            matched_skills.append((jd_skill, best_resume_skill, round(best_sim, 3)))
+        if is_match[j]:
+            resume_skill = resume_skills[best_idx[j]] if has_best[j] else None
+            matched_skills.append((jd_skill, resume_skill, round(float(best_sim[j]), 3)))
         else:
             missing_skills.append(jd_skill)
 
-     # ➕ Additional skills = in resume but not in JD
-    additional_skills = [skill for skill in resume_skills if skill not in jd_skills]
+    # ➕ Additional skills = in resume but not in JD (compared on canonical skill IDs,
+    # so "pytorch" on the resume is not "additional" to "PyTorch" in the JD; with
+    # SKILL_TAXONOMY_MAPPING, also on taxonomy entries)
+    jd_ids = {canonical_skill_id(skill) for skill in jd_skills}
+    jd_taxonomy = set(jd_labels or ()) - {None}
+    additional_skills = [skill for i, skill in enumerate(resume_skills)
+                         if canonical_skill_id(skill) not in jd_ids
+                         and not (resume_labels and resume_labels[i] in jd_taxonomy)]
 
-    score = round((len(matched_skills) / len(jd_skills)) * 100, 2)
-    return matched_skills, missing_skills, additional_skills, score
+    score = round((len(matched_skills) / len(jd_skills)) * 100, 2) if jd_skills else 0.0
+    return matched_skills, missing_skills, additional_skills, score, sims
 
 
+def find_matches(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold=0.7):
+    if not jd_skills:
+        return [], [], 0.0
+
+    matched_skills, missing_skills, additional_skills, score, _ = match_skills(
+        resume_skills, jd_skills, resume_vectors, jd_vectors, threshold=threshold
+    )
+    return matched_skills, missing_skills, additional_skills, score
+
 
 
 
 
 # ----------------- PDF REPORT -----------------
 def generate_report(candidate_name,resume_skills, jd_skills, matched_skills, missing_skills, additional_skills, score, logo_path="logo.png"):
+    from fpdf import FPDF  # imported on demand to keep helper cheap to import
+
     pdf = FPDF()
     pdf.add_page()
 
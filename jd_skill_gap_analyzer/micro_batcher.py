@@ -0,0 +1,124 @@
+"""
+Process-wide micro-batching of embedding requests.
+
+Concurrent Streamlit sessions each embed a handful of skills. Instead of one
+tiny forward pass per session, requests are queued and a single worker thread
+coalesces them (up to `max_batch_size` texts, or whatever arrived within
+`max_wait_ms` of the first request) into one batched call. Each caller gets its
+own slice of the result back through a Future.
+
+Enabled with SKILL_EMBEDDING_MICROBATCH=1; embed_texts then routes cache misses
+through get_micro_batcher().
+"""
+import os
+import queue
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+MICROBATCH_ENABLED = os.getenv("SKILL_EMBEDDING_MICROBATCH", "").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("SKILL_EMBEDDING_MICROBATCH_WAIT_MS", "5"))
+MICROBATCH_MAX_SIZE = int(os.getenv("SKILL_EMBEDDING_MICROBATCH_MAX", "64"))
+
+
+class MicroBatcher:
+    """
+    Coalesces `fn(list[str]) -> list[vector]` calls from many threads.
+
+    A request is never split: one larger than `max_batch_size` runs on its own,
+    and a request that would overflow the current batch waits for the next one.
+    The wait after the first queued request is bounded by `max_wait_ms`, which
+    bounds the latency added to any single caller.
+    """
+
+    def __init__(self, fn, max_batch_size=MICROBATCH_MAX_SIZE, max_wait_ms=MICROBATCH_MAX_WAIT_MS):
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._carry = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "texts": 0, "batches": 0, "max_batch": 0}
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="embedding-microbatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, texts) -> Future:
+        """Queue `texts`; the Future resolves to their vectors, in order."""
+        future = Future()
+        texts = list(texts)
+        if not texts:
+            future.set_result([])
+            return future
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        self._queue.put((texts, future))
+        return future
+
+    def __call__(self, texts):
+        return self.submit(texts).result()
+
+    # ---------- worker ----------
+    def _next_batch(self):
+        first = self._carry or self._queue.get()
+        self._carry = None
+        if first is None:
+            return None
+        batch, size = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # re-deliver the shutdown signal after this batch
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            texts = [t for item_texts, _ in batch for t in item_texts]
+            try:
+                vectors = list(self.fn(texts))
+            except Exception as e:
+                logger.warning("Embedding batch of %d texts failed: %s", len(texts), e)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            start = 0
+            for item_texts, future in batch:
+                future.set_result(vectors[start:start + len(item_texts)])
+                start += len(item_texts)
+            with self._stats_lock:
+                self._stats["requests"] += len(batch)
+                self._stats["texts"] += len(texts)
+                self._stats["batches"] += 1
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(texts))
+
+    def close(self, timeout=5.0):
+        """Finish queued requests, then stop the worker."""
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["texts_per_batch"] = round(stats["texts"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
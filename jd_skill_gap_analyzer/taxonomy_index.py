@@ -0,0 +1,353 @@
+"""
+Approximate nearest-neighbour index over a skill taxonomy.
+
+Maps extracted skills to the closest canonical skill among tens of thousands
+without a brute-force scan. Two backends share one on-disk layout:
+
+  numpy  IVF (inverted file): spherical k-means centroids; vectors stored
+         contiguously per cluster; a query scans only its `nprobe` closest clusters
+  faiss  IndexIVFFlat (inner product), used when faiss is installed
+
+Layout of an index directory:
+  meta.json       model, dim, backend, nlist, count
+  names.json      canonical skill names, in index order
+  centroids.npy   (nlist, dim) float32              [numpy]
+  offsets.npy     (nlist + 1,) int64 cluster bounds [numpy]
+  vectors.npy     (count, dim) float32, unit rows   [numpy]
+  index.faiss                                       [faiss]
+Arrays are memory-mapped on load, so opening a large index is cheap. `model`
+is the embedding namespace the taxonomy was embedded with; loading it for
+another model fails.
+
+With SKILL_TAXONOMY_MAPPING on, skill matching (helper.match_skills and
+batch_rank) also matches a JD skill to a resume skill that maps to the same
+taxonomy entry.
+
+Build offline:
+    python -m jd_skill_gap_analyzer.taxonomy_index --taxonomy skills.txt --out taxonomy_index
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+import threading
+import numpy as np
+
+# ---------------- CONFIG ----------------
+TAXONOMY_INDEX_DIR = os.getenv("SKILL_TAXONOMY_INDEX_DIR")
+DEFAULT_NPROBE = int(os.getenv("SKILL_TAXONOMY_NPROBE", "8"))
+TAXONOMY_MAPPING = os.getenv("SKILL_TAXONOMY_MAPPING", "").lower() in ("1", "true", "yes")
+TAXONOMY_MIN_SCORE = float(os.getenv("SKILL_TAXONOMY_MIN_SCORE", "0.7"))
+
+logger = logging.getLogger(__name__)
+
+
+def _unit_rows(vectors):
+    mat = np.ascontiguousarray(vectors, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat.reshape(1, -1)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def _faiss():
+    try:
+        import faiss
+        return faiss
+    except ImportError:
+        return None
+
+
+def _top_k(scores, ids, k):
+    """Per-row top-k of (scores, ids), sorted by descending score."""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(
+        np.take_along_axis(ids, part, axis=1), order, axis=1)
+
+
+def spherical_kmeans(vectors, nlist, n_iter=20, sample_size=None, seed=0):
+    """Cosine k-means centroids (unit rows) trained on at most `sample_size` vectors."""
+    rng = np.random.default_rng(seed)
+    sample_size = sample_size or max(nlist * 256, 10000)
+    train = vectors if len(vectors) <= sample_size else vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = (train @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, train)
+        counts = np.bincount(assign, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty clusters with random training points
+            sums[empty] = train[rng.choice(len(train), int(empty.sum()), replace=False)]
+        centroids = _unit_rows(sums)
+    return centroids
+
+
+# ---------------- INDEX ----------------
+class SkillTaxonomyIndex:
+    """Batched nearest-canonical-skill search over a saved taxonomy index."""
+
+    def __init__(self, path, names, meta, centroids=None, offsets=None, vectors=None, faiss_index=None):
+        self.path = path
+        self.names = names
+        self.meta = meta
+        self.dim = int(meta["dim"])
+        self.backend = meta["backend"]
+        self.centroids = centroids
+        self.offsets = offsets
+        self.vectors = vectors
+        self.faiss_index = faiss_index
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    # ---------- build ----------
+    @classmethod
+    def build(cls, names, vectors, path, nlist=None, backend="auto", model_name="", n_iter=20, seed=0):
+        """Train and save an index for `names` / `vectors` under `path`, then load it."""
+        vectors = _unit_rows(vectors)
+        if len(names) != len(vectors):
+            raise ValueError("names and vectors must have the same length")
+        nlist = min(len(names), nlist or max(1, int(4 * np.sqrt(len(names)))))
+        faiss = _faiss() if backend in ("auto", "faiss") else None
+        if backend == "faiss" and faiss is None:
+            raise ImportError("faiss is not installed; use backend='numpy'")
+        backend = "faiss" if faiss is not None else "numpy"
+
+        os.makedirs(path, exist_ok=True)
+        if backend == "faiss":
+            quantizer = faiss.IndexFlatIP(vectors.shape[1])
+            index = faiss.IndexIVFFlat(quantizer, vectors.shape[1], nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.add(vectors)
+            faiss.write_index(index, os.path.join(path, "index.faiss"))
+        else:
+            centroids = spherical_kmeans(vectors, nlist, n_iter=n_iter, seed=seed)
+            assign = (vectors @ centroids.T).argmax(axis=1)
+            order = np.argsort(assign, kind="stable")
+            offsets = np.zeros(nlist + 1, dtype=np.int64)
+            np.cumsum(np.bincount(assign, minlength=nlist), out=offsets[1:])
+            vectors = vectors[order]
+            names = [names[i] for i in order]
+            np.save(os.path.join(path, "centroids.npy"), centroids)
+            np.save(os.path.join(path, "offsets.npy"), offsets)
+            np.save(os.path.join(path, "vectors.npy"), vectors)
+
+        with open(os.path.join(path, "names.json"), "w", encoding="utf-8") as f:
+            json.dump(list(names), f, ensure_ascii=False)
+        meta = {"model": model_name, "dim": int(vectors.shape[1]), "backend": backend,
+                "nlist": int(nlist), "count": len(names)}
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path, model_name=None):
+        """
+        Open a saved index; numpy arrays are memory-mapped, faiss lists are mmapped too.
+        With `model_name`, an index embedded with another model raises ValueError.
+        """
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if model_name is not None and meta.get("model") != model_name:
+            raise ValueError(f"taxonomy index at {path} was embedded with {meta.get('model')!r}, "
+                             f"not {model_name!r}; rebuild it")
+        with open(os.path.join(path, "names.json"), "r", encoding="utf-8") as f:
+            names = json.load(f)
+        if meta["backend"] == "faiss":
+            faiss = _faiss()
+            if faiss is None:
+                raise ImportError(f"index at {path} was built with faiss, which is not installed")
+            index = faiss.read_index(os.path.join(path, "index.faiss"), faiss.IO_FLAG_MMAP)
+            return cls(path, names, meta, faiss_index=index)
+        return cls(
+            path, names, meta,
+            centroids=np.load(os.path.join(path, "centroids.npy")),
+            offsets=np.load(os.path.join(path, "offsets.npy")),
+            vectors=np.load(os.path.join(path, "vectors.npy"), mmap_mode="r"),
+        )
+
+    # ---------- search ----------
+    def search(self, query_vectors, k=1, nprobe=DEFAULT_NPROBE):
+        """
+        Approximate top-k for a batch of query vectors.
+        Returns (scores, ids), both shaped (n_queries, k); ids are -1 where fewer
+        than k candidates were scanned.
+        """
+        queries = _unit_rows(query_vectors)
+        if self.faiss_index is not None:
+            with self._lock:
+                self.faiss_index.nprobe = nprobe
+                return self.faiss_index.search(queries, k)
+
+        n = len(queries)
+        if n == 0:
+            return np.full((0, k), -np.inf, dtype=np.float32), np.full((0, k), -1, dtype=np.int64)
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        # One matmul per probed cluster pays off once queries share clusters (large
+        # batches); scattered small batches are cheaper with one matvec per query
+        if len(np.unique(probes)) < n:
+            return self._search_by_cluster(queries, probes, k)
+        return self._search_by_query(queries, probes, k)
+
+    def _search_by_query(self, queries, probes, k):
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        offsets = self.offsets
+        for row, clusters in enumerate(probes):
+            candidates = np.concatenate([np.arange(offsets[c], offsets[c + 1]) for c in clusters])
+            if not len(candidates):
+                continue
+            sims = np.asarray(self.vectors[candidates]) @ queries[row]
+            top = min(k, len(candidates))
+            part = np.argpartition(-sims, top - 1)[:top]
+            order = part[np.argsort(-sims[part])]
+            best_scores[row, :top] = sims[order]
+            best_ids[row, :top] = candidates[order]
+        return best_scores, best_ids
+
+    def _search_by_cluster(self, queries, probes, k):
+        # Candidate matrix: probe slot p of query q owns columns [p*width, (p+1)*width)
+        n, nprobe = probes.shape
+        offsets = self.offsets
+        sizes = np.diff(offsets)
+        width = max(int(sizes[probes].max()), 1)
+        scores = np.full((n, nprobe * width), -np.inf, dtype=np.float32)
+        flat_scores = scores.reshape(-1)
+        pairs = probes.reshape(-1)
+        order = np.argsort(pairs, kind="stable")
+        for group in np.split(order, np.flatnonzero(np.diff(pairs[order])) + 1):
+            c = pairs[group[0]]
+            size = int(sizes[c])
+            if not size:
+                continue
+            rows = group // nprobe
+            starts = rows * (nprobe * width) + (group % nprobe) * width
+            flat_scores[(starts[:, None] + np.arange(size)).reshape(-1)] = (
+                queries[rows] @ np.asarray(self.vectors[offsets[c]:offsets[c + 1]]).T).reshape(-1)
+
+        top = min(k, scores.shape[1])
+        best_scores = np.full((n, k), -np.inf, dtype=np.float32)
+        best_ids = np.full((n, k), -1, dtype=np.int64)
+        cols = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        rank = np.argsort(-np.take_along_axis(scores, cols, axis=1), axis=1)
+        cols = np.take_along_axis(cols, rank, axis=1)
+        best_scores[:, :top] = np.take_along_axis(scores, cols, axis=1)
+        best_ids[:, :top] = offsets[np.take_along_axis(probes, cols // width, axis=1)] + cols % width
+        best_ids[~np.isfinite(best_scores)] = -1
+        return best_scores, best_ids
+
+    def search_exact(self, query_vectors, k=1):
+        """Brute-force top-k over every taxonomy vector (reference for recall)."""
+        if self.faiss_index is not None:
+            # Probing every inverted list is an exhaustive scan
+            return self.search(query_vectors, k, nprobe=self.faiss_index.nlist)
+        queries = _unit_rows(query_vectors)
+        sims = queries @ np.asarray(self.vectors).T
+        return _top_k(sims, np.broadcast_to(np.arange(sims.shape[1]), sims.shape), k)
+
+    def nearest(self, query_vectors, min_score=0.0, nprobe=DEFAULT_NPROBE):
+        """[(canonical_name, score) or None] per query vector, e.g. the output of embed_skills."""
+        scores, ids = self.search(query_vectors, k=1, nprobe=nprobe)
+        return [
+            (self.names[i], round(float(s), 3)) if i >= 0 and s >= min_score else None
+            for s, i in zip(scores[:, 0], ids[:, 0])
+        ]
+
+
+# ---------------- SHARED INSTANCE ----------------
+_lock = threading.Lock()
+_index = None
+_load_failed = False
+
+
+def get_taxonomy_index():
+    """
+    Index at SKILL_TAXONOMY_INDEX_DIR (loaded once), or None when it is not
+    configured or was embedded with another model than the active backend.
+    """
+    global _index, _load_failed
+    if _index is None and not _load_failed and TAXONOMY_INDEX_DIR \
+            and os.path.exists(os.path.join(TAXONOMY_INDEX_DIR, "meta.json")):
+        with _lock:
+            if _index is None and not _load_failed:
+                from jd_skill_gap_analyzer.embeddings import _backend_entry
+                try:
+                    _index = SkillTaxonomyIndex.load(TAXONOMY_INDEX_DIR, model_name=_backend_entry()[1])
+                except ValueError as e:
+                    _load_failed = True
+                    logger.warning("%s; taxonomy mapping is off", e)
+    return _index
+
+
+def map_to_taxonomy(skills, vectors, min_score=TAXONOMY_MIN_SCORE, index=None):
+    """
+    {skill: canonical taxonomy name} for skills whose nearest taxonomy entry
+    scores at least `min_score`; `vectors` are the skills' embeddings.
+    """
+    index = index or get_taxonomy_index()
+    if index is None or not len(skills):
+        return {}
+    return {skill: hit[0] for skill, hit in zip(skills, index.nearest(vectors, min_score)) if hit}
+
+
+def taxonomy_labels(skills, vectors, min_score=TAXONOMY_MIN_SCORE, index=None):
+    """
+    Nearest taxonomy name (or None) per skill, for the matching flow. None when
+    SKILL_TAXONOMY_MAPPING is off or no index is available (unless `index` is given).
+    """
+    if index is None:
+        index = get_taxonomy_index() if TAXONOMY_MAPPING else None
+        if index is None:
+            return None
+    if not len(skills):
+        return []
+    return [hit[0] if hit else None for hit in index.nearest(vectors, min_score)]
+
+
+# ---------------- CLI ----------------
+def load_taxonomy(path):
+    """Skill names from a .txt (one per line) or .json (list, or {canonical: aliases}) file."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            names = list(data) if isinstance(data, (list, dict)) else []
+        else:
+            names = [line.strip() for line in f]
+    return list(dict.fromkeys(n for n in names if n))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the skill taxonomy ANN index.")
+    parser.add_argument("--taxonomy", required=True, help=".txt (one skill per line) or .json file")
+    parser.add_argument("--out", required=True, help="index directory to write")
+    parser.add_argument("--nlist", type=int, help="number of IVF clusters (default: 4*sqrt(N))")
+    parser.add_argument("--backend", choices=["auto", "numpy", "faiss"], default="auto")
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args(argv)
+
+    from jd_skill_gap_analyzer.embeddings import _backend_entry, get_embedding_model
+
+    names = load_taxonomy(args.taxonomy)
+    model = get_embedding_model()
+    # Embedded straight through the model: the taxonomy would flood the skill embedding cache
+    vectors = np.vstack([
+        np.asarray(model.embed_documents(names[i:i + args.batch_size]), dtype=np.float32)
+        for i in range(0, len(names), args.batch_size)
+    ])
+    index = SkillTaxonomyIndex.build(names, vectors, args.out, nlist=args.nlist,
+                                     backend=args.backend, model_name=_backend_entry()[1])
+    print(f"Indexed {len(index)} skills ({index.backend}, nlist={index.meta['nlist']}) → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
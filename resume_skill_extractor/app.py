@@ -18,11 +18,11 @@ if PARENT_DIR not in sys.path:
 
 # Try relative import first (works for package/module run)
 try:
-    from .resume_parser import extract_text_from_pdf_cached, extract_text_from_docx_cached,extract_text
+    from .resume_parser import extract_text_from_pdf_cached, extract_text_from_docx_cached,extract_text, upload_digest
     from .skill_extractor import extract_skills_cached
 except ImportError:
     # Fallback to absolute import (works for script run)
-    from resume_skill_extractor.resume_parser import extract_text_from_pdf_cached , extract_text_from_docx_cached,extract_text
+    from resume_skill_extractor.resume_parser import extract_text_from_pdf_cached , extract_text_from_docx_cached,extract_text, upload_digest
     from resume_skill_extractor.skill_extractor import extract_skills_cached
     
 
@@ -254,9 +254,9 @@ jd_text = None
 
 if resume_file:
     if resume_file.name.endswith(".pdf"):
-        resume_text = extract_text_from_pdf_cached(resume_file.read())
+        resume_text = extract_text_from_pdf_cached(resume_file, upload_digest(resume_file))
     elif resume_file.name.endswith(".docx"):
-        resume_text = extract_text_from_docx_cached(resume_file)
+        resume_text = extract_text_from_docx_cached(resume_file, upload_digest(resume_file))
 
 
 if jd_text_input and jd_text_input.strip():
@@ -0,0 +1,177 @@
+"""
+Concurrent LLM dispatch for bulk skill and name extraction.
+
+Blocking backend calls (pooled Groq client, Ollama) run on a dedicated thread
+pool; an asyncio global semaphore bounds how many jobs are in flight. Skill jobs
+go through the LLM router, which takes a slot of the backend it actually calls
+(llm_router.backend_slots), so per-backend caps hold even when a call falls
+through to another backend. Results come back in input order and go through the
+same prompt and JSON parsing as the interactive path.
+
+    from resume_skill_extractor.async_dispatch import extract_skills_bulk
+    skills_per_resume = extract_skills_bulk(resume_texts, kind="resume",
+                                            groq_api_key=key, model_choice="llama-3.1-8b-instant")
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from resume_skill_extractor.llm_router import backend_slots
+from resume_skill_extractor.skill_extractor import (
+    SKILL_KINDS, extract_document_skills, fill_near_duplicates, merge_skills, near_dup_namespace,
+)
+from resume_skill_extractor.packing import extract_pack, plan_packs
+from resume_skill_extractor.near_dup import group_near_duplicates, remember_extraction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_BACKEND_LIMITS = {"groq": 10, "ollama": 2, "name": 8}
+ROUTED = None  # job backend chosen per call by the LLM router
+
+
+# ---------------- DISPATCHER ----------------
+class AsyncLLMDispatcher:
+    """
+    Bounded-concurrency runner for blocking LLM calls, grouped by backend.
+
+    Jobs with a fixed backend wait on that backend's asyncio semaphore. ROUTED
+    jobs run with `backend_slots` set, so the router blocks on the cap of
+    whichever backend it admits; the slots are thread semaphores because the
+    router runs on the worker threads.
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, backend_limits=None):
+        self.max_concurrency = max_concurrency
+        self.backend_limits = {**DEFAULT_BACKEND_LIMITS, **(backend_limits or {})}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._global = None
+        self._per_backend = {}
+        self._slots = {name: threading.BoundedSemaphore(limit) for name, limit in self.backend_limits.items()}
+
+    def _semaphores(self, backend):
+        # Semaphores are bound to the running loop, so create them lazily inside it
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrency)
+        if backend not in self._per_backend:
+            limit = self.backend_limits.get(backend, self.max_concurrency)
+            self._per_backend[backend] = asyncio.Semaphore(limit)
+        return self._global, self._per_backend[backend]
+
+    def _routed(self, fn, *args):
+        token = backend_slots.set(self._slots)
+        try:
+            return fn(*args)
+        finally:
+            backend_slots.reset(token)
+
+    async def submit(self, backend, fn, *args):
+        """Run `fn(*args)` on the worker pool once the semaphores allow it (see ROUTED)."""
+        global_sem, backend_sem = self._semaphores(backend)  # ROUTED: bounded by the global one only
+        if backend is ROUTED:
+            fn, args = self._routed, (fn, *args)
+        async with backend_sem, global_sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def map(self, jobs, default=None):
+        """
+        Run (backend, fn, args) jobs concurrently; results keep input order.
+        A failing job yields `default` instead of cancelling the batch.
+        """
+        async def guarded(backend, fn, args):
+            try:
+                return await self.submit(backend, fn, *args)
+            except Exception as e:
+                logger.warning("LLM job on %s failed: %s", backend, e)
+                return default
+
+        return await asyncio.gather(*(guarded(b, fn, args) for b, fn, args in jobs))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._global = None
+        self._per_backend = {}
+
+
+# ---------------- BACKEND CALLS ----------------
+def _skills_job(text, kind, groq_api_key, model_choice, mode):
+    key, label = SKILL_KINDS[kind]
+    return extract_document_skills(text, key, label, groq_api_key, model_choice, mode)
+
+
+# ---------------- BULK ENTRY POINTS ----------------
+async def extract_skills_async(texts, kind="resume", groq_api_key=None,
+                               model_choice="llama-3.1-8b-instant", dispatcher=None, mode=None,
+                               pack=False):
+    """
+    Extract skills for many resumes (kind="resume") or JDs (kind="jd"), in input order.
+    With pack=True several documents share each prompt (see packing.py). Near-duplicate
+    texts in the batch are extracted once per group (see near_dup.py).
+    """
+    if kind not in SKILL_KINDS:
+        raise ValueError(f"kind must be one of {sorted(SKILL_KINDS)}")
+    owned = dispatcher is None
+    dispatcher = dispatcher or AsyncLLMDispatcher()
+    texts = list(texts)
+    representatives = group_near_duplicates(texts)
+    unique = [texts[i] for i, rep in enumerate(representatives) if rep == i]
+    try:
+        if pack:
+            results = await _extract_packed_async(dispatcher, unique, kind, groq_api_key, model_choice, mode)
+        else:
+            jobs = [(ROUTED, _skills_job, (t, kind, groq_api_key, model_choice, mode)) for t in unique]
+            results = await dispatcher.map(jobs, default=[])
+        return fill_near_duplicates(texts, representatives, results, mode)
+    finally:
+        if owned:
+            dispatcher.close()
+
+
+async def _extract_packed_async(dispatcher, texts, kind, groq_api_key, model_choice, mode):
+    namespace = near_dup_namespace(SKILL_KINDS[kind][0], model_choice, mode)
+    local, compacted, packs, signatures = plan_packs(texts, mode, namespace=namespace)
+    jobs = [(ROUTED, extract_pack, ([compacted[i] for i in pack], kind, groq_api_key, model_choice))
+            for pack in packs]
+    results = list(local)
+    for pack, llm in zip(packs, await dispatcher.map(jobs, default=None)):
+        for j, i in enumerate(pack):
+            skills = llm[j] if llm else []
+            if skills:
+                remember_extraction(namespace, signatures.get(i), skills)
+            results[i] = merge_skills(skills, local[i])
+    return results
+
+
+async def extract_names_async(resume_texts, llm, dispatcher=None):
+    """LLM candidate-name extraction for many resumes (None where the LLM gave no name)."""
+    from resume_skill_extractor.resume_parser import extract_candidate_name_llm
+
+    owned = dispatcher is None
+    dispatcher = dispatcher or AsyncLLMDispatcher()
+    try:
+        jobs = [("name", extract_candidate_name_llm, (t, llm)) for t in resume_texts]
+        return await dispatcher.map(jobs, default=None)
+    finally:
+        if owned:
+            dispatcher.close()
+
+
+def extract_skills_bulk(texts, kind="resume", groq_api_key=None,
+                        model_choice="llama-3.1-8b-instant", mode=None, pack=False, **dispatcher_kwargs):
+    """Synchronous wrapper around extract_skills_async for scripts and batch jobs."""
+    dispatcher = AsyncLLMDispatcher(**dispatcher_kwargs)
+    try:
+        return asyncio.run(extract_skills_async(texts, kind, groq_api_key, model_choice, dispatcher, mode,
+                                                pack))
+    finally:
+        dispatcher.close()
+
+
+def extract_names_bulk(resume_texts, llm, **dispatcher_kwargs):
+    """Synchronous wrapper around extract_names_async."""
+    dispatcher = AsyncLLMDispatcher(**dispatcher_kwargs)
+    try:
+        return asyncio.run(extract_names_async(resume_texts, llm, dispatcher))
+    finally:
+        dispatcher.close()
@@ -0,0 +1,78 @@
+"""
+Streaming DOCX text extraction.
+
+Reads word/document.xml straight out of the zip with incremental XML parsing,
+instead of building python-docx's object model. Paragraph text is yielded in
+document order, including paragraphs inside table cells (where resumes often
+keep their skill grids). Finished elements are cleared as the parser goes, so
+memory stays bounded by the largest single paragraph, not by the document.
+Sources are paths, buffers (memoryview, mmap, ...) or open files, read in place.
+"""
+import zipfile
+from xml.etree.ElementTree import iterparse
+from resume_skill_extractor.file_source import BufferReader, as_file
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+DOCUMENT_PART = "word/document.xml"
+
+_P, _T, _TAB, _BR, _CR, _BODY = W + "p", W + "t", W + "tab", W + "br", W + "cr", W + "body"
+_PTAB, _NB_HYPHEN, _TYPE = W + "ptab", W + "noBreakHyphen", W + "type"
+
+
+def iter_docx_paragraphs(source):
+    """
+    Yield the text of every paragraph of a .docx (path, buffer or open file),
+    body paragraphs and table-cell paragraphs alike, in document order.
+    Runs are joined like python-docx's `Paragraph.text` (tabs and breaks kept).
+    """
+    file = as_file(source)
+    try:
+        yield from _iter_paragraphs(file)
+    finally:
+        if isinstance(file, BufferReader):
+            file.close()  # drop the buffer view so an mmap can be closed
+
+
+def _iter_paragraphs(file):
+    with zipfile.ZipFile(file) as archive, archive.open(DOCUMENT_PART) as part:
+        stack = []       # text buffers of the open paragraphs (text boxes nest them)
+        depth = 0
+        body = None
+        fallback = 0     # inside mc:Fallback, a duplicate rendering of mc:Choice
+        for event, elem in iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                depth += 1
+                if tag == _P:
+                    stack.append([])
+                elif tag == MC_FALLBACK:
+                    fallback += 1
+                elif tag == _BODY:
+                    body = elem
+                continue
+
+            depth -= 1
+            if tag == _P:
+                text = "".join(stack.pop())
+                if not fallback:
+                    yield text
+                elem.clear()
+            elif tag == MC_FALLBACK:
+                fallback -= 1
+            elif stack and not fallback:
+                if tag == _T:
+                    stack[-1].append(elem.text or "")
+                elif tag in (_TAB, _PTAB):
+                    stack[-1].append("\t")
+                elif tag == _CR or (tag == _BR and elem.get(_TYPE, "textWrapping") == "textWrapping"):
+                    stack[-1].append("\n")  # page and column breaks have no text, as in python-docx
+                elif tag == _NB_HYPHEN:
+                    stack[-1].append("-")
+            if depth == 2 and body is not None:
+                body.clear()  # a top-level paragraph/table has finished; drop it
+
+
+def extract_docx_text(source) -> str:
+    """Non-empty paragraph and table-cell lines of a .docx, stripped and joined once."""
+    return "\n".join(line for line in (p.strip() for p in iter_docx_paragraphs(source)) if line)
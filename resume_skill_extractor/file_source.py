@@ -0,0 +1,96 @@
+"""
+Document sources for the parsers, without copying the payload.
+
+A source is a file path, a bytes-like buffer (bytes, memoryview, mmap, ...) or
+an open binary file (BytesIO, Streamlit's UploadedFile). Buffers are wrapped
+in memoryviews instead of being read into new bytes objects, and the content
+hash used as a cache key is streamed once over whatever was passed in.
+"""
+import io
+import os
+import hashlib
+
+
+def is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def as_buffer(source):
+    """`source` as bytes or a zero-copy memoryview."""
+    if isinstance(source, bytes):
+        return source
+    if hasattr(source, "getvalue"):
+        # BytesIO/UploadedFile built from bytes share them copy-on-write: getvalue()
+        # returns that object, while getbuffer() would first unshare (copy) it
+        return source.getvalue()
+    if _supports_buffer(source):
+        return memoryview(source).cast("B")
+    return source.read()  # plain file object: one read is unavoidable
+
+
+def _supports_buffer(obj) -> bool:
+    try:
+        memoryview(obj)
+        return True
+    except TypeError:
+        return False
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable read-only file over a buffer; reads copy only the bytes asked for."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+def as_file(source):
+    """
+    `source` as something zipfile can open: a path, the open file itself when it
+    can seek, or a BufferReader (buffers, mmap, BytesIO/UploadedFile, pipes).
+    """
+    if is_path(source):
+        return source
+    seekable = getattr(source, "seekable", None)
+    if callable(seekable) and not hasattr(source, "getvalue") and not _supports_buffer(source) and seekable():
+        return source
+    return BufferReader(as_buffer(source))
+
+
+def source_digest(source) -> str:
+    """SHA-256 of a source's content, streamed from disk or hashed over the buffer in place."""
+    if is_path(source):
+        with open(source, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    if hasattr(source, "getvalue") or _supports_buffer(source):
+        return hashlib.sha256(as_buffer(source)).hexdigest()
+    position = source.tell()
+    source.seek(0)
+    try:
+        return hashlib.file_digest(source, "sha256").hexdigest()
+    finally:
+        source.seek(position)
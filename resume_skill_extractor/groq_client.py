@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+# ---------------- CONFIG ----------------
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "60"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class GroqAPIError(Exception):
+    """Raised when the Groq API fails after all retries (or with a non-retryable status)."""
+
+    def __init__(self, message, status_code=None, body=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+# ---------------- RATE LIMITER ----------------
+class TokenBucket:
+    """Client-side token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` are available, then take them."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_retry_after(value) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------- CLIENT ----------------
+class GroqClient:
+    """
+    Reusable client for Groq's OpenAI-compatible chat completions API.
+
+    - one requests.Session with a pooled, keep-alive HTTPAdapter
+    - (connect, read) timeouts on every call
+    - retries on 429/5xx and connection errors with exponential backoff + jitter,
+      honoring Retry-After when the server sends it
+    - a client-side token bucket so bursts stay under the account's rate limit
+    `base_url` can point at any OpenAI-compatible server (e.g. a local fake for tests).
+    """
+
+    def __init__(self, api_key, base_url=GROQ_BASE_URL,
+                 timeout=(GROQ_CONNECT_TIMEOUT, GROQ_READ_TIMEOUT),
+                 max_retries=GROQ_MAX_RETRIES, backoff_base=0.5, backoff_max=30.0,
+                 requests_per_minute=GROQ_REQUESTS_PER_MINUTE, pool_size=10, session=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(requests_per_minute / 60.0, capacity=max(1.0, requests_per_minute / 6.0))
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def post(self, path, payload, stream=False):
+        """POST with rate limiting and retries; returns the successful requests.Response."""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = GroqAPIError(f"Groq request failed: {e}")
+                if attempt < self.max_retries:
+                    time.sleep(self._backoff(attempt))
+                    continue
+                raise last_error from e
+
+            if response.status_code == 200:
+                return response
+
+            last_error = GroqAPIError(
+                f"Groq API error {response.status_code}: {response.text[:500]}",
+                status_code=response.status_code, body=response.text,
+            )
+            if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                raise last_error
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(self._backoff(attempt, retry_after))
+        raise last_error
+
+    def chat(self, prompt: str, model: str, **params) -> str:
+        """Single-turn chat completion; returns the assistant message text."""
+        payload = {"model": model, "messages": [{"role": "user", "content": prompt}], **params}
+        data = self.post("chat/completions", payload).json()
+        return data["choices"][0]["message"]["content"]
+
+    def stream_chat(self, prompt: str, model: str, **params):
+        """Streaming chat completion: yields content deltas as server-sent events arrive."""
+        payload = {"model": model, "messages": [{"role": "user", "content": prompt}],
+                   "stream": True, **params}
+        response = self.post("chat/completions", payload, stream=True)
+        with response:
+            # chunk_size=None hands over SSE events as they arrive instead of buffering 512 bytes
+            for line in response.iter_lines(chunk_size=None):
+                line = line.decode("utf-8") if isinstance(line, bytes) else line
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
+
+    def close(self):
+        self.session.close()
+
+
+# ---------------- SHARED CLIENTS ----------------
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_groq_client(api_key) -> GroqClient:
+    """One pooled client per API key for the whole process."""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = GroqClient(api_key)
+        return client
@@ -0,0 +1,334 @@
+"""
+Bulk resume ingestion: a folder or .zip of PDF/DOCX/TXT files → a text corpus.
+
+Files are hashed (SHA-256 of the raw bytes) in the main process and parsed in a
+process pool with the same extractors the app's resume_parser uses. Each parsed
+file becomes one record:
+
+    {"id", "sha256", "type", "bytes", "chars", "text"}
+
+written to a .jsonl file (appended) or a Parquet dataset directory (one part
+file per PARQUET_ROWS_PER_PART records, each written to a temp file and renamed
+into place). Re-running skips every hash already in the corpus, so an
+interrupted ingest resumes where it stopped. A file that fails to parse is
+written to the errors file instead and is retried on the next run.
+
+CLI:
+    python -m resume_skill_extractor.ingest resumes/ --output corpus.jsonl --workers 8
+    python -m resume_skill_extractor.ingest resumes.zip --output corpus.parquet
+"""
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import logging
+import zipfile
+import argparse
+import unicodedata
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from resume_skill_extractor.pdf_extract import extract_pdf_text
+from resume_skill_extractor.docx_extract import extract_docx_text
+from resume_skill_extractor.file_source import is_path, source_digest
+
+INGEST_EXTENSIONS = (".pdf", ".docx", ".txt")
+PARQUET_ROWS_PER_PART = 1000
+_SPACES = re.compile(r"[ \t]+")
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------- PARSING (runs in the workers) ----------------
+def normalize_text(text: str) -> str:
+    """NFKC-normalize, collapse runs of spaces/tabs, strip lines and drop blank ones (line breaks are kept)."""
+    text = unicodedata.normalize("NFKC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_document(name: str, source) -> str:
+    """Raw text of a PDF/DOCX/TXT file (path or bytes), with the resume_parser extractors."""
+    lower = name.lower()
+    if lower.endswith(".pdf"):
+        # One document per worker process already; no nested page pool
+        return extract_pdf_text(source, workers=1)
+    if lower.endswith(".docx"):
+        return extract_docx_text(source)
+    if lower.endswith(".txt"):
+        if is_path(source):
+            with open(source, "r", encoding="utf-8", errors="ignore") as f:
+                return f.read()
+        return str(memoryview(source), "utf-8", "ignore")  # decoded in place, no bytes copy
+    raise ValueError(f"unsupported file type: {name}")
+
+
+def _parse_item(doc_id, digest, path, data):
+    """Worker: parse one file (opened by `path` unless `data` is given) into a corpus record."""
+    try:
+        source = path if data is None else data
+        text = normalize_text(parse_document(doc_id, source))
+        size = os.path.getsize(path) if data is None else len(data)
+        return {"id": doc_id, "sha256": digest, "type": os.path.splitext(doc_id)[1].lower().lstrip("."),
+                "bytes": size, "chars": len(text), "text": text}
+    except Exception as e:
+        return {"id": doc_id, "sha256": digest, "error": f"{type(e).__name__}: {e}"}
+
+
+# ---------------- INPUT ----------------
+def is_archive(source) -> bool:
+    """A .zip file to read members from. A .docx is a zip too, but it is one document, not an archive."""
+    return not os.path.isdir(source) and source.lower().endswith(".zip")
+
+
+def _iter_paths(source):
+    if not os.path.isdir(source):
+        # A single file is ingested as itself
+        if source.lower().endswith(INGEST_EXTENSIONS):
+            yield os.path.basename(source), source
+        return
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(INGEST_EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, source), path
+
+
+def iter_sources(source):
+    """
+    Yield (doc_id, sha256, path, data) for every supported file in a folder, a .zip
+    or a single file. Files on disk are hashed by streaming and opened by path in the
+    worker; zip members are read once here and their bytes handed to the worker.
+    """
+    if is_archive(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if not info.is_dir() and info.filename.lower().endswith(INGEST_EXTENSIONS):
+                    data = archive.read(info)
+                    yield info.filename, hashlib.sha256(data).hexdigest(), None, data
+        return
+    for doc_id, path in _iter_paths(source):
+        yield doc_id, source_digest(path), path, None
+
+
+def count_sources(source) -> int:
+    if is_archive(source):
+        with zipfile.ZipFile(source) as archive:
+            return sum(1 for n in archive.namelist() if n.lower().endswith(INGEST_EXTENSIONS))
+    return sum(1 for _ in _iter_paths(source))
+
+
+# ---------------- OUTPUT ----------------
+class CorpusWriter:
+    """
+    Append corpus records to a .jsonl file or a Parquet dataset directory
+    (anything else ending in .parquet). `known_hashes()` reads what is already there.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.is_parquet = path.lower().endswith(".parquet")
+        self._file = None
+        self._rows = []
+        self._parts = 0
+        self._run = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+    def known_hashes(self) -> set:
+        if not os.path.exists(self.path):
+            return set()
+        if self.is_parquet:
+            return self._known_parquet_hashes()
+        known = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    known.add(json.loads(line)["sha256"])
+                except (ValueError, KeyError):
+                    continue  # a line cut short by an interrupted run
+        return known
+
+    def _known_parquet_hashes(self) -> set:
+        import pyarrow.parquet as pq
+        known = set()
+        for name in sorted(os.listdir(self.path)):
+            if not name.endswith(".parquet"):
+                continue  # includes *.parquet.tmp left by a killed run
+            part = os.path.join(self.path, name)
+            try:
+                known.update(pq.read_table(part, columns=["sha256"]).column(0).to_pylist())
+            except Exception as e:
+                # Unreadable part: move it aside so neither this run nor dataset readers trip on it;
+                # its files are not in `known` and get ingested again
+                os.replace(part, part + ".corrupt")
+                logger.warning("Quarantined unreadable corpus part %s (%s: %s)", name, type(e).__name__, e)
+        return known
+
+    def write(self, record):
+        if not self.is_parquet:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            return
+        self._rows.append(record)
+        if len(self._rows) >= PARQUET_ROWS_PER_PART:
+            self._flush_parquet()
+
+    def _flush_parquet(self):
+        """Write the buffered rows as one complete part: temp file, then an atomic rename."""
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        os.makedirs(self.path, exist_ok=True)
+        part = os.path.join(self.path, f"part-{self._run}-{self._parts:05d}.parquet")
+        tmp = part + ".tmp"
+        try:
+            pq.write_table(pa.Table.from_pylist(self._rows), tmp)
+            os.replace(tmp, part)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._parts += 1
+        self._rows = []
+
+    def close(self):
+        if self.is_parquet:
+            self._flush_parquet()
+        elif self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------- INGEST ----------------
+def _make_pool(workers):
+    # spawn: workers import only the extractors, never Streamlit
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def ingest(source, output, errors_path=None, workers=None, progress=None):
+    """
+    Parse every new file under `source` (folder, .zip or single file) into the corpus at `output`.
+    Returns counts {"total", "written", "skipped", "failed"}. `progress(counts)` is
+    called after every finished file.
+    """
+    workers = workers or os.cpu_count() or 1
+    errors_path = errors_path or f"{output.rstrip(os.sep)}.errors.jsonl"
+    counts = {"total": count_sources(source), "written": 0, "skipped": 0, "failed": 0}
+
+    with CorpusWriter(output) as writer, open(errors_path, "a", encoding="utf-8") as errors:
+        seen = writer.known_hashes()
+        window = workers * 4  # files in flight; bounds memory for zip members
+        pool = _make_pool(workers)
+        pending = {}
+
+        def finish(record):
+            if "error" in record:
+                errors.write(json.dumps(record, ensure_ascii=False) + "\n")
+                errors.flush()
+                seen.discard(record["sha256"])  # not done; retried on the next run
+                counts["failed"] += 1
+            else:
+                writer.write(record)
+                counts["written"] += 1
+            if progress:
+                progress(counts)
+
+        def crashed(doc_id, digest):
+            finish({"id": doc_id, "sha256": digest, "error": "worker process crashed"})
+
+        def restart_pool():
+            nonlocal pool
+            # Every file in flight fails with the crashed worker; record them and go on with a fresh pool
+            for doc_id, digest in pending.values():
+                crashed(doc_id, digest)
+            pending.clear()
+            pool.shutdown(wait=False, cancel_futures=True)
+            pool = _make_pool(workers)
+
+        def submit(doc_id, digest, path, data):
+            try:
+                future = pool.submit(_parse_item, doc_id, digest, path, data)
+            except BrokenProcessPool:
+                # A worker died since the last drain; this file was not in flight, so it gets the fresh pool
+                restart_pool()
+                future = pool.submit(_parse_item, doc_id, digest, path, data)
+            pending[future] = (doc_id, digest)
+
+        def drain(block_until):
+            while len(pending) > block_until:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    doc_id, digest = pending.pop(future)
+                    try:
+                        finish(future.result())
+                    except BrokenProcessPool:
+                        broken = True
+                        crashed(doc_id, digest)
+                if broken:
+                    restart_pool()
+
+        try:
+            for doc_id, digest, path, data in iter_sources(source):
+                if digest in seen:
+                    counts["skipped"] += 1
+                    if progress:
+                        progress(counts)
+                    continue
+                seen.add(digest)  # also skips duplicate files within this run
+                submit(doc_id, digest, path, data)
+                drain(window)
+            drain(0)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    return counts
+
+
+# ---------------- CLI ----------------
+def _progress_printer(stream=sys.stderr, every=0.5):
+    start = last = time.perf_counter()
+
+    def report(counts):
+        nonlocal last
+        now = time.perf_counter()
+        done = counts["written"] + counts["skipped"] + counts["failed"]
+        if now - last < every and done < counts["total"]:
+            return
+        last = now
+        rate = (counts["written"] + counts["failed"]) / max(now - start, 1e-9)
+        stream.write(f"\r[{done}/{counts['total']}] written {counts['written']}, skipped {counts['skipped']}, "
+                     f"failed {counts['failed']} ({rate:.1f} files/s)")
+        stream.flush()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest a folder or .zip of resumes into a text corpus.")
+    parser.add_argument("source", help="folder or .zip of PDF/DOCX/TXT files, or a single file")
+    parser.add_argument("--output", required=True, help=".jsonl file or .parquet dataset directory")
+    parser.add_argument("--errors", help="failed files, one JSON line each (default: <output>.errors.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--quiet", action="store_true", help="no progress line")
+    args = parser.parse_args(argv)
+
+    counts = ingest(args.source, args.output, args.errors, args.workers,
+                    progress=None if args.quiet else _progress_printer())
+    if not args.quiet:
+        sys.stderr.write("\n")
+    print(f"{counts['written']} written, {counts['skipped']} already in corpus, {counts['failed']} failed "
+          f"(of {counts['total']})")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Tolerant parsing of the extractor's JSON replies.
+
+Repairs are tried locally, cheapest first, before anyone considers asking the
+model again:
+  1. strict json.loads
+  2. ``` fenced blocks anywhere in the text
+  3. the first balanced {...} object
+  4. syntax fixes: smart quotes, single quotes, unquoted keys, trailing commas
+  5. partial recovery: complete elements of the target array (truncated output),
+     or a plain bulleted list
+Only what none of these could read goes back to the model (see parse_with_repair):
+the cut-off end of a truncated array, or malformed JSON. A reply with no JSON at
+all (a refusal, plain prose) has nothing to repair: the original prompt is
+retried once, and a second such reply is a hard failure.
+Outcome counters ("ok", "repaired", "partial", "failed", re-prompts, retries)
+are kept per process and exposed through repair_stats().
+"""
+import re
+import json
+import threading
+from resume_skill_extractor.stream_parser import IncrementalSkillParser
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_UNQUOTED_KEY = re.compile(r'([{,]\s*)([A-Za-z_][A-Za-z0-9_]*)(\s*:)')
+_SINGLE_QUOTED = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‘": "'", "’": "'"})
+_WORD = re.compile(r"\w")
+REPAIR_MAX_CHARS = 4000
+
+REPAIR_PROMPT = """
+The text below is malformed JSON, or the unreadable end of a reply, that was
+supposed to be in this exact format:
+
+{{
+    "{key}": ["Skill1", "Skill2"]
+}}
+
+Rewrite the skills it contains as valid JSON in that format. Return JSON only.
+
+Text:
+{raw}
+"""
+
+
+# ---------------- METRICS ----------------
+_stats_lock = threading.Lock()
+_stats = {"ok": 0, "repaired": 0, "partial": 0, "failed": 0, "reprompts": 0, "reprompt_success": 0,
+          "retries": 0}
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def repair_stats() -> dict:
+    """Parse outcome counters plus repair / partial / failure / re-prompt rates."""
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats["ok"] + stats["repaired"] + stats["partial"] + stats["failed"]
+    for name in ("repaired", "partial", "failed", "reprompts", "retries"):
+        stats[f"{name}_rate"] = round(stats[name] / total, 4) if total else 0.0
+    stats["parsed"] = total
+    return stats
+
+
+# ---------------- REPAIR STEPS ----------------
+def _first_balanced_object(text: str):
+    """Substring of the first {...} whose braces balance (string-aware), or None."""
+    start = text.find("{")
+    while start != -1:
+        depth, in_string, escape = 0, False, False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        start = text.find("{", start + 1)
+    return None
+
+
+def _fix_syntax(text: str) -> str:
+    text = text.translate(_SMART_QUOTES)
+    if '"' not in text:
+        text = _SINGLE_QUOTED.sub(lambda m: json.dumps(m.group(1)), text)
+    text = _UNQUOTED_KEY.sub(r'\1"\2"\3', text)
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def _loads(text):
+    try:
+        return json.loads(text)
+    except (ValueError, TypeError):
+        return None
+
+
+def _skills_from(data, key):
+    """List under `key` (case-insensitive; or the only list value; or a bare list)."""
+    if isinstance(data, list):
+        values = data
+    elif isinstance(data, dict):
+        values = data.get(key)
+        if values is None:
+            lowered = {str(k).lower(): v for k, v in data.items()}
+            values = lowered.get(key.lower())
+        if values is None:
+            lists = [v for v in data.values() if isinstance(v, list)]
+            values = lists[0] if len(lists) == 1 else None
+    else:
+        values = None
+    if not isinstance(values, list):
+        return None
+    return [str(s).strip() for s in values if s and str(s).strip()]
+
+
+def repair_json(raw: str, accept=None):
+    """
+    First JSON value in `raw` that `accept(data)` likes (default: any value),
+    trying the strict parse first and then the local repairs.
+    Returns (data, "ok" | "repaired") or (None, "failed").
+    """
+    accept = accept or (lambda data: data is not None)
+    if not raw or not raw.strip():
+        return None, "failed"
+    text = raw.strip()
+
+    data = _loads(text)
+    if accept(data):
+        return data, "ok"
+
+    candidates = [m.group(1).strip() for m in _FENCE.finditer(text)]
+    obj = _first_balanced_object(text)
+    if obj:
+        candidates.append(obj)
+    candidates.append(text)
+    for candidate in candidates:
+        for attempt in (candidate, _fix_syntax(candidate)):
+            data = _loads(attempt)
+            if accept(data):
+                return data, "repaired"
+    return None, "failed"
+
+
+def _recover_partial(raw: str, key: str | None):
+    """(recovered items, unparsed rest): the rest is the tail of an array cut off mid-way."""
+    fixed = _fix_syntax(raw)
+    parser = IncrementalSkillParser(key)
+    parser.feed(fixed)
+    if parser.skills:
+        return parser.skills, fixed[parser.parsed_until:] if parser.in_wanted_array else ""
+    return [m.group(1).strip('"\' ,') for m in map(_LIST_ITEM.match, raw.splitlines()) if m], ""
+
+
+def recover_partial_list(raw: str, key: str | None) -> list[str]:
+    """Complete array elements under `key` in a truncated reply, else a bulleted list."""
+    return _recover_partial(raw, key)[0]
+
+
+def _repair_skills(raw: str, key: str):
+    """repair_skills_json plus the part of `raw` that could not be read ("" when none)."""
+    data, status = repair_json(raw, lambda d: _skills_from(d, key) is not None)
+    if data is not None:
+        return _skills_from(data, key), status, ""
+    if not raw:
+        return None, "failed", ""
+    items, rest = _recover_partial(raw, key)
+    if items:
+        return items, "partial", rest
+    starts = [i for i in (raw.find("{"), raw.find("[")) if i != -1]
+    # Leading prose is not worth sending back; a reply without any JSON has nothing to repair
+    return None, "failed", raw[min(starts):] if starts else ""
+
+
+def repair_skills_json(raw: str, key: str):
+    """
+    Returns (skills, status) with status in "ok" | "repaired" | "partial" | "failed".
+    skills is None only when status is "failed".
+    """
+    skills, status, _ = _repair_skills(raw, key)
+    return skills, status
+
+
+def _has_json(raw) -> bool:
+    return bool(raw) and ("{" in raw or "[" in raw)
+
+
+def parse_with_repair(raw: str, key: str, reprompt=None, retry=None) -> list[str] | None:
+    """
+    Parse `raw`, repairing locally first. With `reprompt` (prompt -> raw reply),
+    the part no local repair could read is sent back once to be rewritten as
+    JSON: the cut-off tail of a partial reply, or malformed JSON. Source
+    documents are never resent; recovered tail skills are appended to the
+    partial result. A reply with no JSON at all is never sent to `reprompt`:
+    `retry` (() -> raw reply to the original prompt) is called once instead, and
+    its reply goes through the same steps. Returns None when nothing could be
+    recovered.
+    """
+    skills, status, unparsed = _repair_skills(raw, key)
+    if status == "failed" and retry is not None and raw and raw.strip() and not _has_json(raw):
+        _count("retries")
+        raw = retry()
+        skills, status, unparsed = _repair_skills(raw, key)
+    _count(status)
+    if reprompt is None or not _WORD.search(unparsed):
+        return skills
+
+    _count("reprompts")
+    more, _ = repair_skills_json(reprompt(REPAIR_PROMPT.format(key=key, raw=unparsed[:REPAIR_MAX_CHARS])), key)
+    if more:
+        _count("reprompt_success")
+    if skills is None:
+        return more
+    seen = {skill.lower() for skill in skills}
+    return skills + [skill for skill in dict.fromkeys(more or []) if skill.lower() not in seen]
@@ -0,0 +1,267 @@
+import os
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+# ---------------- CONFIG ----------------
+DEFAULT_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "genai_career_strategist", "llm_cache.sqlite3"),
+)
+DEFAULT_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))  # 30 days
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+# Reads never write: access times and hit/miss counters are buffered and flushed in
+# one transaction after this many buffered updates or seconds (and on every set()).
+FLUSH_EVERY = int(os.getenv("LLM_CACHE_FLUSH_EVERY", "100"))
+FLUSH_SECONDS = float(os.getenv("LLM_CACHE_FLUSH_SECONDS", "5"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    backend     TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    response    TEXT NOT NULL,
+    created     REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS responses_added AFTER INSERT ON responses
+BEGIN UPDATE counters SET value = value + 1 WHERE name = 'rows'; END;
+CREATE TRIGGER IF NOT EXISTS responses_removed AFTER DELETE ON responses
+BEGIN UPDATE counters SET value = value - 1 WHERE name = 'rows'; END;
+"""
+
+
+@contextmanager
+def _transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def prompt_key(backend: str, model: str, prompt: str) -> str:
+    """Cache key: sha256 over (backend, model, prompt)."""
+    payload = "\x00".join([backend, model or "", prompt]).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+# ---------------- CACHE ----------------
+class LLMResponseCache:
+    """
+    SQLite-backed LLM response cache shared by every process on the host.
+
+    - keyed by (backend, model, prompt hash)
+    - entries older than `ttl_seconds` are treated as misses and removed
+    - at most `max_entries` rows; least recently used rows are evicted
+    - hit/miss counters are kept both per process and in the database
+    WAL mode plus a busy timeout lets several Streamlit/worker processes
+    read and write the same file concurrently. get() is a plain read: hits
+    never wait on the write lock. Access times, counters and expired keys are
+    buffered and written in batches (see FLUSH_EVERY), and the row count is
+    kept by triggers in the counters table instead of being counted per insert.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._touched = {}   # key → last access time, not yet written
+        self._expired = set()
+        self._pending = {"hits": 0, "misses": 0}
+        self._flushed_at = time.monotonic()
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        with _transaction(conn):
+            # Databases created before the row counter existed are counted once
+            conn.execute("INSERT OR IGNORE INTO counters (name, value) SELECT 'rows', COUNT(*) FROM responses")
+
+    def _connect(self):
+        """One connection per thread (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _take_pending(self):
+        with self._lock:
+            touched, expired, pending = self._touched, self._expired, self._pending
+            self._touched, self._expired, self._pending = {}, set(), {"hits": 0, "misses": 0}
+            self._flushed_at = time.monotonic()
+        return touched, expired, pending
+
+    def _write_pending(self, conn, touched, expired, pending):
+        """Apply buffered updates inside the caller's transaction."""
+        if expired:
+            # Re-checked here: another process may have refreshed the entry meanwhile
+            cutoff = time.time() - self.ttl_seconds
+            conn.executemany("DELETE FROM responses WHERE key = ? AND created < ?",
+                             [(key, cutoff) for key in expired])
+        if touched:
+            conn.executemany("UPDATE responses SET last_access = MAX(last_access, ?) WHERE key = ?",
+                             [(at, key) for key, at in touched.items()])
+        for name, value in pending.items():
+            if value:
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, value),
+                )
+
+    def flush(self):
+        """Write buffered access times, expired keys and counters in one transaction."""
+        touched, expired, pending = self._take_pending()
+        if touched or expired or any(pending.values()):
+            conn = self._connect()
+            with _transaction(conn):
+                self._write_pending(conn, touched, expired, pending)
+
+    def _buffer(self, key, now, hit, expired=False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self._pending["hits"] += 1
+                self._touched[key] = now
+            else:
+                self.misses += 1
+                self._pending["misses"] += 1
+            if expired:
+                self._expired.add(key)
+            due = (len(self._touched) + len(self._expired) + sum(self._pending.values()) >= FLUSH_EVERY
+                   or time.monotonic() - self._flushed_at >= FLUSH_SECONDS)
+        if due:
+            self.flush()
+
+    def get(self, backend: str, model: str, prompt: str) -> str | None:
+        key = prompt_key(backend, model, prompt)
+        now = time.time()
+        row = self._connect().execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._buffer(key, now, hit=False)
+            return None
+        if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+            self._buffer(key, now, hit=False, expired=True)
+            return None
+        self._buffer(key, now, hit=True)
+        return row[0]
+
+    def set(self, backend: str, model: str, prompt: str, response: str):
+        key = prompt_key(backend, model, prompt)
+        now = time.time()
+        touched, expired, pending = self._take_pending()
+        touched.pop(key, None)
+        expired.discard(key)
+        conn = self._connect()
+        with _transaction(conn):
+            # Buffered access times go in first, so eviction sees this process's recent hits
+            self._write_pending(conn, touched, expired, pending)
+            conn.execute(
+                "INSERT INTO responses (key, backend, model, response, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "response = excluded.response, created = excluded.created, last_access = excluded.last_access",
+                (key, backend, model or "", response, now, now),
+            )
+            (count,) = conn.execute("SELECT value FROM counters WHERE name = 'rows'").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                )
+
+    def get_or_compute(self, backend: str, model: str, prompt: str, compute):
+        """Return the cached response or call `compute()`; only non-empty results are stored."""
+        cached = self.get(backend, model, prompt)
+        if cached is not None:
+            return cached
+        response = compute()
+        if response:
+            self.set(backend, model, prompt, str(response))
+        return response
+
+    def purge_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        cur = self._connect().execute(
+            "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,)
+        )
+        return cur.rowcount
+
+    def clear(self):
+        self._take_pending()
+        conn = self._connect()
+        with _transaction(conn):
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM counters WHERE name != 'rows'")
+
+    def stats(self) -> dict:
+        self.flush()
+        totals = dict(self._connect().execute("SELECT name, value FROM counters").fetchall())
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "entries": totals.get("rows", 0),
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+        }
+
+
+class _NullCache:
+    """Stand-in used when LLM_CACHE_DISABLED is set."""
+
+    def get(self, backend, model, prompt):
+        return None
+
+    def set(self, backend, model, prompt, response):
+        pass
+
+    def get_or_compute(self, backend, model, prompt, compute):
+        return compute()
+
+    def stats(self):
+        return {}
+
+
+# ---------------- SHARED INSTANCE ----------------
+_lock = threading.Lock()
+_cache = None
+
+
+def get_llm_cache():
+    """Process-wide LLM response cache (configured from LLM_CACHE_* env vars)."""
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = _NullCache() if CACHE_DISABLED else LLMResponseCache()
+                if not CACHE_DISABLED:
+                    atexit.register(_cache.flush)
+    return _cache
@@ -0,0 +1,224 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+import requests
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+ROUTER_HEALTH_TTL = float(os.getenv("LLM_ROUTER_HEALTH_TTL", "30"))
+ROUTER_FAILURE_THRESHOLD = int(os.getenv("LLM_ROUTER_FAILURE_THRESHOLD", "3"))
+ROUTER_COOLDOWN = float(os.getenv("LLM_ROUTER_COOLDOWN", "30"))
+ROUTER_WINDOW = int(os.getenv("LLM_ROUTER_WINDOW", "50"))
+
+# Per-backend concurrency caps for the calling context: backend name → threading.Semaphore.
+# Set by callers that bound load per backend (async_dispatch); call() takes the slot of the
+# backend it actually sends to, so fall-through calls count against the right cap.
+backend_slots = contextvars.ContextVar("backend_slots", default=None)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+# ---------------- PER-BACKEND STATE ----------------
+class BackendState:
+    """Rolling latency/error window, cached health probe and circuit breaker for one backend."""
+
+    def __init__(self, name, call, probe=None, needs_api_key=False, window=ROUTER_WINDOW):
+        self.name = name
+        self.call = call
+        self.probe = probe
+        self.needs_api_key = needs_api_key
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True = error
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.healthy = None
+        self.probed_at = 0.0
+        self.probe_lock = threading.Lock()  # one probe at a time, outside the router lock
+        self.trial = False  # a half-open trial call is in flight
+
+    @property
+    def p50(self):
+        return _percentile(sorted(self.latencies), 0.50)
+
+    @property
+    def p95(self):
+        return _percentile(sorted(self.latencies), 0.95)
+
+    @property
+    def error_rate(self):
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def state(self, now, cooldown):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if now - self.opened_at >= cooldown else "open"
+
+    def snapshot(self, now, cooldown):
+        return {
+            "state": self.state(now, cooldown),
+            "healthy": self.healthy,
+            "p50": self.p50,
+            "p95": self.p95,
+            "error_rate": round(self.error_rate, 3),
+            "calls": len(self.outcomes),
+        }
+
+
+# ---------------- ROUTER ----------------
+class LLMRouter:
+    """
+    Sends each prompt to the fastest healthy backend.
+
+    - health probes run at most once per `health_ttl` seconds per backend
+    - backends are ordered by rolling p50 latency (unmeasured ones first, in
+      registration order), with backends above 50% errors pushed last
+    - `failure_threshold` consecutive failures open a backend's circuit for
+      `cooldown` seconds; after that one trial call decides whether it closes,
+      and other calls skip the backend until it has
+    A backend call fails when it raises or returns an empty result; the next
+    backend in order is then tried. Only real backend calls should be timed:
+    cached responses are served before the router (see `record`).
+    """
+
+    def __init__(self, health_ttl=ROUTER_HEALTH_TTL, failure_threshold=ROUTER_FAILURE_THRESHOLD,
+                 cooldown=ROUTER_COOLDOWN):
+        self.health_ttl = health_ttl
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.backends = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, call, probe=None, needs_api_key=False):
+        """
+        `call(prompt, model_choice, api_key) -> str | None`; `probe() -> bool`.
+        Backends with `needs_api_key` are skipped (not penalised) when no key is given.
+        """
+        self.backends[name] = BackendState(name, call, probe, needs_api_key)
+
+    def _is_healthy(self, backend, now):
+        """
+        Cached probe result, refreshed once per TTL. A stale result is used while
+        another thread refreshes it; only the very first probe is waited for.
+        """
+        if backend.probe is None:
+            return True
+        if backend.healthy is not None and now - backend.probed_at < self.health_ttl:
+            return backend.healthy
+        if not backend.probe_lock.acquire(blocking=backend.healthy is None):
+            return backend.healthy
+        try:
+            if backend.healthy is None or now - backend.probed_at >= self.health_ttl:
+                try:
+                    healthy = bool(backend.probe())
+                except Exception:
+                    healthy = False
+                backend.healthy, backend.probed_at = healthy, time.monotonic()
+            return backend.healthy
+        finally:
+            backend.probe_lock.release()
+
+    def _available(self, backend, now):
+        state = backend.state(now, self.cooldown)
+        return state == "closed" or (state == "half-open" and not backend.trial)
+
+    def candidates(self):
+        """Available backends, fastest first."""
+        now = time.monotonic()
+        with self._lock:
+            open_now = [b for b in self.backends.values() if self._available(b, now)]
+        # Probes do network I/O; they never run under the router lock
+        available = [b for b in open_now if self._is_healthy(b, now)]
+        with self._lock:
+            return sorted(available, key=lambda b: (b.error_rate > 0.5, b.p50 or 0.0))
+
+    def admit(self, name):
+        """
+        Claim a call to `name`: False when its circuit is open, or when it is
+        half-open and another call already holds the trial. Every admitted call
+        must be reported with `record`.
+        """
+        backend = self.backends[name]
+        with self._lock:
+            state = backend.state(time.monotonic(), self.cooldown)
+            if state == "open" or (state == "half-open" and backend.trial):
+                return False
+            if state == "half-open":
+                backend.trial = True
+            return True
+
+    def preferred(self):
+        """Name of the backend the next request would go to (None if none is available)."""
+        order = self.candidates()
+        return order[0].name if order else None
+
+    def record(self, name, latency, failed):
+        """
+        Report the outcome of a call made outside `call()` (e.g. a streamed
+        completion) and admitted with `admit`. Cache hits are not reported.
+        """
+        self._record(self.backends[name], latency, failed)
+
+    def _record(self, backend, latency, failed):
+        with self._lock:
+            backend.trial = False
+            backend.outcomes.append(failed)
+            if failed:
+                backend.consecutive_failures += 1
+                if backend.opened_at is not None or backend.consecutive_failures >= self.failure_threshold:
+                    backend.opened_at = time.monotonic()
+            else:
+                backend.latencies.append(latency)
+                backend.consecutive_failures = 0
+                backend.opened_at = None
+
+    def call(self, prompt, model_choice, api_key, prefer=None):
+        """Run `prompt` on the best available backend, falling through on failure."""
+        order = self.candidates()
+        if prefer:
+            order.sort(key=lambda b: b.name != prefer)
+        slots = backend_slots.get() or {}
+        for backend in order:
+            if backend.needs_api_key and not api_key:
+                continue
+            slot = slots.get(backend.name)
+            if slot is not None:
+                slot.acquire()
+            try:
+                if not self.admit(backend.name):
+                    continue  # opened, or another call took the half-open trial, since candidates()
+                start = time.perf_counter()
+                try:
+                    result = backend.call(prompt, model_choice, api_key)
+                except Exception as e:
+                    logger.info("LLM backend %s failed: %s", backend.name, e)
+                    result = None
+                self._record(backend, time.perf_counter() - start, failed=not result)
+            finally:
+                if slot is not None:
+                    slot.release()
+            if result:
+                return result
+        return None
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {name: b.snapshot(now, self.cooldown) for name, b in self.backends.items()}
+
+
+# ---------------- PROBES ----------------
+def probe_ollama(base_url=OLLAMA_BASE_URL, timeout=0.5):
+    """Cheap liveness check against the local Ollama server."""
+    try:
+        return requests.get(f"{base_url.rstrip('/')}/api/tags", timeout=timeout).status_code == 200
+    except requests.RequestException:
+        return False
@@ -0,0 +1,260 @@
+"""
+Optional shared model server for multi-worker deployments.
+
+One process holds the embedding model and the spaCy pipeline; every Streamlit
+worker talks to it over localhost HTTP instead of loading its own copy.
+
+    python -m resume_skill_extractor.model_server --port 8765
+    export MODEL_SERVER_URL=http://127.0.0.1:8765
+
+Endpoints:
+  POST /embed   {"texts": [...]}            → raw little-endian float32 matrix
+                                              (X-Rows / X-Dim headers give the shape)
+  POST /ner     {"text": ..., "labels": [...]} → {"entities": [[text, label], ...]}
+                {"texts": [...], ...}           → {"entities": [[[text, label], ...], ...]}
+  GET  /health                              → {"embedding_namespace": ..., "ner_loaded": ...}
+
+With MODEL_SERVER_URL set, embed_texts (and therefore embed_skills) and the spaCy
+step of name extraction use the server transparently, each worker thread over one
+kept-alive HTTP/1.1 connection. If it cannot be reached, callers fall back to
+their in-process models; after a failure the server is skipped for
+MODEL_SERVER_BACKOFF seconds (doubling per further failure) instead of costing a
+timeout on every call. Embeddings are only taken from a server whose /health
+reports the client's embedding namespace.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from resume_skill_extractor.ner import entities, entities_batch, get_nlp, nlp_loaded
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+MODEL_SERVER_URL = os.getenv("MODEL_SERVER_URL", "").rstrip("/")
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", "30"))
+MODEL_SERVER_BACKOFF = float(os.getenv("MODEL_SERVER_BACKOFF", "5"))
+MODEL_SERVER_BACKOFF_MAX = float(os.getenv("MODEL_SERVER_BACKOFF_MAX", "300"))
+
+
+class ModelServerError(Exception):
+    """The model server could not be reached or returned an error."""
+
+
+# ---------------- CLIENT ----------------
+_client_lock = threading.Lock()
+_backoff = {}       # url -> (consecutive failures, monotonic time before which requests are skipped)
+_namespaces = {}    # url -> embedding namespace reported by its /health
+_local = threading.local()  # per-thread {url: HTTPConnection}
+
+
+def _connection(url, timeout):
+    """
+    This thread's persistent connection to `url` (one per worker thread and server,
+    kept alive across requests) and whether it was reused rather than newly made.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(url)
+    if conn is not None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+    parts = urlsplit(url)
+    factory = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    conn = connections[url] = factory(parts.netloc, timeout=timeout)
+    return conn, False
+
+
+def _drop_connection(url):
+    conn = getattr(_local, "connections", {}).pop(url, None)
+    if conn is not None:
+        conn.close()
+
+
+def _send_request(url, path, body, timeout):
+    """One request over the kept-alive connection; a connection the server already closed is redialed once."""
+    target = urlsplit(url).path.rstrip("/") + path
+    headers = {"Content-Type": "application/json"}
+    while True:
+        conn, reused = _connection(url, timeout)
+        try:
+            conn.request("GET" if body is None else "POST", target, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            _drop_connection(url)
+            if reused:
+                continue  # idle keep-alive connection closed by the server: retry on a fresh one
+            raise
+        except BaseException:
+            _drop_connection(url)
+            raise
+        if response.status >= 400:
+            raise ModelServerError(f"HTTP {response.status} {response.reason}: {data[:200]!r}")
+        return response.headers, data
+
+
+def _request(path, url=None, payload=None, timeout=MODEL_SERVER_TIMEOUT):
+    url = url or MODEL_SERVER_URL
+    with _client_lock:
+        failures, retry_at = _backoff.get(url, (0, 0.0))
+    if time.monotonic() < retry_at:
+        raise ModelServerError(f"model server at {url} skipped for {retry_at - time.monotonic():.0f}s "
+                               f"after {failures} failed request(s)")
+    body = None if payload is None else json.dumps(payload).encode("utf-8")
+    try:
+        result = _send_request(url, path, body, timeout)
+    except (OSError, http.client.HTTPException, ModelServerError) as e:  # refused, timed out, HTTP errors
+        with _client_lock:
+            failures = _backoff.get(url, (0, 0.0))[0] + 1
+            delay = min(MODEL_SERVER_BACKOFF * 2 ** (failures - 1), MODEL_SERVER_BACKOFF_MAX)
+            _backoff[url] = (failures, time.monotonic() + delay)
+        raise ModelServerError(f"model server request to {path} failed: {e}") from e
+    with _client_lock:
+        _backoff.pop(url, None)
+    return result
+
+
+def _post(path, payload, url=None, timeout=MODEL_SERVER_TIMEOUT):
+    return _request(path, url, payload, timeout)
+
+
+def server_namespace(url=None) -> str:
+    """Embedding namespace the server at `url` reports on /health, fetched once per URL."""
+    url = url or MODEL_SERVER_URL
+    with _client_lock:
+        if url in _namespaces:
+            return _namespaces[url]
+    _, body = _request("/health", url)
+    namespace = json.loads(body).get("embedding_namespace")
+    with _client_lock:
+        _namespaces[url] = namespace
+    return namespace
+
+
+def remote_embed(texts, url=None, namespace=None, dim=None) -> np.ndarray:
+    """
+    Embeddings for `texts` from the model server, as a (len(texts), dim) float32 array.
+    With `namespace` (and `dim`), a server running another model or backend is
+    refused before anything is returned for caching.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    if namespace is not None:
+        served = server_namespace(url)
+        if served != namespace:
+            raise ModelServerError(f"model server embeds with {served!r}, this worker with {namespace!r}")
+    headers, body = _post("/embed", {"texts": texts}, url)
+    try:
+        rows, got_dim = int(headers["X-Rows"]), int(headers["X-Dim"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ModelServerError(f"model server sent no valid embedding shape: {e}") from e
+    if rows != len(texts) or (dim is not None and got_dim != dim) or len(body) != rows * got_dim * 4:
+        raise ModelServerError(f"model server sent a {rows}x{got_dim} matrix ({len(body)} bytes) "
+                               f"for {len(texts)} texts" + (f" of dim {dim}" if dim is not None else ""))
+    return np.frombuffer(body, dtype="<f4").reshape(rows, got_dim)
+
+
+def remote_entities(text, labels=None, url=None) -> list[tuple[str, str]]:
+    """Named entities in `text` from the server's spaCy pipeline, optionally filtered by label."""
+    _, body = _post("/ner", {"text": text, "labels": list(labels or [])}, url)
+    return [tuple(ent) for ent in json.loads(body)["entities"]]
+
+
+def remote_entities_batch(texts, labels=None, url=None) -> list[list[tuple[str, str]]]:
+    """remote_entities for many texts in one request (the server runs them through nlp.pipe)."""
+    texts = list(texts)
+    if not texts:
+        return []
+    _, body = _post("/ner", {"texts": texts, "labels": list(labels or [])}, url)
+    return [[tuple(ent) for ent in doc] for doc in json.loads(body)["entities"]]
+
+
+# ---------------- SERVER ----------------
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: each client thread reuses one connection
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, data):
+        self._send(status, json.dumps(data).encode("utf-8"))
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._json(404, {"error": "not found"})
+        from jd_skill_gap_analyzer.embeddings import _backend_entry
+        self._json(200, {"embedding_namespace": _backend_entry()[1], "ner_loaded": nlp_loaded()})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/embed":
+                from jd_skill_gap_analyzer.embeddings import embed_documents_local
+                texts = [str(t) for t in payload.get("texts", [])]
+                vectors = np.asarray(embed_documents_local(texts), dtype="<f4") if texts \
+                    else np.zeros((0, 0), dtype="<f4")
+                return self._send(200, vectors.tobytes(), "application/octet-stream",
+                                  {"X-Rows": vectors.shape[0], "X-Dim": vectors.shape[1]})
+            if self.path == "/ner":
+                labels = set(payload.get("labels") or [])
+                if "texts" in payload:
+                    found = entities_batch([str(t) for t in payload["texts"]], labels)
+                else:
+                    found = entities(str(payload.get("text", "")), labels)
+                return self._json(200, {"entities": found})
+            return self._json(404, {"error": "not found"})
+        except Exception as e:
+            logger.exception("Model server request failed")
+            return self._json(500, {"error": str(e)})
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+
+def serve(host="127.0.0.1", port=8765, preload=True):
+    """Run the model server until interrupted."""
+    if preload:
+        from jd_skill_gap_analyzer.embeddings import get_embedding_model
+        get_embedding_model()
+        get_nlp()
+    server = ThreadingHTTPServer((host, port), ModelRequestHandler)
+    server.daemon_threads = True
+    logger.info("Model server listening on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared embedding / NER model server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-preload", action="store_true", help="load models on first request")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, preload=not args.no_preload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Near-duplicate detection for skill extraction.
+
+Re-submitted and lightly edited resumes differ by a few words, so they miss
+every exact-text cache and pay a full LLM call each. Here each document gets a
+MinHash signature over its word shingles; an LSH index (signature bands →
+buckets) finds earlier documents whose estimated Jaccard similarity is at least
+NEAR_DUP_THRESHOLD, and their LLM skills are reused. Only reused skills the new
+text still mentions are kept (see skills_still_present), and callers merge them
+with the new text's own dictionary pass, so a skill removed in the edit is
+dropped and a dictionary skill added in it still shows up. A skill only the LLM
+would find in the added words is missed.
+
+Indexes are process-wide and namespaced by (output key, model, mode), so a
+reply from one model or extraction mode is never reused for another.
+"""
+import os
+import re
+import zlib
+import threading
+import functools
+from collections import OrderedDict
+import numpy as np
+from resume_skill_extractor.skill_canonical import get_canonicalizer
+from resume_skill_extractor.skill_dictionary import extract_skills_local
+
+# ---------------- CONFIG ----------------
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.9"))  # estimated Jaccard
+NEAR_DUP_NUM_PERM = int(os.getenv("NEAR_DUP_NUM_PERM", "128"))
+NEAR_DUP_MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "20000"))
+NEAR_DUP_DISABLED = os.getenv("NEAR_DUP_DISABLED", "").lower() in ("1", "true", "yes")
+SHINGLE_WORDS = 3
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32; a * h + b stays below 2**64
+_WORD = re.compile(r"\w+")
+
+
+# ---------------- MINHASH ----------------
+@functools.lru_cache(maxsize=4)
+def _permutations(num_perm, seed=1):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[str]:
+    """Casefolded `size`-word shingles of `text` (the whole text if it is shorter)."""
+    words = _WORD.findall((text or "").casefold())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str, num_perm: int = NEAR_DUP_NUM_PERM) -> np.ndarray:
+    """(num_perm,) uint64 MinHash of the text's shingles; equal positions estimate Jaccard similarity."""
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64)
+    a, b = _permutations(num_perm)
+    return ((a * hashes[None, :] + b) % _PRIME).min(axis=1)
+
+
+def estimated_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.mean(sig_a == sig_b))
+
+
+def lsh_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    (bands, rows) for the LSH index: the most rows per band (fewest false
+    candidates) that still make a pair at `threshold` a candidate with 99%
+    probability. Candidates are then checked against the full signature.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= 0.99:
+            best = (bands, rows)
+    return best
+
+
+# ---------------- INDEX ----------------
+class NearDuplicateIndex:
+    """
+    MinHash LSH index from document signatures to stored values.
+    At most `max_entries` documents are kept; the least recently matched are evicted.
+    """
+
+    def __init__(self, threshold=NEAR_DUP_THRESHOLD, num_perm=NEAR_DUP_NUM_PERM,
+                 max_entries=NEAR_DUP_MAX_ENTRIES):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.max_entries = max_entries
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self._entries = OrderedDict()  # id -> (signature, value)
+        self._buckets = {}             # (band, band bytes) -> set of ids
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    def query(self, signature):
+        """(value, similarity) of the most similar stored document at or above the threshold, else None."""
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates |= self._buckets.get(key, set())
+            best, best_sim = None, self.threshold
+            for entry_id in candidates:
+                sim = estimated_similarity(signature, self._entries[entry_id][0])
+                if sim >= best_sim:
+                    best, best_sim = entry_id, sim
+            if best is None:
+                return None
+            self._entries.move_to_end(best)
+            return self._entries[best][1], best_sim
+
+    def add(self, signature, value):
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, value)
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                old_id, (old_sig, _) = self._entries.popitem(last=False)
+                for key in self._band_keys(old_sig):
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(old_id)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_near_dup_index(namespace):
+    """Process-wide index for one (output key, model, mode) namespace; None when disabled."""
+    if NEAR_DUP_DISABLED:
+        return None
+    with _indexes_lock:
+        if namespace not in _indexes:
+            _indexes[namespace] = NearDuplicateIndex()
+        return _indexes[namespace]
+
+
+# ---------------- STATS ----------------
+_stats_lock = threading.Lock()
+_stats = {"lookups": 0, "llm_calls_saved": 0}  # documents that needed the LLM / that reused an extraction
+
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def near_dup_stats() -> dict:
+    """Documents checked, LLM calls saved by near-duplicates and the dedup ratio (saved / checked)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    with _indexes_lock:
+        stats["indexed_documents"] = sum(len(index) for index in _indexes.values())
+    stats["dedup_ratio"] = round(stats["llm_calls_saved"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+    return stats
+
+
+# ---------------- REUSE ----------------
+def find_prior_extraction(namespace, text):
+    """
+    (signature, prior LLM skills or None) for a document about to go to the LLM.
+    Counts the lookup, and a hit as one LLM call saved.
+    """
+    index = get_near_dup_index(namespace)
+    if index is None:
+        return None, None
+    signature = minhash_signature(text, index.num_perm)
+    found = index.query(signature)
+    _count("lookups")
+    if found is None:
+        return signature, None
+    _count("llm_calls_saved")
+    return signature, list(found[0])
+
+
+def _mentions(lowered_text, name):
+    name = name.casefold()
+    return bool(name) and re.search(rf"(?<!\w){re.escape(name)}(?!\w)", lowered_text) is not None
+
+
+def skills_still_present(skills, text) -> list[str]:
+    """
+    The reused `skills` that `text` still mentions: as a dictionary hit with the
+    same canonical ID, or spelled out (case-insensitive, on word boundaries).
+    """
+    canonicalizer = get_canonicalizer()
+    present = {skill_id for skill_id, _ in canonicalizer.canonical_ids(extract_skills_local(text))}
+    lowered = (text or "").casefold()
+    kept = []
+    for skill in skills:
+        resolved = canonicalizer.resolve(skill)
+        if resolved and (resolved[0] in present or _mentions(lowered, skill) or _mentions(lowered, resolved[1])):
+            kept.append(skill)
+    return kept
+
+
+def remember_extraction(namespace, signature, skills):
+    """Store the LLM skills of a freshly extracted document for later near-duplicates."""
+    index = get_near_dup_index(namespace)
+    if index is not None and signature is not None:
+        index.add(signature, list(skills))
+
+
+def group_near_duplicates(texts, threshold=None) -> list[int]:
+    """
+    For each text, the index of the first earlier text in `texts` it nearly
+    duplicates (itself if none). Lets a concurrent batch send one LLM call per
+    group instead of racing near-identical documents past the shared index.
+    """
+    if NEAR_DUP_DISABLED:
+        return list(range(len(texts)))
+    index = NearDuplicateIndex(threshold or NEAR_DUP_THRESHOLD, max_entries=len(texts) + 1)
+    representatives = []
+    for i, text in enumerate(texts):
+        signature = minhash_signature(text or "", index.num_perm)
+        found = index.query(signature)
+        if found is None:
+            index.add(signature, i)
+            representatives.append(i)
+        else:
+            representatives.append(found[0])
+    return representatives
+
+
+def record_batch_duplicates(count):
+    """Count in-batch near-duplicates that reused their group's extraction instead of calling the LLM."""
+    _count("lookups", count)
+    _count("llm_calls_saved", count)
@@ -0,0 +1,56 @@
+"""
+spaCy NER for the candidate-name fallback.
+
+The pipeline is loaded on first use, with every component the entity
+recognizer does not need excluded, and only the resume's header window (where
+the name is) is run through it. Shared by resume_parser and the model server.
+"""
+import threading
+
+SPACY_MODEL = "en_core_web_sm"
+# en_core_web_sm's ner has its own embedding layer (it does not listen to the shared
+# tok2vec), so tok2vec and tagger/parser/lemmatizer are dead weight here
+NER_EXCLUDED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+HEADER_LINES = 30
+HEADER_CHARS = 1500
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """Process-wide NER-only spaCy pipeline (downloads the model on first use if missing)."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                try:
+                    _nlp = spacy.load(SPACY_MODEL, exclude=NER_EXCLUDED_PIPES)
+                except OSError:
+                    from spacy.cli import download
+                    download(SPACY_MODEL)
+                    _nlp = spacy.load(SPACY_MODEL, exclude=NER_EXCLUDED_PIPES)
+    return _nlp
+
+
+def nlp_loaded() -> bool:
+    return _nlp is not None
+
+
+def header_window(text: str, max_lines: int = HEADER_LINES, max_chars: int = HEADER_CHARS) -> str:
+    """First `max_lines` lines of `text`, capped at `max_chars` characters."""
+    return "\n".join((text or "").splitlines()[:max_lines])[:max_chars]
+
+
+def entities(text: str, labels=None) -> list[tuple[str, str]]:
+    """(text, label) entities found by the local pipeline, optionally filtered by label."""
+    return [(ent.text, ent.label_) for ent in get_nlp()(text).ents if not labels or ent.label_ in labels]
+
+
+def entities_batch(texts, labels=None, batch_size=64) -> list[list[tuple[str, str]]]:
+    """entities() for many texts through nlp.pipe (one batched pass)."""
+    return [
+        [(ent.text, ent.label_) for ent in doc.ents if not labels or ent.label_ in labels]
+        for doc in get_nlp().pipe(texts, batch_size=batch_size)
+    ]
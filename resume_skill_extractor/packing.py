@@ -0,0 +1,204 @@
+"""
+Multi-document prompt packing for bulk skill extraction.
+
+Several short resumes / JDs share one prompt (and one round trip) instead of
+each paying the fixed prompt overhead and a request against the provider's rate
+limit. Documents get short IDs; the reply is one JSON object keyed by those IDs.
+Documents missing from the reply are split into smaller packs and retried, down
+to the regular single-document prompt.
+
+    from resume_skill_extractor.packing import extract_skills_packed
+    skills_per_jd = extract_skills_packed(jd_texts, kind="jd", groq_api_key=key,
+                                          model_choice="llama-3.1-8b-instant")
+"""
+import os
+import logging
+import threading
+from resume_skill_extractor.json_repair import repair_json
+from resume_skill_extractor.near_dup import (
+    find_prior_extraction, group_near_duplicates, remember_extraction, skills_still_present,
+)
+from resume_skill_extractor.prompt_compaction import estimate_tokens
+from resume_skill_extractor.skill_extractor import (
+    SKILL_KINDS, build_skills_prompt, compact_prompt_text, fill_near_duplicates, local_skill_pass,
+    merge_skills, near_dup_namespace, parse_skills, run_prompt,
+)
+
+logger = logging.getLogger(__name__)
+
+PACK_TOKEN_BUDGET = int(os.getenv("PACK_TOKEN_BUDGET", "4000"))
+PACK_MAX_DOCUMENTS = int(os.getenv("PACK_MAX_DOCUMENTS", "8"))
+
+PACKED_PROMPT = """
+You are a strict JSON generator.
+Extract **only technical skills** from each document below.
+Do not include explanations or extra text.
+Return one JSON object keyed by document ID, with an entry for every document, in this exact format:
+
+{{
+    "doc1": ["Skill1", "Skill2"],
+    "doc2": ["Skill1"]
+}}
+
+{documents}
+"""
+
+_PROMPT_OVERHEAD = estimate_tokens(PACKED_PROMPT)
+
+
+def _document_block(doc_id: str, label: str, text: str) -> str:
+    return f"=== {label} {doc_id} ===\n{text}\n"
+
+
+def build_packed_prompt(texts: list[str], label: str) -> tuple[str, list[str]]:
+    """Packed prompt for already-compacted `texts` and the document IDs it uses."""
+    ids = [f"doc{i + 1}" for i in range(len(texts))]
+    blocks = "\n".join(_document_block(doc_id, label, text) for doc_id, text in zip(ids, texts))
+    return PACKED_PROMPT.format(documents=blocks), ids
+
+
+def pack_documents(texts: list[str], token_budget: int = PACK_TOKEN_BUDGET,
+                   max_documents: int = PACK_MAX_DOCUMENTS) -> list[list[int]]:
+    """
+    Greedy, order-preserving packing of `texts` into groups of indices whose
+    prompt fits `token_budget`. A document larger than the budget gets its own pack.
+    """
+    packs, current, used = [], [], _PROMPT_OVERHEAD
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(_document_block("doc00", "Job Description", text))
+        if current and (used + cost > token_budget or len(current) >= max_documents):
+            packs.append(current)
+            current, used = [], _PROMPT_OVERHEAD
+        current.append(i)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def parse_packed(raw: str, ids: list[str]) -> dict:
+    """{doc_id: skills} for every ID the reply answered with a list (missing IDs are left out)."""
+    wanted = set(ids)
+
+    def by_id(data):
+        if isinstance(data, dict) and not wanted & set(data):
+            # {"documents": {"doc1": [...]}} style wrapping
+            nested = [v for v in data.values() if isinstance(v, dict)]
+            data = nested[0] if len(nested) == 1 else None
+        return data if isinstance(data, dict) and wanted & set(data) else None
+
+    data, _ = repair_json(raw, lambda d: by_id(d) is not None)
+    data = by_id(data) or {}
+    return {
+        doc_id: [str(s).strip() for s in values if s and str(s).strip()]
+        for doc_id, values in data.items()
+        if doc_id in wanted and isinstance(values, list)
+    }
+
+
+# ---------------- STATS ----------------
+_stats_lock = threading.Lock()
+_stats = {"prompts": 0, "packed_documents": 0, "splits": 0, "single_fallbacks": 0}
+
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def packing_stats() -> dict:
+    """Packed prompts sent, documents they carried, split retries and single-document fallbacks."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["documents_per_prompt"] = (
+        round(stats["packed_documents"] / stats["prompts"], 2) if stats["prompts"] else 0.0
+    )
+    return stats
+
+
+# ---------------- EXTRACTION ----------------
+def extract_pack(texts: list[str], kind: str, groq_api_key, model_choice: str,
+                 prefer=None) -> list[list[str]]:
+    """
+    LLM skills for each of `texts` (already compacted) from one packed prompt.
+    Documents the reply leaves out are retried in two halves; a lone document
+    falls back to the regular single-document prompt.
+    """
+    key, label = SKILL_KINDS[kind]
+    if len(texts) == 1:
+        _count("single_fallbacks")
+        prompt = build_skills_prompt(texts[0], key, label)
+        return [parse_skills(run_prompt(prompt, model_choice, groq_api_key, prefer=prefer), key,
+                             reprompt=lambda p: run_prompt(p, model_choice, groq_api_key, prefer=prefer),
+                             retry=lambda: run_prompt(prompt, model_choice, groq_api_key, prefer=prefer,
+                                                      use_cache=False))]
+
+    prompt, ids = build_packed_prompt(texts, label)
+    _count("prompts")
+    _count("packed_documents", len(texts))
+    found = parse_packed(run_prompt(prompt, model_choice, groq_api_key, prefer=prefer) or "", ids)
+
+    results = [found.get(doc_id) for doc_id in ids]
+    missing = [i for i, skills in enumerate(results) if skills is None]
+    if missing:
+        logger.debug("Packed reply missed %d of %d documents; splitting", len(missing), len(texts))
+        _count("splits")
+        half = (len(missing) + 1) // 2
+        for group in (missing[:half], missing[half:]):
+            if not group:
+                continue
+            retried = extract_pack([texts[i] for i in group], kind, groq_api_key, model_choice, prefer)
+            for i, skills in zip(group, retried):
+                results[i] = skills
+    return results
+
+
+def plan_packs(texts: list[str], mode: str | None = None, token_budget: int = PACK_TOKEN_BUDGET,
+               max_documents: int = PACK_MAX_DOCUMENTS, namespace=None):
+    """
+    Local dictionary pass for every text, then packing of the ones that still need the LLM.
+    With a near-duplicate `namespace`, texts that nearly duplicate an earlier extraction
+    reuse the skills of it they still mention instead of being packed.
+    Returns (local_skills_per_text, compacted_texts, packs of indices into `texts`,
+    {index: MinHash signature} to remember the packed results under).
+    """
+    local, compacted, pending, signatures = [], {}, [], {}
+    for i, text in enumerate(texts):
+        skills, needs_llm = local_skill_pass(text, mode) if text else ([], False)
+        if needs_llm and namespace is not None:
+            signature, prior = find_prior_extraction(namespace, text)
+            if prior is not None:
+                skills, needs_llm = merge_skills(skills_still_present(prior, text), skills), False
+            else:
+                signatures[i] = signature
+        local.append(skills)
+        if needs_llm:
+            compacted[i] = compact_prompt_text(text)
+            pending.append(i)
+    groups = pack_documents([compacted[i] for i in pending], token_budget, max_documents)
+    return local, compacted, [[pending[j] for j in group] for group in groups], signatures
+
+
+def extract_skills_packed(texts: list[str], kind: str = "resume", groq_api_key=None,
+                          model_choice: str = "llama-3.1-8b-instant", mode: str | None = None,
+                          token_budget: int = PACK_TOKEN_BUDGET,
+                          max_documents: int = PACK_MAX_DOCUMENTS, prefer=None) -> list[list[str]]:
+    """
+    Skills for many resumes (kind="resume") or JDs (kind="jd") using packed prompts; input order kept.
+    Near-duplicates within `texts` share one packed slot.
+    """
+    if kind not in SKILL_KINDS:
+        raise ValueError(f"kind must be one of {sorted(SKILL_KINDS)}")
+    namespace = near_dup_namespace(SKILL_KINDS[kind][0], model_choice, mode)
+    representatives = group_near_duplicates(texts)
+    unique = [texts[i] for i, rep in enumerate(representatives) if rep == i]
+
+    local, compacted, packs, signatures = plan_packs(unique, mode, token_budget, max_documents, namespace)
+    results = list(local)
+    for pack in packs:
+        llm = extract_pack([compacted[i] for i in pack], kind, groq_api_key, model_choice, prefer)
+        for i, skills in zip(pack, llm):
+            if skills:
+                remember_extraction(namespace, signatures.get(i), skills)
+            results[i] = merge_skills(skills, local[i])
+    return fill_near_duplicates(texts, representatives, results, mode)
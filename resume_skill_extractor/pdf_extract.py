@@ -0,0 +1,119 @@
+"""
+Page-streaming PDF text extraction.
+
+iter_pdf_pages yields one page's text at a time. extract_pdf_text joins it once
+at the end, and for long documents can split page ranges across a process pool.
+A PDF given by path is opened by path in every worker; an in-memory PDF goes
+into one shared-memory block that every worker opens, so it is not pickled once
+per task.
+
+Sources are paths, bytes-like buffers (memoryview, mmap, ...) or BytesIO-style
+files; buffers are handed to MuPDF in place rather than copied (file_source.py).
+
+This module imports only PyMuPDF and the standard library, so spawned workers
+start without Streamlit.
+"""
+import os
+import atexit
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+import fitz  # PyMuPDF
+from resume_skill_extractor.file_source import as_buffer, is_path
+
+# ---------------- CONFIG ----------------
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "0"))  # 0/1 = in-process
+PDF_PAGES_PER_WORKER = int(os.getenv("PDF_PAGES_PER_WORKER", "8"))  # below this, stay serial
+
+
+def _open(source):
+    if is_path(source):
+        return fitz.open(source)
+    return fitz.open(stream=as_buffer(source), filetype="pdf")
+
+
+def iter_pdf_pages(source, start=0, stop=None):
+    """Yield the text of pages [start, stop) of a PDF (path, buffer or file)."""
+    with _open(source) as doc:
+        for page_no in range(start, doc.page_count if stop is None else min(stop, doc.page_count)):
+            yield doc.load_page(page_no).get_text()
+
+
+def _extract_page_range(shm_name, size, start, stop):
+    """Worker: open the shared PDF bytes in place and return the text of pages [start, stop)."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    view = shm.buf[:size]
+    try:
+        return "".join(iter_pdf_pages(view, start, stop))
+    finally:
+        view.release()
+        shm.close()
+
+
+def _extract_path_range(path, start, stop):
+    """Worker: open the PDF by path and return the text of pages [start, stop)."""
+    return "".join(iter_pdf_pages(path, start, stop))
+
+
+# ---------------- PROCESS POOL ----------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_pool(workers):
+    """
+    Process-wide pool (spawned, so workers never inherit Streamlit's threads).
+
+    Sized once by the first caller and never replaced: a pool another thread
+    is submitting to is never shut down underneath it. Later callers asking
+    for a different size share it; their page ranges just queue.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_text(source, workers=None, pages_per_worker=PDF_PAGES_PER_WORKER) -> str:
+    """
+    Full text of a PDF (path, buffer or file), joined once. With `workers` > 1
+    (default PDF_EXTRACT_WORKERS) and enough pages, page ranges are extracted
+    in parallel.
+    """
+    workers = PDF_EXTRACT_WORKERS if workers is None else workers
+    if not is_path(source):
+        source = as_buffer(source)
+    if workers <= 1:
+        return "".join(iter_pdf_pages(source))
+
+    with _open(source) as doc:
+        page_count = doc.page_count
+    if page_count < 2 * pages_per_worker:
+        return "".join(iter_pdf_pages(source))
+
+    chunks = min(workers, page_count // pages_per_worker)
+    bounds = [page_count * i // chunks for i in range(chunks + 1)]
+    pool = get_pdf_pool(workers)
+    if is_path(source):
+        futures = [pool.submit(_extract_path_range, os.fspath(source), bounds[i], bounds[i + 1])
+                   for i in range(chunks)]
+        return "".join(f.result() for f in futures)
+
+    size = len(source)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = source
+        futures = [pool.submit(_extract_page_range, shm.name, size, bounds[i], bounds[i + 1])
+                   for i in range(chunks)]
+        return "".join(f.result() for f in futures)
+    finally:
+        shm.close()
+        shm.unlink()
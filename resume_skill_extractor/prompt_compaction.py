@@ -0,0 +1,211 @@
+"""
+Section-aware compaction of resume / JD text before it goes into a prompt.
+
+Detects section headings (Skills, Experience, Projects, Education, ...; and JD
+headings such as Requirements or Benefits), drops sections that never carry
+technical skills (contact details, references, hobbies, declarations, company
+boilerplate), removes duplicate lines and repeated whitespace, and then fits the
+remainder into a token budget, keeping the most skill-dense sections first. Lines
+that do not fit are skipped, and the leftover budget takes a word-boundary cut of
+the first skipped line, so one long line (e.g. a JD pasted as a single line)
+neither empties the result nor blocks the lines after it.
+"""
+import os
+import re
+import math
+import threading
+from dataclasses import dataclass
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+MIN_CUT_TOKENS = 8  # leftover budget below this is not worth a partial line
+
+# Section type → heading keywords (matched against short, heading-like lines)
+SECTION_HEADINGS = {
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack",
+               "programming languages",
+               "tools", "tools & technologies", "competencies", "expertise"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "requirements": ["requirements", "qualifications", "required skills", "preferred skills",
+                     "must have", "nice to have", "what you'll need", "what we're looking for",
+                     "responsibilities", "what you'll do", "key responsibilities"],
+    "certifications": ["certifications", "certificates", "courses", "licenses", "training"],
+    "summary": ["summary", "profile", "professional summary", "objective", "about me"],
+    "education": ["education", "academic background", "academics", "qualification"],
+    "achievements": ["achievements", "awards", "honors", "publications"],
+    "languages": ["languages", "languages known"],  # spoken or programming → kept, low priority
+    # Dropped: never carry technical skills
+    "contact": ["contact", "contact details", "contact information"],
+    "personal": ["personal details", "personal information", "personal profile"],
+    "hobbies": ["hobbies", "hobbies & interests", "extracurricular activities", "extra-curricular activities"],
+    "references": ["references", "referees"],
+    "declaration": ["declaration"],
+    "company": ["about us", "about the company", "who we are", "benefits", "perks",
+                "what we offer", "equal opportunity", "equal opportunity employer", "how to apply"],
+}
+DROP_SECTIONS = {"contact", "personal", "hobbies", "references", "declaration", "company"}
+
+# Lower number = kept first when the budget is tight
+SECTION_PRIORITY = {
+    "skills": 0, "requirements": 0, "experience": 1, "projects": 2, "certifications": 3,
+    "languages": 3, "summary": 4, "body": 5, "achievements": 6, "education": 7,
+}
+
+_HEADING_LOOKUP = {kw: section for section, kws in SECTION_HEADINGS.items() for kw in kws}
+_HEADING_STRIP = re.compile(r"^[\s#*•\-–—=_|:]+|[\s#*•\-–—=_|:]+$")
+_CONTACT_LINE = re.compile(
+    r"@|https?://|www\.|linkedin|github\.com|\b(phone|mobile|email|e-mail|address)\b", re.IGNORECASE,
+)
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_BULLET = re.compile(r"^\s*(?:[•●▪◦‣\-–*·>]+|\d+[.)])\s*")
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    sections_kept: list
+    sections_dropped: list
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English BPE vocabularies)."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def _is_contact_line(line: str) -> bool:
+    if _CONTACT_LINE.search(line):
+        return True
+    # Phone numbers, but not year ranges such as "2019 - 2021"
+    return any(sum(ch.isdigit() for ch in m.group()) >= 9 for m in _PHONE.finditer(line))
+
+
+def _cut(text: str, tokens: int) -> str:
+    """Prefix of `text` within `tokens` (estimate_tokens), ending at a word boundary when one is near."""
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > limit // 2 else cut).rstrip()
+
+
+def _heading_section(line: str):
+    """Section type if `line` looks like a heading, else None."""
+    if len(line) > 48:
+        return None
+    key = _HEADING_STRIP.sub("", line).lower()
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_sections(text: str) -> list[tuple[str, list[str]]]:
+    """Split text into [(section_type, lines)]; text before the first heading is 'header'."""
+    sections = [("header", [])]
+    for raw in text.splitlines():
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        section = _heading_section(line)
+        if section:
+            sections.append((section, []))
+            continue
+        # Inline heading: "Skills: Python, SQL"
+        head, sep, rest = line.partition(":")
+        section = _heading_section(head) if sep and rest.strip() else None
+        if section:
+            sections.append((section, [rest.strip()]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def compact_text(text: str, token_budget: int = PROMPT_TOKEN_BUDGET) -> CompactionResult:
+    """Drop low-value sections and duplicate lines, then fit `text` into `token_budget`."""
+    original_tokens = estimate_tokens(text or "")
+    sections = split_sections(text or "")
+
+    # Untitled documents (typical for pasted JDs) are treated as one body section
+    if all(name == "header" for name, _ in sections):
+        sections = [("body", lines) for _, lines in sections]
+
+    kept, dropped, seen = [], [], set()
+    for order, (name, lines) in enumerate(sections):
+        if name in DROP_SECTIONS:
+            dropped.append(name)
+            continue
+        if name == "header":
+            # Name/contact block: keep only lines that are not contact details
+            lines = [ln for ln in lines if not _is_contact_line(ln)]
+        unique = []
+        for ln in lines:
+            ln = _BULLET.sub("", ln)
+            key = ln.lower()
+            if ln and key not in seen:
+                seen.add(key)
+                unique.append(ln)
+        if unique:
+            kept.append((SECTION_PRIORITY.get(name, SECTION_PRIORITY["body"]), order, name, unique))
+
+    # Fill the budget by priority, skipping lines that do not fit; then restore document order
+    budget = token_budget
+    blocks, skipped = {}, []
+    for priority, order, name, lines in sorted(kept):
+        for i, ln in enumerate(lines):
+            cost = estimate_tokens(ln) + 1
+            if cost <= budget:
+                blocks.setdefault((order, name), []).append((i, ln))
+                budget -= cost
+            else:
+                skipped.append((order, name, i, ln))
+    short = {(order, name) for order, name, _, _ in skipped}
+    if skipped and budget - 1 >= MIN_CUT_TOKENS:
+        order, name, i, ln = skipped[0]
+        blocks.setdefault((order, name), []).append((i, _cut(ln, budget - 1)))
+    for order, name in sorted(short):
+        dropped.append(f"{name} (truncated)" if (order, name) in blocks else name)
+
+    parts = []
+    for (_, name), block in sorted(blocks.items()):
+        lines = [ln for _, ln in sorted(block)]
+        heading = "" if name in ("header", "body") else f"{name.capitalize()}:"
+        parts.append("\n".join([heading, *lines]) if heading else "\n".join(lines))
+    compacted = "\n".join(parts)
+    if not compacted and text and text.strip():
+        # Every section was dropped: the prompt still gets a cut of the original
+        compacted = _cut(text.strip(), token_budget)
+
+    result = CompactionResult(
+        text=compacted,
+        original_tokens=original_tokens,
+        compacted_tokens=estimate_tokens(compacted),
+        sections_kept=[name for _, name in sorted(blocks)],
+        sections_dropped=dropped,
+    )
+    _record(result)
+    return result
+
+
+# ---------------- STATS ----------------
+_stats_lock = threading.Lock()
+_stats = {"documents": 0, "original_tokens": 0, "compacted_tokens": 0}
+
+
+def _record(result: CompactionResult):
+    with _stats_lock:
+        _stats["documents"] += 1
+        _stats["original_tokens"] += result.original_tokens
+        _stats["compacted_tokens"] += result.compacted_tokens
+
+
+def compaction_stats() -> dict:
+    """Totals since process start, including tokens saved."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["tokens_saved"] = stats["original_tokens"] - stats["compacted_tokens"]
+    return stats
@@ -1,43 +1,72 @@
 import os
-import fitz  # PyMuPDF
-import spacy
+import logging
 import streamlit as st
-import docx  # python-docx
 import re
-# --- Load spaCy ---
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+from resume_skill_extractor.llm_cache import get_llm_cache
+from resume_skill_extractor.model_server import (
+    MODEL_SERVER_URL, ModelServerError, remote_entities, remote_entities_batch,
+)
+from resume_skill_extractor.pdf_extract import extract_pdf_text
+from resume_skill_extractor.docx_extract import extract_docx_text
+from resume_skill_extractor.file_source import source_digest
+from resume_skill_extractor.ner import entities, entities_batch, get_nlp, header_window
+
+logger = logging.getLogger(__name__)
+
+# --- spaCy NER (loaded on first use; not at all when a model server does NER) ---
+def person_entities(text: str) -> list[str]:
+    """PERSON entities in `text`, from the shared model server when MODEL_SERVER_URL is set."""
+    if MODEL_SERVER_URL:
+        try:
+            return [ent for ent, _ in remote_entities(text, ["PERSON"])]
+        except ModelServerError as e:
+            logger.warning("%s; running spaCy in-process instead", e)
+    return [ent for ent, _ in entities(text, ["PERSON"])]
+
+
+def person_entities_batch(texts) -> list[list[str]]:
+    """person_entities for many texts in one nlp.pipe pass (or one model-server request)."""
+    if MODEL_SERVER_URL:
+        try:
+            return [[ent for ent, _ in doc] for doc in remote_entities_batch(texts, ["PERSON"])]
+        except ModelServerError as e:
+            logger.warning("%s; running spaCy in-process instead", e)
+    return [[ent for ent, _ in doc] for doc in entities_batch(texts, ["PERSON"])]
 
 # --- PDF Extraction ---
+# Sources may be a path, a buffer (bytes, memoryview, mmap) or an open file; nothing is
+# copied. The cache key is the streamed SHA-256 (`digest`), Streamlit skips hashing `_source`.
 @st.cache_data
-def extract_text_from_pdf_cached(file_bytes):
-    pdf_document = fitz.open(stream=file_bytes, filetype="pdf")
-    text = ""
-    for page in pdf_document:
-        text += page.get_text()
-    return text.strip()
+def _pdf_text_cached(_source, digest):
+    # Pages are streamed and joined once (in parallel for long PDFs, see pdf_extract.py)
+    return extract_pdf_text(_source).strip()
+
+def extract_text_from_pdf_cached(source, digest=None):
+    return _pdf_text_cached(source, digest or source_digest(source))
 
 # --- DOCX Extraction ---
 @st.cache_data
-def extract_text_from_docx_cached(file_bytes):
-    doc = docx.Document(file_bytes)
-    text = []
-    for para in doc.paragraphs:
-        line = para.text.strip()
-        if line:  # skip empty lines
-            text.append(line)
-    return "\n".join(text)
+def _docx_text_cached(_source, digest):
+    # Streams word/document.xml; table cells are included (see docx_extract.py)
+    return extract_docx_text(_source)
+
+def extract_text_from_docx_cached(source, digest=None):
+    return _docx_text_cached(source, digest or source_digest(source))
+
+def upload_digest(file) -> str:
+    """SHA-256 of an uploaded file, computed once per upload (remembered by its file_id)."""
+    key = f"_upload_sha256_{file.file_id}"
+    if key not in st.session_state:
+        st.session_state[key] = source_digest(file)
+    return st.session_state[key]
 
 # --- Universal Extraction (PDF + DOCX) ---
 def extract_text(file):
+    digest = upload_digest(file) if hasattr(file, "file_id") else None
     if file.name.endswith(".pdf"):
-        return extract_text_from_pdf_cached(file.read())
+        return extract_text_from_pdf_cached(file, digest)
     elif file.name.endswith(".docx"):
-        return extract_text_from_docx_cached(file)
+        return extract_text_from_docx_cached(file, digest)
     else:
         return ""
 
@@ -81,21 +110,11 @@ Resume text (first 2000 chars):
 {resume_text[:2000]}
 """
     try:
-        # LangChain-style LLM
-        if hasattr(llm, "generate"):
-            out = llm.generate([prompt])
-            generations = getattr(out, "generations", None)
-            if generations and generations[0] and generations[0][0]:
-                name = generations[0][0].text.strip().splitlines()[0]
-                if name and name.lower() != "candidate":
-                    return name
-
-        # Simple callable LLM (e.g., Groq, OpenAI wrapper)
-        elif callable(llm):
-            res = llm(prompt)
-            if isinstance(res, dict) and "text" in res:
-                res = res["text"]
-            name = str(res).strip().splitlines()[0]
+        backend = type(llm).__name__
+        model = str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or "")
+        raw = get_llm_cache().get_or_compute(backend, model, prompt, lambda: _invoke_name_llm(llm, prompt))
+        if raw:
+            name = str(raw).strip().splitlines()[0]
             if name and name.lower() != "candidate":
                 return name
     except Exception:
@@ -103,8 +122,26 @@ Resume text (first 2000 chars):
 
     return None  # LLM failed
 
+def _invoke_name_llm(llm, prompt: str):
+    """Raw text reply from a LangChain-style or plain callable LLM (None if empty)."""
+    # LangChain-style LLM
+    if hasattr(llm, "generate"):
+        out = llm.generate([prompt])
+        generations = getattr(out, "generations", None)
+        if generations and generations[0] and generations[0][0]:
+            return generations[0][0].text
+
+    # Simple callable LLM (e.g., Groq, OpenAI wrapper)
+    elif callable(llm):
+        res = llm(prompt)
+        if isinstance(res, dict) and "text" in res:
+            res = res["text"]
+        return str(res)
+
+    return None
+
 # --- Fallback: regex / spaCy ---
-def extract_candidate_name_fallback(resume_text: str) -> str:
+def _name_from_header_lines(resume_text: str):
     lines = resume_text.splitlines()
     # Step 1: Top 30 lines regex check
     for line in lines[:30]:
@@ -115,13 +152,34 @@ def extract_candidate_name_fallback(resume_text: str) -> str:
         words = ln_clean.split()
         if 2 <= len(words) <= 4 and all(w[0].isupper() for w in words) and ln_clean not in IGNORE_WORDS:
             return " ".join(w.capitalize() for w in words)
-    # Step 2: spaCy PERSON fallback
-    doc = nlp(resume_text)
-    for ent in doc.ents:
-        if ent.label_ == "PERSON" and ent.text not in IGNORE_WORDS and len(ent.text.split()) >= 2:
-            return ent.text.strip()
+    return None
+
+
+def _name_from_persons(persons):
+    for ent in persons:
+        if ent not in IGNORE_WORDS and len(ent.split()) >= 2:
+            return ent.strip()
     return "Candidate"
 
+
+def extract_candidate_name_fallback(resume_text: str) -> str:
+    name = _name_from_header_lines(resume_text)
+    if name:
+        return name
+    # Step 2: spaCy PERSON fallback, on the header window only (the name lives there)
+    return _name_from_persons(person_entities(header_window(resume_text)))
+
+
+def extract_candidate_names_fallback(resume_texts) -> list[str]:
+    """Batch extract_candidate_name_fallback: unresolved headers go through NER in one nlp.pipe pass."""
+    names = [_name_from_header_lines(t or "") for t in resume_texts]
+    pending = [i for i, name in enumerate(names) if name is None]
+    if pending:
+        persons = person_entities_batch([header_window(resume_texts[i] or "") for i in pending])
+        for i, found in zip(pending, persons):
+            names[i] = _name_from_persons(found)
+    return names
+
 # --- Unified function: tries LLM first, then fallback ---
 def extract_candidate_name(resume_text: str, llm=None) -> str:
     """
@@ -133,4 +191,16 @@ def extract_candidate_name(resume_text: str, llm=None) -> str:
         name = extract_candidate_name_llm(resume_text, llm)
         if name:
             return name
-    return extract_candidate_name_fallback(resume_text)
\ No newline at end of file
+    return extract_candidate_name_fallback(resume_text)
+
+def extract_candidate_names(resume_texts, llm=None) -> list[str]:
+    """Bulk extract_candidate_name: concurrent LLM calls (if `llm`), then one batched fallback pass."""
+    resume_texts = list(resume_texts)
+    names = [None] * len(resume_texts)
+    if llm:
+        from resume_skill_extractor.async_dispatch import extract_names_bulk
+        names = extract_names_bulk(resume_texts, llm)
+    pending = [i for i, name in enumerate(names) if not name]
+    for i, name in zip(pending, extract_candidate_names_fallback([resume_texts[i] for i in pending])):
+        names[i] = name
+    return names
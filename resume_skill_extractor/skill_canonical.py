@@ -0,0 +1,95 @@
+"""
+Canonicalization of extracted skill strings.
+
+LLM output spells the same skill many ways ("Py Torch", "pytorch", "PyTorch 2.0").
+Each string is normalized (Unicode, case, spacing/punctuation) into a lookup key
+and resolved through a hash index built from the skill dictionary's alias table;
+a trailing version number is dropped only when the rest is a known skill. The result is a stable canonical ID plus a
+display name; lists are deduplicated on the ID.
+
+    canonicalize_skills(["pytorch", "PyTorch 2.0", "Node.js", "nodejs"])
+    → ["PyTorch", "Node.js"]
+"""
+import re
+import functools
+import unicodedata
+from resume_skill_extractor.skill_dictionary import load_aliases
+
+_SEPARATORS = re.compile(r"[\s\-_./]+")
+_VERSION_SUFFIX = re.compile(r"\s+v?\d+(?:\.\d+)*(?:\.x)?\+?$", re.IGNORECASE)
+_PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+_EDGE_PUNCT = " \t\"'`*•·-–—,;:[]{}"
+
+
+def normalize_skill(skill: str) -> str:
+    """Display form: NFKC, trimmed punctuation, single spaces (case kept)."""
+    text = unicodedata.normalize("NFKC", str(skill or ""))
+    return " ".join(text.split()).strip(_EDGE_PUNCT)
+
+
+def skill_key(skill: str) -> str:
+    """Lookup key: case-folded, separators removed ("Py Torch" / "py-torch" → "pytorch")."""
+    return _SEPARATORS.sub("", normalize_skill(skill).casefold())
+
+
+def _strip_version(skill: str) -> str:
+    return _VERSION_SUFFIX.sub("", normalize_skill(skill))
+
+
+# ---------------- INDEX ----------------
+class SkillCanonicalizer:
+    """Hash index from normalized alias keys to canonical skill names."""
+
+    def __init__(self, aliases: dict[str, list[str]]):
+        self._index = {}
+        for canonical in aliases:
+            self._index.setdefault(skill_key(canonical), canonical)
+        # Canonical names win over aliases that normalize to the same key
+        for canonical, extra in aliases.items():
+            for alias in extra:
+                self._index.setdefault(skill_key(alias), canonical)
+
+    def __len__(self):
+        return len(self._index)
+
+    def resolve(self, skill: str) -> tuple[str, str] | None:
+        """(canonical_id, display_name) for `skill`, or None for empty input."""
+        display = normalize_skill(skill)
+        if not display:
+            return None
+        # Exact spelling first, then without "(K8s)"-style notes, then without a version.
+        # The version is only dropped for known skills: "OAuth 2.0" and "Web 3" are not "OAuth"/"Web".
+        plain = _PARENTHETICAL.sub("", display)
+        for variant in (display, plain, _strip_version(display), _strip_version(plain)):
+            canonical = self._index.get(skill_key(variant))
+            if variant and canonical is not None:
+                return skill_key(canonical), canonical
+        return skill_key(display), display
+
+    def canonical_ids(self, skills) -> list[tuple[str, str]]:
+        """Deduplicated [(canonical_id, display_name)] in order of first occurrence."""
+        seen = {}
+        for skill in skills or []:
+            resolved = self.resolve(skill)
+            if resolved and resolved[0] not in seen:
+                seen[resolved[0]] = resolved[1]
+        return list(seen.items())
+
+    def canonicalize(self, skills) -> list[str]:
+        """Deduplicated canonical display names in order of first occurrence."""
+        return [name for _, name in self.canonical_ids(skills)]
+
+
+@functools.lru_cache(maxsize=1)
+def get_canonicalizer() -> SkillCanonicalizer:
+    """Process-wide index over the built-in dictionary plus SKILL_DICTIONARY_PATH entries."""
+    return SkillCanonicalizer(load_aliases())
+
+
+def canonicalize_skills(skills) -> list[str]:
+    return get_canonicalizer().canonicalize(skills)
+
+
+def canonical_skill_id(skill: str) -> str | None:
+    resolved = get_canonicalizer().resolve(skill)
+    return resolved[0] if resolved else None
@@ -0,0 +1,297 @@
+"""
+Local, deterministic skill extraction.
+
+A curated canonical-skill → aliases dictionary is compiled once into an
+Aho-Corasick automaton, so a resume or JD is scanned in a single linear pass
+with no model call. Matches must sit on word boundaries ("Java" does not fire
+inside "JavaScript", "SQL" not inside "PostgreSQL"). Aliases that are also
+names or seasons ("Ruby Jenkins", "Spring 2022") only count next to another
+skill on the same line.
+
+Extra entries can be merged from a JSON file ({"Canonical": ["alias", ...]})
+named by SKILL_DICTIONARY_PATH.
+"""
+import os
+import re
+import json
+import bisect
+import functools
+from collections import deque
+
+SKILL_DICTIONARY_PATH = os.getenv("SKILL_DICTIONARY_PATH")
+
+# Canonical name → extra aliases (the canonical name itself is always an alias).
+# Single letters and common English words ("Go", "R", "C") are only listed in
+# unambiguous forms.
+SKILL_ALIASES = {
+    # Languages
+    "Python": ["python3"],
+    "Java": [],
+    "JavaScript": ["js", "java script", "ecmascript"],
+    "TypeScript": ["ts"],
+    "C++": ["cpp"],
+    "C#": ["c sharp", "csharp"],
+    "Golang": ["go lang"],
+    "Rust": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Scala": [],
+    "Ruby": [],
+    "PHP": [],
+    "MATLAB": [],
+    "R Programming": ["r language", "rstudio"],
+    "SQL": [],
+    "Bash": ["shell scripting", "bash scripting"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    # Data & ML
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "Generative AI": ["genai", "gen ai"],
+    "Large Language Models": ["llm", "llms"],
+    "Retrieval-Augmented Generation": ["rag", "retrieval augmented generation"],
+    "Prompt Engineering": [],
+    "Data Analysis": [],
+    "Data Visualization": [],
+    "Statistics": [],
+    "Feature Engineering": [],
+    "Time Series Analysis": ["time series"],
+    "Reinforcement Learning": [],
+    "MLOps": ["ml ops"],
+    "NumPy": [],
+    "Pandas": [],
+    "SciPy": [],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": ["tensor flow"],
+    "Keras": [],
+    "PyTorch": ["py torch", "torch"],
+    "XGBoost": [],
+    "LightGBM": [],
+    "Hugging Face": ["huggingface", "hugging face transformers"],
+    "Transformers": [],
+    "LangChain": ["lang chain"],
+    "LlamaIndex": ["llama index"],
+    "OpenAI API": ["openai"],
+    "Ollama": [],
+    "spaCy": [],
+    "NLTK": [],
+    "OpenCV": [],
+    "Matplotlib": [],
+    "Seaborn": [],
+    "Plotly": [],
+    "Streamlit": [],
+    "Gradio": [],
+    "FAISS": [],
+    "Pinecone": [],
+    "Weaviate": [],
+    "ChromaDB": ["chroma"],
+    "Apache Spark": ["spark", "pyspark"],
+    "Hadoop": [],
+    "Apache Kafka": ["kafka"],
+    "Apache Airflow": ["airflow"],
+    "dbt": [],
+    "Databricks": [],
+    "Snowflake": [],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["ms excel", "microsoft excel"],
+    "Jupyter": ["jupyter notebook"],
+    "MLflow": [],
+    # Databases
+    "MySQL": [],
+    "PostgreSQL": ["postgres"],
+    "SQLite": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search"],
+    "Cassandra": [],
+    "Oracle Database": ["oracle db"],
+    "Microsoft SQL Server": ["sql server", "mssql"],
+    "DynamoDB": [],
+    "BigQuery": [],
+    # Web & backend
+    "React": ["react.js", "reactjs"],
+    "Angular": ["angularjs"],
+    "Vue.js": ["vue", "vuejs"],
+    "Next.js": ["nextjs"],
+    "Node.js": ["node", "nodejs"],
+    "Express.js": ["express", "expressjs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["spring"],
+    ".NET": ["dotnet", "asp.net"],
+    "REST APIs": ["rest api", "restful", "rest"],
+    "GraphQL": [],
+    "gRPC": [],
+    "WordPress": [],
+    "Bootstrap": [],
+    "Tailwind CSS": ["tailwind"],
+    # Cloud & DevOps
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "GitHub Actions": [],
+    "GitLab CI": [],
+    "CI/CD": ["ci cd", "continuous integration"],
+    "Git": [],
+    "GitHub": [],
+    "Linux": [],
+    "Nginx": [],
+    "Microservices": [],
+    "AWS Lambda": ["lambda"],
+    "Amazon S3": ["s3"],
+    "Amazon SageMaker": ["sagemaker"],
+    # Testing & tooling
+    "Pytest": [],
+    "Selenium": [],
+    "Jira": [],
+    "Postman": [],
+}
+
+# Aliases that are also common words: only matched with this exact casing
+CASE_SENSITIVE_ALIASES = {
+    alias.lower(): alias for alias in [
+        "Rust", "Swift", "Spring", "Node", "Express", "Lambda", "Chroma", "Spark", "Git",
+        "Excel", "React", "Flask", "Vue", "Torch", "Statistics", "REST", "RAG",
+        "ML", "DL", "TS", "JS", "S3",
+    ]
+}
+
+# Aliases that are also first names, surnames or seasons: only matched on a line
+# that has another, unambiguous skill on it, and never right before a year
+CONTEXT_ALIASES = {"ruby", "jenkins", "cassandra", "spring", "swift", "rust", "chroma", "express", "lambda"}
+_YEAR_AFTER = re.compile(r"\s*(?:'\d{2}|(?:19|20)\d{2})\b")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+# ---------------- AHO-CORASICK ----------------
+class SkillMatcher:
+    """Aho-Corasick automaton over skill aliases, matching on word boundaries."""
+
+    def __init__(self, aliases: dict[str, list[str]]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # per state: list of (alias_length, canonical, case_sensitive_alias, needs_context)
+        for canonical, extra in aliases.items():
+            for alias in [canonical, *extra]:
+                self._add(alias, canonical)
+        self._build()
+
+    def _add(self, alias, canonical):
+        exact = CASE_SENSITIVE_ALIASES.get(alias.lower())
+        state = 0
+        for ch in alias.lower():
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(alias), canonical, exact, alias.lower() in CONTEXT_ALIASES))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _scan(self, text):
+        """(start, end, canonical, needs_context) for every word-bounded alias occurrence."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A character changes length when lowercased ("İ" → "i̇"); lowercase per
+            # character instead, keeping those as they are, so offsets stay aligned
+            lowered = "".join(low if len(low) == 1 else ch for ch, low in ((ch, ch.lower()) for ch in text))
+        n = len(text)
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, canonical, exact, needs_context in out[state]:
+                start, end = i - length + 1, i + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < n and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                yield start, end, canonical, needs_context
+
+    @staticmethod
+    def _longest(spans):
+        """Non-overlapping spans, leftmost-longest: "Java Script" is JavaScript, not also Java."""
+        kept, last_end = [], 0
+        for span in sorted(spans, key=lambda s: (s[0], s[0] - s[1])):
+            if span[0] >= last_end:
+                kept.append(span)
+                last_end = span[1]
+        return kept
+
+    def find_spans(self, text: str) -> list[tuple[int, int, str]]:
+        """(start, end, canonical) for every word-bounded, non-overlapping alias occurrence, in order."""
+        spans = self._longest(self._scan(text))
+        if not any(needs_context for *_, needs_context in spans):
+            return [span[:3] for span in spans]
+        anchors = sorted(start for start, _, _, needs_context in spans if not needs_context)
+        found = []
+        for start, end, canonical, needs_context in spans:
+            if needs_context:
+                if _YEAR_AFTER.match(text, end):
+                    continue
+                line_start = text.rfind("\n", 0, start) + 1
+                line_end = text.find("\n", end)
+                k = bisect.bisect_left(anchors, line_start)
+                if k == len(anchors) or (line_end != -1 and anchors[k] >= line_end):
+                    continue
+            found.append((start, end, canonical))
+        return found
+
+    def find(self, text: str) -> list[str]:
+        """Canonical skills present in `text`, in order of first occurrence."""
+        seen = {}
+        for start, _, canonical in self.find_spans(text or ""):
+            seen.setdefault(canonical, start)
+        return sorted(seen, key=seen.get)
+
+
+def load_aliases(path=SKILL_DICTIONARY_PATH) -> dict[str, list[str]]:
+    """Built-in dictionary merged with an optional JSON file of extra entries."""
+    aliases = {k: list(v) for k, v in SKILL_ALIASES.items()}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for canonical, extra in json.load(f).items():
+                aliases.setdefault(canonical, []).extend(extra)
+    return aliases
+
+
+@functools.lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Process-wide matcher, compiled on first use."""
+    return SkillMatcher(load_aliases())
+
+
+def extract_skills_local(text: str) -> list[str]:
+    """Dictionary-only skill extraction (no LLM, no network)."""
+    return get_skill_matcher().find(text)
@@ -1,28 +1,38 @@
 import os
-import json
-import socket
-import requests
+import logging
+import time
+import threading
 import fitz  # PyMuPDF
 import streamlit as st
 from langchain_community.llms import Ollama
-
-# ---------------- CONFIG ----------------
-groq_api_key = (
-    os.getenv("GROQ_API_KEY")   # first check environment variable
-    or st.secrets.get("GROQ_API_KEY")  # fallback to secrets.toml
+from resume_skill_extractor.llm_cache import get_llm_cache
+from resume_skill_extractor.groq_client import GroqAPIError, get_groq_client
+from resume_skill_extractor.llm_router import LLMRouter, probe_ollama
+from resume_skill_extractor.skill_dictionary import extract_skills_local
+from resume_skill_extractor.skill_canonical import canonicalize_skills, get_canonicalizer
+from resume_skill_extractor.prompt_compaction import compact_text, PROMPT_TOKEN_BUDGET
+from resume_skill_extractor.stream_parser import IncrementalSkillParser
+from resume_skill_extractor.json_repair import parse_with_repair
+from resume_skill_extractor.near_dup import (
+    find_prior_extraction, record_batch_duplicates, remember_extraction, skills_still_present,
 )
-OLLAMA_MODEL = "mistral:latest"
 
+logger = logging.getLogger(__name__)
 
-# ---------------- ENV DETECTION ----------------
-def is_local_env():
-    """Detect if running locally (for Ollama fallback)."""
+# ---------------- CONFIG ----------------
+def _load_groq_api_key():
+    """Environment variable first, then secrets.toml (missing secrets file → None)."""
+    key = os.getenv("GROQ_API_KEY")
+    if key:
+        return key
     try:
-        host = socket.gethostname()
-        ip = socket.gethostbyname(host)
-        return ip.startswith("127.") or ip == "localhost"
-    except:
-        return False
+        return st.secrets.get("GROQ_API_KEY")
+    except Exception:
+        return None
+
+
+groq_api_key = _load_groq_api_key()
+OLLAMA_MODEL = "mistral:latest"
 
 
 # ---------------- OLLAMA ----------------
@@ -32,101 +42,352 @@ def get_ollama_client():
     return Ollama(model=OLLAMA_MODEL)
 
 
-def use_ollama(prompt: str) -> str:
-    """Run prompt locally via Ollama."""
-    llm = get_ollama_client()
-    return llm.invoke(prompt)
+def _ollama_request(prompt):
+    return get_ollama_client().invoke(prompt)
 
 
 # ---------------- GROQ ----------------
-def use_groq(prompt, model_choice, api_key):
-    if not api_key:
+def _groq_request(prompt, model_choice, api_key):
+    """One chat completion through the pooled client; API failures are logged, not raised."""
+    try:
+        return get_groq_client(api_key).chat(prompt, model_choice)
+    except GroqAPIError as e:
+        logger.warning("%s", e)
         return None
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-
-    response = requests.post(
-        "https://api.groq.com/openai/v1/chat/completions",
-        headers=headers,
-        json={
-            "model": model_choice,
-            "messages": [{"role": "user", "content": prompt}]
-        }
-    )
-
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"]
-
-    # Debugging message (optional)
-    st.error(f"Groq API error {response.status_code}: {response.text}")
+
+# ---------------- BACKEND DISPATCH ----------------
+def _backend_model(name, model_choice):
+    return OLLAMA_MODEL if name == "ollama" else model_choice
+
+
+def _caching(name, request):
+    """Router call for one backend: always hits the backend (so its latency is real) and stores the reply."""
+    def call(prompt, model_choice, api_key):
+        response = request(prompt, model_choice, api_key)
+        if response:
+            get_llm_cache().set(name, _backend_model(name, model_choice), prompt, str(response))
+        return response
+    return call
+
+
+def _cached_response(names, prompt, model_choice):
+    """First cached reply for `prompt` among the backends `names`, in order."""
+    cache = get_llm_cache()
+    for name in names:
+        cached = cache.get(name, _backend_model(name, model_choice), prompt)
+        if cached:
+            return cached
     return None
 
 
-# ---------------- MAIN EXTRACTION ----------------
-@st.cache_data(show_spinner=False)
-def extract_skills_cached(resume_text: str, jd_text: str,
-                          groq_api_key, model_choice: str) -> tuple[list[str], list[str]]:
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> LLMRouter:
     """
-    Extract skills separately for Resume and JD.
-    Always returns: (resume_skills_list, jd_skills_list).
+    Process-wide router over Ollama and Groq.
+    Ollama health is probed once per TTL instead of on every request, and a
+    dead backend is circuit-broken rather than timing out on each call.
+    The registered calls bypass the cache lookup; run_prompt serves cache
+    hits itself so they never count as backend latency.
     """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                router = LLMRouter()
+                router.register("ollama", _caching("ollama", lambda prompt, model_choice, api_key:
+                                                   _ollama_request(prompt)), probe=probe_ollama)
+                router.register("groq", _caching("groq", _groq_request), needs_api_key=True)
+                _router = router
+    return _router
 
-    prompt = f"""
+
+def run_prompt(prompt: str, model_choice: str, groq_api_key, prefer=None, use_cache=True) -> str | None:
+    """
+    Send one prompt to the fastest healthy backend (falls through to the next on failure).
+    A reply already cached for any usable backend is returned without a backend call,
+    unless use_cache=False (a retry of a useless reply); the fresh reply replaces it.
+    """
+    router = get_router()
+    names = [name for name, b in router.backends.items() if not (b.needs_api_key and not groq_api_key)]
+    if prefer:
+        names.sort(key=lambda name: name != prefer)
+    cached = _cached_response(names, prompt, model_choice) if use_cache else None
+    if cached:
+        return cached
+    return router.call(prompt, model_choice, groq_api_key, prefer=prefer)
+
+
+def _parse_reply(raw, key, prompt, model_choice, groq_api_key, prefer=None):
+    """parse_skills for the reply to `prompt`, with the repair re-prompt and the one uncached retry."""
+    return parse_skills(raw, key,
+                        reprompt=lambda p: run_prompt(p, model_choice, groq_api_key, prefer=prefer),
+                        retry=lambda: run_prompt(prompt, model_choice, groq_api_key, prefer=prefer,
+                                                 use_cache=False))
+
+
+# ---------------- PROMPTS ----------------
+SKILLS_PROMPT = """
 You are a strict JSON generator.
-Extract **only technical skills** from the given texts.
+Extract **only technical skills** from the given text.
 Do not include explanations or extra text.
 Return JSON only in this exact format:
 
 {{
-    "resume_skills": ["Skill1", "Skill2"],
-    "jd_skills": ["SkillA", "SkillB"]
+    "{key}": ["Skill1", "Skill2"]
 }}
 
-Resume:
-{resume_text}
-
-Job Description:
-{jd_text}
+{label}:
+{text}
 """
 
-    raw_result = None
 
-    if is_local_env():
-        # Local → prefer Ollama, fallback to Groq
-        try:
-            raw_result = use_ollama(prompt)
-        except Exception:
-            raw_result = use_groq(prompt, model_choice, groq_api_key)
-    else:
-        # Cloud → always Groq
-        raw_result = use_groq(prompt, model_choice, groq_api_key)
+# kind → (JSON key, document label)
+SKILL_KINDS = {
+    "resume": ("resume_skills", "Resume"),
+    "jd": ("jd_skills", "Job Description"),
+}
 
-    # Defaults
-    resume_skills, jd_skills = [], []
 
-    # Parse JSON safely
-    try:
-        if not raw_result:
-            return [], []
+def build_skills_prompt(text: str, key: str, label: str) -> str:
+    return SKILLS_PROMPT.format(key=key, label=label, text=text)
+
+
+# ---------------- PARSING ----------------
+def parse_skills(raw_result, key: str, reprompt=None, retry=None) -> list[str]:
+    """
+    Parse the model's reply and return the list stored under `key`.
+    Malformed JSON is repaired locally (fences, trailing commas, quotes,
+    truncated arrays); `reprompt` is only called for what could not be read:
+    the cut-off tail of a truncated array, or malformed JSON. A reply without
+    JSON is retried once through `retry`. Failures are logged (this also runs in
+    worker threads and CLIs); the app reads them from json_repair.repair_stats().
+    """
+    if not raw_result:
+        return []
+
+    skills = parse_with_repair(raw_result, key, reprompt=reprompt, retry=retry)
+    if skills is None:
+        logger.warning("Skill JSON parsing failed; raw output was: %.500s", raw_result)
+        return []
+    return skills
+
+
+# ---------------- EXTRACTION MODES ----------------
+# "auto"    → local dictionary; LLM only when the dictionary finds too few skills
+# "augment" → local dictionary + LLM, merged
+# "local"   → local dictionary only (offline, no LLM spend)
+# "llm"     → LLM only
+EXTRACTION_MODES = ("auto", "augment", "local", "llm")
+SKILL_EXTRACTION_MODE = os.getenv("SKILL_EXTRACTION_MODE", "auto")
+LOCAL_MIN_SKILLS = int(os.getenv("SKILL_LOCAL_MIN_SKILLS", "8"))
+
+
+def compact_prompt_text(text: str, token_budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Section-aware compaction of `text` for the prompt (a cut of the original if every section is dropped)."""
+    compacted = compact_text(text, token_budget)
+    if compacted.tokens_saved:
+        logger.debug("Prompt compaction saved %d tokens (%s dropped)",
+                     compacted.tokens_saved, ", ".join(compacted.sections_dropped) or "none")
+    return compacted.text
+
+
+def merge_skills(primary: list[str], extra: list[str]) -> list[str]:
+    """Canonical names of `primary` then `extra`, deduplicated on canonical skill ID."""
+    return canonicalize_skills(list(primary) + list(extra))
 
-        cleaned = raw_result.strip()
 
-        # Remove ```json code blocks if present
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("```")[1]
-            cleaned = cleaned.replace("json", "", 1).strip()
+def local_skill_pass(text: str, mode: str | None = None) -> tuple[list[str], bool]:
+    """Dictionary skills for `text` and whether the LLM still has to run under `mode`."""
+    mode = mode or SKILL_EXTRACTION_MODE
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"mode must be one of {EXTRACTION_MODES}")
+    local_skills = extract_skills_local(text) if mode != "llm" else []
+    done = mode == "local" or (mode == "auto" and len(local_skills) >= LOCAL_MIN_SKILLS)
+    return local_skills, not done
 
-        data = json.loads(cleaned)
 
-        # Extract lists safely
-        resume_skills = [str(s).strip() for s in data.get("resume_skills", []) if s]
-        jd_skills = [str(s).strip() for s in data.get("jd_skills", []) if s]
+def near_dup_namespace(key: str, model_choice: str, mode: str | None = None) -> tuple:
+    """Near-duplicate index namespace: LLM skills are only reused for the same output, model and mode."""
+    return key, model_choice, mode or SKILL_EXTRACTION_MODE
 
-    except Exception as e:
-        st.error(f"⚠️ JSON parsing failed: {e}")
-        st.write("Raw output was:", raw_result)
 
+def fill_near_duplicates(texts, representatives, results, mode: str | None = None) -> list[list[str]]:
+    """
+    Expand per-group `results` (one per text that is its own representative, see
+    near_dup.group_near_duplicates) to every text. A near-duplicate gets those of
+    its group's skills it still mentions, merged with its own dictionary pass.
+    """
+    by_rep = dict(zip([i for i, rep in enumerate(representatives) if rep == i], results))
+    filled, reused = [], 0
+    for i, rep in enumerate(representatives):
+        if rep == i:
+            filled.append(by_rep[i])
+            continue
+        local_skills, needs_llm = local_skill_pass(texts[i], mode) if texts[i] else ([], False)
+        if needs_llm:
+            reused += 1
+            filled.append(merge_skills(skills_still_present(by_rep[rep], texts[i]), local_skills))
+        else:
+            filled.append(local_skills)
+    record_batch_duplicates(reused)
+    return filled
+
+
+def extract_document_skills(text: str, key: str, label: str, groq_api_key, model_choice: str,
+                            mode: str | None = None, prefer=None) -> list[str]:
+    """Skills for one document under the given extraction mode (uncached)."""
+    if not text:
+        return []
+    local_skills, needs_llm = local_skill_pass(text, mode)
+    if not needs_llm:
+        return local_skills
+
+    # A near-duplicate of an earlier document reuses the LLM skills it still mentions
+    namespace = near_dup_namespace(key, model_choice, mode)
+    signature, prior = find_prior_extraction(namespace, text)
+    if prior is not None:
+        return merge_skills(skills_still_present(prior, text), local_skills)
+
+    prompt = build_skills_prompt(compact_prompt_text(text), key, label)
+    llm_skills = _parse_reply(run_prompt(prompt, model_choice, groq_api_key, prefer=prefer), key,
+                              prompt, model_choice, groq_api_key, prefer)
+    if llm_skills:
+        remember_extraction(namespace, signature, llm_skills)
+    return merge_skills(llm_skills, local_skills)
+
+
+# ---------------- MAIN EXTRACTION ----------------
+@st.cache_data(show_spinner=False)
+def extract_resume_skills(resume_text: str, groq_api_key, model_choice: str,
+                          mode: str | None = None) -> list[str]:
+    """Extract technical skills from a resume (cached on the resume text alone)."""
+    return extract_document_skills(resume_text, "resume_skills", "Resume",
+                                   groq_api_key, model_choice, mode)
+
+
+@st.cache_data(show_spinner=False)
+def extract_jd_skills(jd_text: str, groq_api_key, model_choice: str,
+                      mode: str | None = None) -> list[str]:
+    """Extract technical skills from a job description (cached on the JD text alone)."""
+    return extract_document_skills(jd_text, "jd_skills", "Job Description",
+                                   groq_api_key, model_choice, mode)
+
+
+def extract_skills_cached(resume_text: str, jd_text: str,
+                          groq_api_key, model_choice: str,
+                          mode: str | None = None) -> tuple[list[str], list[str]]:
+    """
+    Extract skills separately for Resume and JD.
+    Each side is its own cached LLM call, so changing one text never re-runs the other.
+    Always returns: (resume_skills_list, jd_skills_list).
+    """
+    resume_skills = extract_resume_skills(resume_text, groq_api_key, model_choice, mode)
+    jd_skills = extract_jd_skills(jd_text, groq_api_key, model_choice, mode)
     return resume_skills, jd_skills
+
+
+# ---------------- STREAMING ----------------
+def _stream_backend(name, prompt, model_choice, groq_api_key):
+    if name == "ollama":
+        return get_ollama_client().stream(prompt), OLLAMA_MODEL
+    return get_groq_client(groq_api_key).stream_chat(prompt, model_choice), model_choice
+
+
+def stream_completion(prompt: str, model_choice: str, groq_api_key):
+    """
+    Yield completion text chunks from the fastest healthy backend.
+    A cached response is yielded in one piece; a fresh one is stored in the
+    shared LLM cache once the stream completes. A backend that fails before
+    producing any text is skipped in favour of the next one.
+    """
+    router = get_router()
+    cache = get_llm_cache()
+    candidates = [b.name for b in router.candidates()
+                  if not (b.needs_api_key and not groq_api_key)]
+
+    cached = _cached_response(candidates, prompt, model_choice)
+    if cached:
+        yield cached
+        return
+
+    for name in candidates:
+        if not router.admit(name):
+            continue
+        start = time.perf_counter()
+        chunks = []
+        try:
+            stream, model = _stream_backend(name, prompt, model_choice, groq_api_key)
+            for chunk in stream:
+                chunk = str(chunk)
+                chunks.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            # The consumer stopped reading; the backend was answering, so release its admission
+            router.record(name, time.perf_counter() - start, failed=False)
+            raise
+        except Exception as e:
+            logger.info("Streaming from %s failed: %s", name, e)
+            router.record(name, time.perf_counter() - start, failed=True)
+            if chunks:
+                return  # partial output already delivered
+            continue
+        full = "".join(chunks)
+        router.record(name, time.perf_counter() - start, failed=not full)
+        if full:
+            cache.set(name, model, prompt, full)
+            return
+
+
+def stream_document_skills(text: str, key: str, label: str, groq_api_key, model_choice: str,
+                           mode: str | None = None):
+    """
+    Generator version of extract_document_skills: yields each skill as soon as it is known.
+    Dictionary hits come first; LLM skills follow one by one as their JSON array
+    elements complete in the stream.
+    """
+    if not text:
+        return
+    local_skills, needs_llm = local_skill_pass(text, mode)
+    canonicalizer = get_canonicalizer()
+    seen = set()
+
+    def fresh(skills):
+        for skill_id, skill in canonicalizer.canonical_ids(skills):
+            if skill_id not in seen:
+                seen.add(skill_id)
+                yield skill
+
+    yield from fresh(local_skills)
+    if not needs_llm:
+        return
+
+    namespace = near_dup_namespace(key, model_choice, mode)
+    signature, prior = find_prior_extraction(namespace, text)
+    if prior is not None:
+        yield from fresh(skills_still_present(prior, text))
+        return
+
+    prompt = build_skills_prompt(compact_prompt_text(text), key, label)
+    parser = IncrementalSkillParser(key)
+    chunks = []
+    for chunk in stream_completion(prompt, model_choice, groq_api_key):
+        chunks.append(chunk)
+        yield from fresh(parser.feed(chunk))
+
+    # Whatever the incremental pass could not see (e.g. unusual formatting)
+    llm_skills = _parse_reply("".join(chunks), key, prompt, model_choice, groq_api_key)
+    if llm_skills:
+        remember_extraction(namespace, signature, llm_skills)
+    yield from fresh(llm_skills)
+
+
+def stream_resume_skills(resume_text: str, groq_api_key, model_choice: str, mode: str | None = None):
+    return stream_document_skills(resume_text, "resume_skills", "Resume", groq_api_key, model_choice, mode)
+
+
+def stream_jd_skills(jd_text: str, groq_api_key, model_choice: str, mode: str | None = None):
+    return stream_document_skills(jd_text, "jd_skills", "Job Description", groq_api_key, model_choice, mode)
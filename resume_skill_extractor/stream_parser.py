@@ -0,0 +1,89 @@
+import json
+
+
+class IncrementalSkillParser:
+    """
+    Incremental parser for the extractor's JSON contract ({"<key>": ["Skill", ...]}).
+
+    Feed it completion chunks as they stream in; each call returns the array
+    elements of `key` that became complete in that chunk. Anything outside the
+    JSON object (```json fences, leading prose) is ignored. With key=None,
+    string elements of every array are returned. `parsed_until` is the offset,
+    over everything fed so far, just past the last element returned.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self._stack = []          # containers: ("{", None) or ("[", array_key)
+        self._in_string = False
+        self._escape = False
+        self._buf = []
+        self._last_string = None  # most recent completed string (candidate object key)
+        self._pending_key = None  # object key waiting for its value
+        self._fed = 0
+        self.parsed_until = 0
+        self.skills = []
+
+    def _array_wanted(self, array_key):
+        return self.key is None or array_key == self.key
+
+    @property
+    def in_wanted_array(self) -> bool:
+        """True while the input stops inside an array of `key` (e.g. a truncated reply)."""
+        return bool(self._stack) and self._stack[-1][0] == "[" and self._array_wanted(self._stack[-1][1])
+
+    def _finish_string(self, out, end):
+        raw = "".join(self._buf)
+        self._buf = []
+        try:
+            value = json.loads(f'"{raw}"')
+        except ValueError:
+            value = raw
+        top = self._stack[-1] if self._stack else None
+        if top and top[0] == "[" and self._array_wanted(top[1]):
+            value = value.strip()
+            if value:
+                self.skills.append(value)
+                out.append(value)
+                self.parsed_until = end
+        self._last_string = value
+
+    def feed(self, chunk: str) -> list[str]:
+        out = []
+        chunk = chunk or ""
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._buf.append(ch)
+                    self._escape = False
+                elif ch == "\\":
+                    self._buf.append(ch)
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._finish_string(out, self._fed + i + 1)
+                else:
+                    self._buf.append(ch)
+                continue
+
+            if ch == '"':
+                # Strings only count inside the JSON object; prose quotes are skipped
+                if self._stack:
+                    self._in_string = True
+                    self._last_string = None
+            elif ch == "{":
+                self._stack.append(("{", None))
+                self._pending_key = None
+            elif ch == "[":
+                parent_is_object = bool(self._stack) and self._stack[-1][0] == "{"
+                self._stack.append(("[", self._pending_key if parent_is_object else None))
+                self._pending_key = None
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+            elif ch == ":" and self._stack and self._stack[-1][0] == "{":
+                self._pending_key = self._last_string
+            elif ch == ",":
+                self._last_string = None
+        self._fed += len(chunk)
+        return out
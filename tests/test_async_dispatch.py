@@ -0,0 +1,55 @@
+import time
+import threading
+
+import pytest
+
+pytest.importorskip("langchain_community")
+
+from resume_skill_extractor import near_dup, skill_extractor  # noqa: E402
+from resume_skill_extractor.async_dispatch import extract_skills_bulk  # noqa: E402
+from resume_skill_extractor.llm_cache import _NullCache  # noqa: E402
+from resume_skill_extractor.llm_router import LLMRouter  # noqa: E402
+
+
+class SlowBackend:
+    """Fake backend that sleeps and records its peak number of concurrent calls."""
+
+    def __init__(self, reply, delay=0.03):
+        self.reply, self.delay = reply, delay
+        self.active = self.peak = self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, model_choice, api_key):
+        with self._lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return self.reply
+
+
+@pytest.fixture
+def router(monkeypatch):
+    router = LLMRouter(failure_threshold=1000)
+    monkeypatch.setattr(skill_extractor, "get_router", lambda: router)
+    monkeypatch.setattr(skill_extractor, "get_llm_cache", lambda: _NullCache())
+    monkeypatch.setattr(near_dup, "_indexes", {})
+    return router
+
+
+def test_per_backend_caps_follow_the_backend_the_router_calls(router):
+    # The router prefers groq (registered first), but groq never answers, so calls
+    # fall through to ollama, which must still see at most 2 calls at a time
+    groq, ollama = SlowBackend(None), SlowBackend('{"resume_skills": ["Python"]}')
+    router.register("groq", groq)
+    router.register("ollama", ollama)
+
+    texts = [f"Resume {i}: {' '.join(f'word{i}x{j}' for j in range(40))}" for i in range(24)]
+    results = extract_skills_bulk(texts, kind="resume", groq_api_key="key", model_choice="m", mode="llm",
+                                  max_concurrency=16, backend_limits={"groq": 5, "ollama": 2})
+    assert results == [["Python"]] * 24
+    assert ollama.calls == 24 and groq.calls >= 2  # groq sinks in the order once its error rate climbs
+    assert ollama.peak == 2
+    assert groq.peak <= 5
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+from jd_skill_gap_analyzer import batch_rank, taxonomy_index
+from jd_skill_gap_analyzer.batch_rank import score_chunk
+from jd_skill_gap_analyzer.helper import _normalized_matrix, match_skills
+from jd_skill_gap_analyzer.taxonomy_index import SkillTaxonomyIndex
+
+DIM = 16
+SKILLS = [f"skill{i}" for i in range(60)]
+
+
+@pytest.fixture
+def vectors(monkeypatch):
+    rng = np.random.default_rng(0)
+    # Correlated vectors so that some pairs clear the threshold
+    base = rng.normal(size=(6, DIM))
+    table = {s: (base[i % 6] + 0.6 * rng.normal(size=DIM)).astype(np.float32) for i, s in enumerate(SKILLS)}
+    monkeypatch.setattr(batch_rank, "embed_texts", lambda texts: np.stack([table[t] for t in texts]))
+    return table
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5, 0.7, 0.9])
+def test_score_chunk_matches_match_skills(vectors, threshold):
+    rng = np.random.default_rng(1)
+    jd_skills = list(rng.choice(SKILLS, 8, replace=False))
+    jd_matrix = _normalized_matrix(np.stack([vectors[s] for s in jd_skills]))
+    chunk = [(f"r{i}", list(rng.choice(SKILLS, rng.integers(1, 12), replace=False))) for i in range(20)]
+    chunk.insert(3, ("empty", []))
+
+    rows = score_chunk(jd_skills, jd_matrix, chunk, threshold)
+    assert [row["resume_id"] for row in rows] == [rid for rid, _ in chunk]
+    for row, (_, skills) in zip(rows, chunk):
+        resume_vectors = np.stack([vectors[s] for s in skills]) if skills else np.zeros((0, DIM), np.float32)
+        matched, missing, _, score, _ = match_skills(skills, jd_skills, resume_vectors,
+                                                     np.stack([vectors[s] for s in jd_skills]), threshold)
+        assert row["matched"] == [jd for jd, _, _ in matched]
+        assert row["missing"] == missing and row["score"] == score
+
+
+def test_taxonomy_labels_are_looked_up_once_per_skill(vectors, monkeypatch, tmp_path):
+    index = SkillTaxonomyIndex.build(SKILLS[:12], np.stack([vectors[s] for s in SKILLS[:12]]),
+                                     str(tmp_path / "tax"), nlist=2, backend="numpy")
+    looked_up = []
+    nearest = index.nearest
+    monkeypatch.setattr(index, "nearest", lambda v, *a: looked_up.append(len(v)) or nearest(v, *a))
+    monkeypatch.setattr(taxonomy_index, "TAXONOMY_MAPPING", True)
+    monkeypatch.setattr(taxonomy_index, "get_taxonomy_index", lambda: index)
+
+    jd_skills = SKILLS[:4]
+    jd_matrix = _normalized_matrix(np.stack([vectors[s] for s in jd_skills]))
+    chunk = [("a", SKILLS[10:20]), ("b", SKILLS[15:25])]
+    cache = {}
+    first = score_chunk(jd_skills, jd_matrix, chunk, 0.95, cache)
+    assert sum(looked_up) == 4 + 15
+    assert score_chunk(jd_skills, jd_matrix, chunk, 0.95, cache) == first
+    assert sum(looked_up) == 4 + 15
+    assert first == score_chunk(jd_skills, jd_matrix, chunk, 0.95)
+
+
+def test_rank_resumes_streams_every_row(monkeypatch, tmp_path):
+    pytest.importorskip("langchain_community")
+    rng = np.random.default_rng(2)
+    monkeypatch.setattr(batch_rank, "embed_texts", lambda texts: rng.normal(size=(len(texts), DIM)))
+    resumes = [("a", "Python, Docker and Kubernetes"), ("b", ""), ("c", "Python and SQL")]
+    out = tmp_path / "ranked.jsonl"
+    top = batch_rank.rank_resumes("", resumes, jd_skills=["Python", "Docker"], top_k=2, output_path=str(out),
+                                  chunk_size=2, mode="local", threshold=2.0)
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [row["resume_id"] for row in rows] == ["a", "b", "c"]
+    assert [row["resume_id"] for row in top] == ["a", "b"] and top[0]["rank"] == 1
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from docx.enum.text import WD_BREAK  # noqa: E402
+from docx.table import Table, _Cell  # noqa: E402
+
+from resume_skill_extractor.docx_extract import extract_docx_text, iter_docx_paragraphs  # noqa: E402
+
+
+def make_docx():
+    doc = docx.Document()
+    doc.add_heading("Jane Doe", 0)
+    doc.add_paragraph("Data engineer building pipelines in Python and SQL.")
+    run = doc.add_paragraph().add_run("Skills:")
+    run.add_tab()
+    run.add_text("Spark")
+    run.add_break()
+    run.add_text("Airflow")
+    run.add_break(WD_BREAK.PAGE)
+    run.add_text("Docker")
+    table = doc.add_table(rows=2, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"cell {r}.{c}"
+    table.cell(1, 2).add_paragraph("Kubernetes\tAWS")
+    doc.add_paragraph("")
+    doc.add_paragraph("  References on request  ")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_paragraphs(container):
+    """Paragraph.text of every body and table-cell paragraph, in document order."""
+    for block in container.iter_inner_content():
+        if isinstance(block, Table):
+            for row in block.rows:
+                for tc in row._tr.tc_lst:
+                    yield from python_docx_paragraphs(_Cell(tc, block))
+        else:
+            yield block.text
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_docx()
+
+
+@pytest.mark.parametrize("wrap", [bytes, memoryview, io.BytesIO], ids=["bytes", "memoryview", "BytesIO"])
+def test_paragraphs_match_python_docx(data, wrap):
+    expected = list(python_docx_paragraphs(docx.Document(io.BytesIO(data))))
+    assert "Skills:\tSpark\nAirflowDocker" in expected  # a page break has no text
+    assert "Kubernetes\tAWS" in expected
+    assert list(iter_docx_paragraphs(wrap(data))) == expected
+
+
+@pytest.mark.parametrize("wrap", [bytes, memoryview, io.BytesIO], ids=["bytes", "memoryview", "BytesIO"])
+def test_text_drops_empty_lines_and_strips(data, wrap):
+    expected = "\n".join(p.strip() for p in python_docx_paragraphs(docx.Document(io.BytesIO(data))) if p.strip())
+    text = extract_docx_text(wrap(data))
+    assert text == expected
+    assert text.splitlines()[0] == "Jane Doe" and text.endswith("References on request")
@@ -0,0 +1,84 @@
+import zlib
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from jd_skill_gap_analyzer.embedding_cache import SkillEmbeddingCache
+
+DIM = 8
+
+
+def vector_for(text):
+    rng = np.random.default_rng(zlib.crc32(text.encode()))
+    return rng.standard_normal(DIM).astype(np.float32)
+
+
+def _writer(cache_dir, prefix, n, capacity):
+    cache = SkillEmbeddingCache(cache_dir, model_name="m", capacity=capacity, dtype="float32")
+    for start in range(0, n, 5):
+        texts = [f"{prefix}-{i}" for i in range(start, start + 5)]
+        cache.embed(texts, lambda batch: [vector_for(t) for t in batch])
+
+
+def _run_writers(cache_dir, capacity, n=60):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_writer, args=(str(cache_dir), p, n, capacity)) for p in ("a", "b", "c")]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+
+def test_processes_sharing_a_store_never_mix_up_vectors(tmp_path):
+    _run_writers(tmp_path, capacity=1000)
+    cache = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=1000, dtype="float32")
+    assert cache.count == 180
+    for prefix in "abc":
+        for i in range(60):
+            text = f"{prefix}-{i}"
+            np.testing.assert_array_equal(cache.get(text), vector_for(text))
+
+
+def test_eviction_across_processes_returns_only_matching_vectors(tmp_path):
+    _run_writers(tmp_path, capacity=50)
+    cache = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=50, dtype="float32")
+    found = 0
+    for prefix in "abc":
+        for i in range(60):
+            text = f"{prefix}-{i}"
+            vec = cache.get(text)
+            if vec is not None:
+                found += 1
+                np.testing.assert_array_equal(vec, vector_for(text))
+    assert 0 < found <= 50
+
+
+def test_get_returns_a_copy_that_eviction_cannot_change(tmp_path):
+    cache = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=1, dtype="float32")
+    cache.put("python", vector_for("python"))
+    held = cache.get("python")
+    cache.put("sql", vector_for("sql"))  # evicts the only slot
+    np.testing.assert_array_equal(held, vector_for("python"))
+    assert cache.get("python") is None
+
+
+def test_dim_mismatch_does_not_truncate_the_store(tmp_path):
+    cache = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=10, dtype="float32")
+    cache.put("python", vector_for("python"))
+    cache.put("odd", np.ones(DIM + 1, dtype=np.float32))
+    other = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=10, dtype="float32")
+    np.testing.assert_array_equal(other.get("python"), vector_for("python"))
+    assert other.get("odd") is None
+
+
+def test_misses_and_hits_return_the_same_vectors(tmp_path):
+    cache = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=10, dtype="float16")
+    texts = ["python", "sql", "Python "]
+    first = cache.embed(texts, lambda batch: [vector_for(t) for t in batch])
+    again = SkillEmbeddingCache(str(tmp_path), model_name="m", capacity=10, dtype="float16").embed(
+        texts, lambda batch: pytest.fail("cache miss"))
+    assert first.dtype == again.dtype == np.float32
+    np.testing.assert_array_equal(first, again)
+    np.testing.assert_array_equal(first[0], vector_for("python").astype(np.float16).astype(np.float32))
@@ -0,0 +1,86 @@
+import io
+import os
+import mmap
+import hashlib
+import zipfile
+
+import pytest
+
+from resume_skill_extractor.file_source import BufferReader, as_buffer, as_file, source_digest
+from resume_skill_extractor.ingest import parse_document
+
+
+def zip_bytes():
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        zf.writestr("a.txt", "resume a")
+    return out.getvalue()
+
+
+class Pipe(io.RawIOBase):
+    """A readable stream that has seekable() but cannot seek (like a socket or pipe)."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def readinto(self, b):
+        return self._data.readinto(b)
+
+
+def test_buffer_reader_reads_seeks_and_tells():
+    reader = BufferReader(memoryview(b"0123456789")[2:])
+    assert reader.read(3) == b"234" and reader.tell() == 3
+    assert reader.seek(-2, io.SEEK_END) == 6 and reader.read() == b"89"
+    assert reader.read(5) == b""
+    reader.seek(1)
+    assert reader.seek(2, io.SEEK_CUR) == 3 and reader.read(1) == b"5"
+    assert reader.seek(-50, io.SEEK_CUR) == 0
+    reader.close()
+    assert reader.closed
+
+
+def test_as_file_keeps_seekable_files_and_wraps_the_rest(tmp_path):
+    data = zip_bytes()
+    path = tmp_path / "a.zip"
+    path.write_bytes(data)
+    assert as_file(str(path)) == str(path)
+    with open(path, "rb") as f:
+        assert as_file(f) is f
+
+    pipe = Pipe(data)
+    wrapped = as_file(pipe)
+    assert isinstance(wrapped, BufferReader)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        sources = [data, memoryview(data), bytearray(data), io.BytesIO(data), mm]
+        for source in sources:
+            reader = as_file(source)
+            assert isinstance(reader, BufferReader)
+            with zipfile.ZipFile(reader) as zf:
+                assert zf.read("a.txt") == b"resume a"
+            reader.close()
+    with zipfile.ZipFile(wrapped) as zf:
+        assert zf.namelist() == ["a.txt"]
+
+
+def test_as_buffer_and_digest_do_not_depend_on_the_source_kind(tmp_path):
+    data = b"resume bytes"
+    path = tmp_path / "r.txt"
+    path.write_bytes(data)
+    expected = hashlib.sha256(data).hexdigest()
+    assert bytes(as_buffer(bytearray(data))) == data
+    assert source_digest(str(path)) == source_digest(memoryview(data)) == source_digest(io.BytesIO(data)) == expected
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_txt_buffers_are_decoded_in_place(wrap, tmp_path):
+    raw = "Python – Docker\n".encode("utf-8") + b"\xff"
+    assert parse_document("cv.txt", wrap(raw)) == "Python – Docker\n"
+    path = tmp_path / "cv.txt"
+    path.write_bytes(raw)
+    assert parse_document("cv.TXT", os.fspath(path)) == "Python – Docker\n"
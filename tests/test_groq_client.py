@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from resume_skill_extractor.groq_client import GroqAPIError, GroqClient, TokenBucket, parse_retry_after
+
+
+class FakeGroq:
+    """OpenAI-compatible /chat/completions that replays scripted (status, headers, body) replies."""
+
+    def __init__(self, replies=()):
+        self.replies = list(replies)
+        self.requests = []  # (client port, payload, authorization)
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append((self.client_address[1], payload, self.headers["Authorization"]))
+                status, headers, body = fake.replies.pop(0) if fake.replies else (200, {}, fake.answer(payload))
+                body = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def answer(payload):
+        text = payload["messages"][0]["content"].upper()
+        if not payload.get("stream"):
+            return json.dumps({"choices": [{"message": {"content": text}}]})
+        events = [{"choices": [{"delta": {"content": ch}}]} for ch in text] + [{"choices": []}]
+        return "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake():
+    server = FakeGroq()
+    yield server
+    server.close()
+
+
+def client_for(fake, **kwargs):
+    kwargs = {"max_retries": 2, "backoff_base": 0.01, "requests_per_minute": 0, **kwargs}
+    return GroqClient("test-key", base_url=fake.url, **kwargs)
+
+
+def test_chat_reuses_one_pooled_connection(fake):
+    client = client_for(fake)
+    assert [client.chat(p, "m") for p in ("a", "b", "c")] == ["A", "B", "C"]
+    assert len({port for port, _, _ in fake.requests}) == 1
+    assert all(auth == "Bearer test-key" for _, _, auth in fake.requests)
+    assert fake.requests[0][1]["model"] == "m"
+    client.close()
+
+
+def test_retries_transient_errors_honoring_retry_after(fake):
+    fake.replies = [(429, {"Retry-After": "0"}, "slow down"), (503, {}, "busy")]
+    client = client_for(fake)
+    assert client.chat("ok", "m") == "OK"
+    assert len(fake.requests) == 3
+
+
+def test_gives_up_after_max_retries_and_on_client_errors(fake):
+    fake.replies = [(500, {}, "boom")] * 3
+    with pytest.raises(GroqAPIError) as err:
+        client_for(fake).chat("x", "m")
+    assert err.value.status_code == 500 and len(fake.requests) == 3
+
+    fake.requests.clear()
+    fake.replies = [(400, {}, "bad request")]
+    with pytest.raises(GroqAPIError) as err:
+        client_for(fake).chat("x", "m")
+    assert err.value.status_code == 400 and err.value.body == "bad request" and len(fake.requests) == 1
+
+
+def test_connection_errors_are_retried_then_raised(fake):
+    url = fake.url
+    fake.close()
+    client = GroqClient("k", base_url=url, max_retries=1, backoff_base=0.01, requests_per_minute=0)
+    with pytest.raises(GroqAPIError, match="request failed"):
+        client.chat("x", "m")
+
+
+def test_stream_chat_yields_deltas(fake):
+    client = client_for(fake)
+    assert list(client.stream_chat("hey", "m")) == ["H", "E", "Y"]
+    assert fake.requests[0][1]["stream"] is True
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) is None and parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_token_bucket_limits_bursts():
+    bucket = TokenBucket(rate=20.0, capacity=2)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # Two tokens are free; the next two wait 1/20 s each
+    assert time.monotonic() - start >= 0.09
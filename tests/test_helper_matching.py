@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from jd_skill_gap_analyzer import helper
+from jd_skill_gap_analyzer.helper import cosine_sim, find_matches, match_skills
+
+DIM = 12
+
+
+def reference_matches(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold):
+    """The per-pair loop find_matches used before it was vectorized."""
+    matched_skills, missing_skills = [], []
+    for j, jd_skill in enumerate(jd_skills):
+        best_sim, best_resume_skill = 0, None
+        for i, resume_skill in enumerate(resume_skills):
+            sim = cosine_sim(resume_vectors[i], jd_vectors[j])
+            if sim > best_sim:
+                best_sim, best_resume_skill = sim, resume_skill
+        if best_sim >= threshold:
+            matched_skills.append((jd_skill, best_resume_skill, round(best_sim, 3)))
+        else:
+            missing_skills.append(jd_skill)
+    additional_skills = [skill for skill in resume_skills if skill not in jd_skills]
+    score = round((len(matched_skills) / len(jd_skills)) * 100, 2)
+    return matched_skills, missing_skills, additional_skills, score
+
+
+def assert_same(got, want):
+    matched, missing, additional, score = got
+    want_matched, want_missing, want_additional, want_score = want
+    assert [(jd, rs) for jd, rs, _ in matched] == [(jd, rs) for jd, rs, _ in want_matched]
+    assert [sim for _, _, sim in matched] == pytest.approx([sim for _, _, sim in want_matched], abs=1e-3)
+    assert missing == want_missing
+    assert additional == want_additional
+    assert score == want_score
+
+
+@pytest.fixture(autouse=True)
+def no_taxonomy(monkeypatch):
+    # Taxonomy mapping is an opt-in extension the old loop never had
+    monkeypatch.setattr(helper, "taxonomy_labels", lambda skills, vectors: None)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("threshold", [0.0, 0.3, 0.7])
+def test_find_matches_equals_the_per_pair_loop(seed, threshold):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(4, DIM))
+    resume_skills = [f"r{i}" for i in range(rng.integers(1, 15))]
+    jd_skills = [f"j{i}" for i in range(rng.integers(1, 10))] + resume_skills[:2]
+    # Correlated vectors so every threshold sees both matches and misses
+    resume_vectors = np.stack([base[i % 4] + 0.5 * rng.normal(size=DIM) for i in range(len(resume_skills))])
+    jd_vectors = np.stack([base[j % 4] + 0.5 * rng.normal(size=DIM) for j in range(len(jd_skills))])
+
+    want = reference_matches(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold)
+    assert_same(find_matches(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold), want)
+    assert_same(match_skills(resume_skills, jd_skills, resume_vectors, jd_vectors, threshold)[:4], want)
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.7])
+def test_empty_resume_equals_the_per_pair_loop(threshold):
+    jd_skills = ["Python", "SQL"]
+    jd_vectors = np.random.default_rng(0).normal(size=(2, DIM))
+    resume_vectors = np.zeros((0, DIM))
+
+    want = reference_matches([], jd_skills, resume_vectors, jd_vectors, threshold)
+    assert_same(find_matches([], jd_skills, resume_vectors, jd_vectors, threshold), want)
+
+
+def test_threshold_zero_matches_without_a_resume_counterpart():
+    # The old loop matched every JD skill at threshold 0, with no resume counterpart
+    # when no similarity was positive
+    resume_vectors = np.array([[1.0, 0.0]])
+    jd_vectors = np.array([[-1.0, 0.0], [0.0, 1.0]])
+
+    got = find_matches(["Go"], ["Rust", "C"], resume_vectors, jd_vectors, 0.0)
+    assert_same(got, reference_matches(["Go"], ["Rust", "C"], resume_vectors, jd_vectors, 0.0))
+    assert [rs for _, rs, _ in got[0]] == [None, None]
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_helper_import_stays_light():
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "check_import_time.py"),
+         "--module", "jd_skill_gap_analyzer.helper"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
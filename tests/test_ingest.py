@@ -0,0 +1,104 @@
+import os
+import json
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from resume_skill_extractor import ingest
+from resume_skill_extractor.ingest import CorpusWriter, is_archive, iter_sources
+
+
+def record(i):
+    return {"id": f"r{i}.txt", "sha256": f"{i:064x}", "type": "txt", "bytes": 1, "chars": 1, "text": "x"}
+
+
+def write_txt(folder, names):
+    os.makedirs(folder, exist_ok=True)
+    for name in names:
+        with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+            f.write(f"resume {name}")
+
+
+def test_parquet_parts_are_written_whole(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(ingest, "PARQUET_ROWS_PER_PART", 2)
+    out = str(tmp_path / "corpus.parquet")
+    with CorpusWriter(out) as writer:
+        for i in range(5):
+            writer.write(record(i))
+    names = sorted(os.listdir(out))
+    assert len(names) == 3 and all(n.endswith(".parquet") for n in names)
+    assert CorpusWriter(out).known_hashes() == {record(i)["sha256"] for i in range(5)}
+
+
+def test_unreadable_part_is_quarantined(tmp_path):
+    pytest.importorskip("pyarrow")
+    out = tmp_path / "corpus.parquet"
+    with CorpusWriter(str(out)) as writer:
+        writer.write(record(1))
+    (out / "part-killed.parquet").write_bytes(b"PAR1 no footer")  # what a killed writer used to leave
+    (out / "part-killed2.parquet.tmp").write_bytes(b"PAR1")
+
+    assert CorpusWriter(str(out)).known_hashes() == {record(1)["sha256"]}
+    assert (out / "part-killed.parquet.corrupt").exists()
+    assert not (out / "part-killed.parquet").exists()
+
+
+def test_single_docx_is_not_an_archive(tmp_path):
+    docx = tmp_path / "resume.docx"
+    with zipfile.ZipFile(docx, "w") as archive:
+        archive.writestr("word/document.xml", "<w:document/>")
+    assert zipfile.is_zipfile(docx) and not is_archive(str(docx))
+    assert [item[0] for item in iter_sources(str(docx))] == ["resume.docx"]
+
+    archive_path = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("a.txt", "a")
+    assert is_archive(str(archive_path))
+    assert [item[0] for item in iter_sources(str(archive_path))] == ["a.txt"]
+
+
+class FakePool:
+    """Runs items inline; the first pool breaks on its `break_at`-th submit, like a worker dying between drains."""
+    created = []
+
+    def __init__(self, break_at=None):
+        self.break_at = break_at
+        self.submits = 0
+        FakePool.created.append(self)
+
+    def submit(self, fn, *args):
+        self.submits += 1
+        if self.break_at is not None and self.submits >= self.break_at:
+            raise BrokenProcessPool("A child process terminated abruptly")
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_broken_pool_on_submit_is_recorded_per_file(tmp_path, monkeypatch):
+    FakePool.created = []
+    monkeypatch.setattr(ingest, "_make_pool", lambda workers: FakePool(break_at=3 if not FakePool.created else None))
+    source = str(tmp_path / "resumes")
+    write_txt(source, [f"{i}.txt" for i in range(6)])
+    out = str(tmp_path / "corpus.jsonl")
+
+    # workers=4 gives a window of 16 files, so every file stays in flight until the final drain
+    counts = ingest.ingest(source, out, workers=4)
+
+    assert len(FakePool.created) == 2
+    # The two files in flight when the pool broke fail; the rest, including the one being submitted, succeed
+    assert counts == {"total": 6, "written": 4, "skipped": 0, "failed": 2}
+    with open(out + ".errors.jsonl", encoding="utf-8") as f:
+        errors = [json.loads(line) for line in f]
+    assert [e["id"] for e in errors] == ["0.txt", "1.txt"]
+    assert all(e["error"] == "worker process crashed" for e in errors)
+
+    # The failed files are retried on the next run
+    FakePool.created = [None]
+    assert ingest.ingest(source, out, workers=4) == {"total": 6, "written": 2, "skipped": 4, "failed": 0}
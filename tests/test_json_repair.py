@@ -0,0 +1,78 @@
+import pytest
+
+from resume_skill_extractor.json_repair import parse_with_repair, repair_skills_json
+
+KEY = "resume_skills"
+
+
+@pytest.mark.parametrize("raw, status", [
+    ('{"resume_skills": ["Python", "Docker"]}', "ok"),
+    ('Here you go:\n```json\n{"resume_skills": ["Python", "Docker"]}\n```', "repaired"),
+    ('{"resume_skills": ["Python", "Docker",],}', "repaired"),
+    ("{resume_skills: ['Python', 'Docker']}", "repaired"),
+    ('Sure. {"Resume_Skills": [“Python”, “Docker”]} Hope that helps {', "repaired"),
+    ('{"resume_skills": ["Python", "Docker", "Kub', "partial"),
+    ("- Python\n- Docker", "partial"),
+])
+def test_local_repairs(raw, status):
+    assert repair_skills_json(raw, KEY) == (["Python", "Docker"], status)
+
+
+def test_nothing_recoverable():
+    assert repair_skills_json("I cannot help with that.", KEY) == (None, "failed")
+    assert parse_with_repair("", KEY, reprompt=lambda p: pytest.fail("re-prompted")) is None
+
+
+def test_readable_replies_are_not_reprompted():
+    def reprompt(prompt):
+        raise AssertionError("re-prompted")
+
+    assert parse_with_repair('```json\n{"resume_skills": ["Python",]}\n```', KEY, reprompt) == ["Python"]
+    # A closed array missing only its closing brace has no unread tail
+    assert parse_with_repair('{"resume_skills": ["Python", "Docker"]', KEY, reprompt) == ["Python", "Docker"]
+
+
+def test_truncated_reply_reprompts_only_the_tail_and_merges():
+    prompts = []
+
+    def reprompt(prompt):
+        prompts.append(prompt)
+        return '{"resume_skills": ["Kubernetes", "docker"]}'
+
+    raw = '{"resume_skills": ["Python", "Docker", "Kuber'
+    assert parse_with_repair(raw, KEY, reprompt) == ["Python", "Docker", "Kubernetes"]
+    assert len(prompts) == 1
+    tail = prompts[0].split("Text:\n", 1)[1]
+    assert "Kuber" in tail and "Python" not in tail and "Docker" not in tail
+
+
+def test_failed_reply_reprompts_from_the_json_on():
+    prompts = []
+
+    def reprompt(prompt):
+        prompts.append(prompt)
+        return '["Python"]'
+
+    raw = "Long preamble the model should not see again. {resume_skills: Python"
+    assert parse_with_repair(raw, KEY, reprompt) == ["Python"]
+    assert "preamble" not in prompts[0] and "{resume_skills: Python" in prompts[0]
+
+
+def test_reply_without_json_is_retried_once_then_fails():
+    retries = []
+
+    def retry():
+        retries.append(1)
+        return "Sorry, I still cannot help."
+
+    refusal = "I cannot extract skills from this document."
+    assert parse_with_repair(refusal, KEY, reprompt=lambda p: pytest.fail("re-prompted"), retry=retry) is None
+    assert retries == [1]
+    # Without a retry callback a refusal is a plain failure, never a repair prompt
+    assert parse_with_repair(refusal, KEY, reprompt=lambda p: pytest.fail("re-prompted")) is None
+
+
+def test_retried_reply_goes_through_the_usual_repairs():
+    reply = '```json\n{"resume_skills": ["Python", "Docker",]}\n```'
+    assert parse_with_repair("No.", KEY, retry=lambda: reply) == ["Python", "Docker"]
+    assert parse_with_repair("No.", KEY, retry=lambda: None) is None
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import sqlite3
+import subprocess
+import threading
+
+import pytest
+
+from resume_skill_extractor import llm_cache
+from resume_skill_extractor.llm_cache import LLMResponseCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import sys
+from resume_skill_extractor.llm_cache import LLMResponseCache
+cache = LLMResponseCache(sys.argv[1], max_entries=10_000)
+for i in range(300):
+    key = f"prompt {i % 150}"
+    if cache.get("groq", "m", key) is None:
+        cache.set("groq", "m", key, f"answer {i % 150}")
+    assert cache.get("groq", "m", key) == f"answer {i % 150}"
+cache.flush()
+"""
+
+
+@pytest.fixture(autouse=True)
+def no_background_flush(monkeypatch):
+    monkeypatch.setattr(llm_cache, "FLUSH_EVERY", 1000)
+    monkeypatch.setattr(llm_cache, "FLUSH_SECONDS", 1000)
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "c.sqlite3"), ttl_seconds=0.05)
+    cache.set("groq", "m", "p", "r")
+    assert cache.get("groq", "m", "p") == "r"
+    time.sleep(0.1)
+    assert cache.get("groq", "m", "p") is None
+    stats = cache.stats()  # flushes the expired key
+    assert stats["entries"] == 0 and stats["hits"] == 1 and stats["misses"] == 1
+    cache.set("groq", "m", "p", "fresh")
+    assert cache.get("groq", "m", "p") == "fresh"
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "c.sqlite3"), max_entries=3)
+    for prompt in "abc":
+        cache.set("groq", "m", prompt, prompt.upper())
+        time.sleep(0.01)
+    assert cache.get("groq", "m", "a") == "A"  # buffered access time, written by the next set()
+    cache.set("groq", "m", "d", "D")
+    assert [cache.get("groq", "m", p) for p in "abcd"] == ["A", None, "C", "D"]
+    assert cache.stats()["entries"] == 3
+
+
+def test_reads_do_not_wait_for_the_write_lock(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    cache = LLMResponseCache(path)
+    cache.set("groq", "m", "p", "r")
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        result = []
+        reader = threading.Thread(target=lambda: result.append([cache.get("groq", "m", "p") for _ in range(50)]))
+        reader.start()
+        reader.join(5)
+        assert result == [["r"] * 50]
+    finally:
+        writer.execute("ROLLBACK")
+    assert cache.stats()["total_hits"] == 50
+
+
+def test_two_processes_share_the_cache(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    procs = [subprocess.Popen([sys.executable, "-c", WORKER, path], env=env, stderr=subprocess.PIPE)
+             for _ in range(2)]
+    for proc in procs:
+        _, err = proc.communicate(timeout=60)
+        assert proc.returncode == 0, err.decode()
+
+    stats = LLMResponseCache(path).stats()
+    assert stats["entries"] == 150
+    # Two gets per iteration; each prompt misses once, or once per worker when both race on it
+    assert stats["total_hits"] + stats["total_misses"] == 1200
+    assert 150 <= stats["total_misses"] <= 300
@@ -0,0 +1,126 @@
+import time
+import threading
+
+import pytest
+
+from resume_skill_extractor.llm_router import LLMRouter, backend_slots
+
+
+def test_probe_runs_outside_the_router_lock():
+    router = LLMRouter(health_ttl=60)
+    probing, release = threading.Event(), threading.Event()
+
+    def slow_probe():
+        probing.set()
+        release.wait(5)
+        return True
+
+    router.register("slow", lambda *a: "ok", probe=slow_probe)
+    router.register("fast", lambda *a: "ok")
+    worker = threading.Thread(target=router.candidates)
+    worker.start()
+    try:
+        assert probing.wait(5)
+        # Recording another call's outcome and reading stats must not wait for the probe
+        done = threading.Event()
+        threading.Thread(target=lambda: (router.record("fast", 0.1, failed=False), router.stats(), done.set())).start()
+        assert done.wait(1)
+    finally:
+        release.set()
+        worker.join(5)
+    assert [b.name for b in router.candidates()] == ["slow", "fast"]
+
+
+def test_half_open_admits_a_single_trial_call():
+    router = LLMRouter(failure_threshold=1, cooldown=0)
+    entered, release = threading.Event(), threading.Event()
+    calls = []
+
+    def flaky(prompt, model_choice, api_key):
+        calls.append(prompt)
+        if prompt == "first":
+            return None  # fails and opens the circuit
+        entered.set()
+        release.wait(5)
+        return "recovered"
+
+    router.register("flaky", flaky)
+    router.register("backup", lambda *a: "backup")
+    router.call("first", "m", None)
+    assert router.stats()["flaky"]["state"] == "half-open"
+
+    results = {}
+    trial = threading.Thread(
+        target=lambda: results.setdefault("trial", router.call("trial", "m", None, prefer="flaky")))
+    trial.start()
+    assert entered.wait(5)
+    # While the trial is in flight, other calls skip the half-open backend
+    assert router.call("other", "m", None, prefer="flaky") == "backup"
+    assert "flaky" not in [b.name for b in router.candidates()]
+    release.set()
+    trial.join(5)
+
+    assert results["trial"] == "recovered"
+    assert calls == ["first", "trial"]
+    assert router.stats()["flaky"]["state"] == "closed"
+
+
+def test_failed_trial_reopens_the_circuit():
+    router = LLMRouter(failure_threshold=1, cooldown=60)
+    router.register("down", lambda *a: None)
+    router.call("p", "m", None)
+    assert router.stats()["down"]["state"] == "open"
+    assert not router.admit("down")
+
+
+def test_cache_hits_are_not_recorded_as_backend_latency(monkeypatch, tmp_path):
+    pytest.importorskip("langchain_community")
+    from resume_skill_extractor import skill_extractor
+    from resume_skill_extractor.llm_cache import LLMResponseCache
+
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"))
+    monkeypatch.setattr(skill_extractor, "get_llm_cache", lambda: cache)
+    router = LLMRouter()
+    backend_calls = []
+    router.register("groq", skill_extractor._caching(
+        "groq", lambda prompt, model_choice, api_key: backend_calls.append(prompt) or "reply"), needs_api_key=True)
+    monkeypatch.setattr(skill_extractor, "get_router", lambda: router)
+
+    for _ in range(3):
+        assert skill_extractor.run_prompt("same prompt", "m", "key") == "reply"
+    assert backend_calls == ["same prompt"]
+    assert router.stats()["groq"]["calls"] == 1
+
+
+def test_backend_slots_cap_the_backend_actually_called():
+    router = LLMRouter()
+    active, peak, lock = {"down": 0, "slow": 0}, {"down": 0, "slow": 0}, threading.Lock()
+
+    def backend(name, result):
+        def call(prompt, model_choice, api_key):
+            with lock:
+                active[name] += 1
+                peak[name] = max(peak[name], active[name])
+            time.sleep(0.02)
+            with lock:
+                active[name] -= 1
+            return result
+        return call
+
+    router.register("down", backend("down", None))  # preferred first, but every call falls through
+    router.register("slow", backend("slow", "ok"))
+    slots = {"down": threading.BoundedSemaphore(4), "slow": threading.BoundedSemaphore(2)}
+
+    def job():
+        token = backend_slots.set(slots)
+        try:
+            return router.call("p", "m", None)
+        finally:
+            backend_slots.reset(token)
+
+    threads = [threading.Thread(target=job) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert peak["slow"] == 2 and 1 <= peak["down"] <= 4
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from jd_skill_gap_analyzer.micro_batcher import MicroBatcher
+
+
+def echo(texts):
+    return [f"v:{t}" for t in texts]
+
+
+def test_concurrent_callers_get_their_own_vectors_in_order():
+    batcher = MicroBatcher(echo, max_batch_size=16, max_wait_ms=20)
+    requests = [[f"{c}-{i}" for i in range(1 + c % 5)] for c in range(24)]
+    results = [None] * len(requests)
+    start = threading.Barrier(len(requests))
+
+    def caller(c):
+        start.wait()
+        results[c] = batcher(requests[c])
+
+    threads = [threading.Thread(target=caller, args=(c,)) for c in range(len(requests))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    assert results == [echo(texts) for texts in requests]
+    stats = batcher.stats()
+    assert stats["requests"] == len(requests)
+    assert stats["batches"] < len(requests)
+    assert stats["max_batch"] <= 16
+
+
+def test_batch_failure_reaches_every_waiting_caller():
+    calls = []
+
+    def fn(texts):
+        calls.append(list(texts))
+        if len(calls) == 1:
+            raise ValueError("model down")
+        return echo(texts)
+
+    batcher = MicroBatcher(fn, max_batch_size=64, max_wait_ms=200)
+    futures = [batcher.submit([f"t{i}", f"u{i}"]) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError, match="model down"):
+            future.result(timeout=5)
+    assert len(calls) == 1 and len(calls[0]) == 6
+
+    # The worker survives a failed batch
+    assert batcher(["again"]) == ["v:again"]
+    batcher.close()
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    batcher = MicroBatcher(echo, max_batch_size=64, max_wait_ms=30)
+    started = time.monotonic()
+    assert batcher.submit(["lonely"]).result(timeout=5) == ["v:lonely"]
+    # The worker waits out max_wait for company, then runs the partial batch
+    assert 0.025 <= time.monotonic() - started < 2
+    batcher.close()
+    assert batcher.stats()["batches"] == 1
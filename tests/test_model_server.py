@@ -0,0 +1,133 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from resume_skill_extractor import model_server
+from resume_skill_extractor.model_server import ModelServerError, remote_embed
+
+
+class FakeServer:
+    """
+    Minimal /health + /embed server; `rows_delta` makes it send a wrong number of rows.
+    With `keep_alive` it speaks HTTP/1.1; `drop_idle` then closes every connection after
+    one response without saying so, like a server timing out idle keep-alive connections.
+    """
+
+    def __init__(self, namespace="test-model", dim=4, rows_delta=0, keep_alive=False):
+        self.namespace, self.dim, self.rows_delta = namespace, dim, rows_delta
+        self.requests = []
+        self.peers = set()
+        self.drop_idle = False
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" if keep_alive else "HTTP/1.0"
+
+            def _send(self, body, headers=None):
+                fake.peers.add(self.client_address)
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(body)
+                if fake.drop_idle:
+                    self.close_connection = True
+
+            def do_GET(self):
+                fake.requests.append(self.path)
+                self._send(json.dumps({"embedding_namespace": fake.namespace}).encode())
+
+            def do_POST(self):
+                fake.requests.append(self.path)
+                texts = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["texts"]
+                rows = len(texts) + fake.rows_delta
+                body = np.ones((rows, fake.dim), dtype="<f4").tobytes()
+                self._send(body, {"X-Rows": rows, "X-Dim": fake.dim})
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_client_state(monkeypatch):
+    monkeypatch.setattr(model_server, "_backoff", {})
+    monkeypatch.setattr(model_server, "_namespaces", {})
+    monkeypatch.setattr(model_server, "_local", threading.local())
+
+
+@pytest.fixture
+def server():
+    fake = FakeServer()
+    yield fake
+    fake.close()
+
+
+def test_namespace_is_checked_once_per_url(server):
+    for _ in range(3):
+        assert remote_embed(["a", "b"], server.url, namespace="test-model", dim=4).shape == (2, 4)
+    assert server.requests == ["/health", "/embed", "/embed", "/embed"]
+
+
+def test_other_namespace_is_refused(server):
+    with pytest.raises(ModelServerError, match="other-model"):
+        remote_embed(["a"], server.url, namespace="other-model")
+    assert "/embed" not in server.requests
+
+
+def test_wrong_shape_is_refused(server):
+    with pytest.raises(ModelServerError):
+        remote_embed(["a"], server.url, namespace="test-model", dim=8)
+    server.rows_delta = -1
+    with pytest.raises(ModelServerError):
+        remote_embed(["a", "b"], server.url, namespace="test-model", dim=4)
+
+
+def test_unreachable_server_is_skipped_during_backoff(server, monkeypatch):
+    monkeypatch.setattr(model_server, "MODEL_SERVER_BACKOFF", 60)
+    url = server.url
+    server.close()
+    with pytest.raises(ModelServerError, match="failed"):
+        remote_embed(["a"], url)
+    # The next call fails fast instead of trying the server again
+    with pytest.raises(ModelServerError, match="skipped"):
+        remote_embed(["a"], url)
+    assert model_server._backoff[url][0] == 1
+
+
+def test_requests_reuse_one_connection_per_thread():
+    server = FakeServer(keep_alive=True)
+    try:
+        for _ in range(3):
+            remote_embed(["a"], server.url, namespace="test-model")
+        assert len(server.requests) == 4 and len(server.peers) == 1
+
+        other = threading.Thread(target=remote_embed, args=(["b"], server.url))
+        other.start()
+        other.join()
+        assert len(server.peers) == 2
+    finally:
+        server.close()
+
+
+def test_connection_closed_by_the_server_is_redialed():
+    server = FakeServer(keep_alive=True)
+    server.drop_idle = True
+    try:
+        for _ in range(3):
+            assert remote_embed(["a"], server.url).shape == (1, 4)
+        assert server.requests == ["/embed"] * 3 and len(server.peers) == 3
+        assert server.url not in model_server._backoff
+    finally:
+        server.close()
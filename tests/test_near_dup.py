@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from resume_skill_extractor import near_dup
+from resume_skill_extractor.near_dup import (
+    NearDuplicateIndex, estimated_similarity, find_prior_extraction, group_near_duplicates, lsh_bands,
+    minhash_signature, remember_extraction, shingles, skills_still_present,
+)
+
+RESUME = ("Senior data engineer with eight years of experience building batch and streaming pipelines. "
+          "Designed ingestion services in Python on Kubernetes, scheduled with Airflow and provisioned "
+          "with Terraform. Led the migration of nightly reports to dbt models and mentored four juniors. ") * 3
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(near_dup, "_indexes", {})
+    monkeypatch.setattr(near_dup, "_stats", {"lookups": 0, "llm_calls_saved": 0})
+
+
+def test_shingles():
+    assert shingles("Python Docker") == {"python docker"}
+    assert shingles("a b c d") == {"a b c", "b c d"}
+
+
+def test_signature_similarity():
+    edited = RESUME.replace("four juniors", "five juniors", 1)
+    other = "Frontend developer focused on React, accessibility and design systems for retail websites."
+    sig = minhash_signature(RESUME)
+    assert sig.shape == (near_dup.NEAR_DUP_NUM_PERM,) and sig.dtype == np.uint64
+    assert estimated_similarity(sig, minhash_signature(RESUME)) == 1.0
+    assert estimated_similarity(sig, minhash_signature(edited)) > 0.8
+    assert estimated_similarity(sig, minhash_signature(other)) < 0.2
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+def test_lsh_bands_cover_the_permutations(threshold):
+    bands, rows = lsh_bands(threshold, 128)
+    assert bands * rows == 128
+    assert 1 - (1 - threshold ** rows) ** bands >= 0.99
+
+
+def test_index_query_and_eviction():
+    index = NearDuplicateIndex(threshold=0.9, num_perm=64, max_entries=2)
+    docs = [RESUME, "Nurse with ICU experience and BLS certification.", "Chef running a 40-seat kitchen."]
+    sigs = [minhash_signature(d, 64) for d in docs]
+    index.add(sigs[0], "first")
+    index.add(sigs[1], "second")
+    assert index.query(sigs[0]) == ("first", 1.0)  # marks "first" as recently matched
+    index.add(sigs[2], "third")  # evicts "second"
+    assert len(index) == 2
+    assert index.query(sigs[1]) is None
+    assert index.query(sigs[0])[0] == "first"
+    assert index.query(minhash_signature("Unrelated text about gardening", 64)) is None
+
+
+def test_group_near_duplicates():
+    edited = RESUME.replace("eight years", "nine years", 1)
+    assert group_near_duplicates([RESUME, "Chef running a kitchen.", edited, RESUME]) == [0, 1, 0, 0]
+
+
+def test_prior_extraction_is_reused_per_namespace():
+    namespace = ("resume_skills", "model", "auto")
+    signature, prior = find_prior_extraction(namespace, RESUME)
+    assert prior is None
+    remember_extraction(namespace, signature, ["Python", "Kubernetes"])
+    assert find_prior_extraction(namespace, RESUME + " Thanks.")[1] == ["Python", "Kubernetes"]
+    assert find_prior_extraction(("jd_skills", "model", "auto"), RESUME)[1] is None
+    assert near_dup.near_dup_stats()["llm_calls_saved"] == 1
+
+
+def test_reused_skills_must_still_be_mentioned():
+    prior = ["Python", "Kubernetes", "Apache Airflow", "Terraform", "dbt", "Mentoring", "Stakeholder Management"]
+    edited = RESUME.replace("Kubernetes", "virtual machines").replace("with Terraform", "by hand")
+    # Airflow is a dictionary alias of "Apache Airflow"; "mentoring" is spelled out in the text
+    assert skills_still_present(prior, edited.replace("mentored", "mentoring")) == [
+        "Python", "Apache Airflow", "dbt", "Mentoring"]
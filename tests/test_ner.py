@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from resume_skill_extractor import ner
+from resume_skill_extractor.ner import header_window
+
+
+class FakeNlp:
+    """Stands in for the spaCy pipeline: every capitalized word pair is a PERSON."""
+
+    def __init__(self):
+        self.piped = []
+
+    def _doc(self, text):
+        words = text.split()
+        ents = [SimpleNamespace(text=f"{a} {b}", label_="PERSON")
+                for a, b in zip(words, words[1:]) if a.istitle() and b.istitle()]
+        return SimpleNamespace(ents=ents + [SimpleNamespace(text="Acme", label_="ORG")])
+
+    def __call__(self, text):
+        return self._doc(text)
+
+    def pipe(self, texts, batch_size=64):
+        texts = list(texts)
+        self.piped.append(texts)
+        return [self._doc(t) for t in texts]
+
+
+@pytest.fixture
+def fake_nlp(monkeypatch):
+    nlp = FakeNlp()
+    monkeypatch.setattr(ner, "_nlp", nlp)
+    return nlp
+
+
+def test_header_window_caps_lines_then_chars():
+    text = "\n".join(f"line {i}" for i in range(100))
+    assert header_window(text) == "\n".join(f"line {i}" for i in range(30))
+    assert header_window(text, max_lines=3) == "line 0\nline 1\nline 2"
+    assert header_window("x" * 5000) == "x" * 1500
+    assert header_window("a\nb", max_chars=2) == "a\n"
+    assert header_window("") == "" and header_window(None) == ""
+
+
+def test_entities_filter_by_label(fake_nlp):
+    assert ner.entities("met Jane Doe at Acme", ["PERSON"]) == [("Jane Doe", "PERSON")]
+    assert ner.entities_batch(["Jane Doe", "x"], ["ORG"]) == [[("Acme", "ORG")], [("Acme", "ORG")]]
+
+
+def test_batch_name_fallback_runs_unresolved_headers_in_one_pass(fake_nlp, monkeypatch):
+    resume_parser = pytest.importorskip("resume_skill_extractor.resume_parser")
+    monkeypatch.setattr(resume_parser, "MODEL_SERVER_URL", "")
+    body = "\n".join(f"worked at acme on project {i}" for i in range(40))
+    texts = [
+        "Jane Doe\njane@example.com\n" + body,           # header line, no NER needed
+        "contact: jane@x.io\nwith Ada Lovelace\n" + body,  # NER on the header window
+        "",                                               # nothing to find
+        body + "\nmentor Alan Turing",                    # name past the header window
+    ]
+
+    names = resume_parser.extract_candidate_names_fallback(texts)
+
+    assert names == ["Jane Doe", "Ada Lovelace", "Candidate", "Candidate"]
+    assert len(fake_nlp.piped) == 1
+    assert fake_nlp.piped[0] == [header_window(t) for t in texts[1:]]
+    assert names == [resume_parser.extract_candidate_name_fallback(t) for t in texts]
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+sentence_transformers = pytest.importorskip("sentence_transformers")
+
+from jd_skill_gap_analyzer.embeddings import (  # noqa: E402
+    EMBEDDING_MODEL_NAME, OnnxEmbeddings, export_onnx_model,
+)
+
+SKILLS = ["Python", "Machine Learning", "Kubernetes", "CI/CD pipelines", "Stakeholder management",
+          "PostgreSQL query tuning", "React Native"]
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """SKILL_EMBEDDING_ONNX_DIR when set, otherwise a fresh export (skipped offline)."""
+    existing = os.getenv("SKILL_EMBEDDING_ONNX_DIR")
+    if existing:
+        return existing
+    pytest.importorskip("optimum.exporters.onnx")
+    out = str(tmp_path_factory.mktemp("minilm-onnx"))
+    try:
+        return export_onnx_model(out)
+    except OSError as exc:
+        pytest.skip(f"model not available: {exc}")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    try:
+        model = sentence_transformers.SentenceTransformer(EMBEDDING_MODEL_NAME)
+    except OSError as exc:
+        pytest.skip(f"model not available: {exc}")
+    return model.encode(SKILLS, normalize_embeddings=True)
+
+
+@pytest.mark.parametrize("model_file, min_cosine", [("model.onnx", 0.9999), ("model_quantized.onnx", 0.98)])
+def test_onnx_vectors_match_pytorch(model_dir, reference, model_file, min_cosine):
+    if not os.path.exists(os.path.join(model_dir, model_file)):
+        pytest.skip(f"{model_file} not exported")
+    vectors = OnnxEmbeddings(model_dir=model_dir, model_file=model_file, batch_size=3).embed_documents(SKILLS)
+    assert vectors.shape == reference.shape
+    cosines = np.sum(vectors * reference, axis=1)
+    assert cosines.min() >= min_cosine
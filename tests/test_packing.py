@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+pytest.importorskip("langchain_community")
+
+from resume_skill_extractor import near_dup, packing, skill_extractor  # noqa: E402
+from resume_skill_extractor.packing import (  # noqa: E402
+    build_packed_prompt, extract_pack, pack_documents, parse_packed, plan_packs,
+)
+
+RESUME = " ".join([
+    "Backend engineer building payment APIs in Python and Go lang, deployed with Docker on Kubernetes.",
+    "Owns the Terraform modules for the team and the on-call rotation for the ledger services.",
+    "Cut settlement batch time from four hours to twenty minutes by moving reconciliation to streaming jobs.",
+    "Introduced contract tests between the billing and invoicing services and halved integration failures.",
+    "Mentors two engineers, runs the weekly architecture review and writes the team's incident postmortems.",
+    "Previously built internal admin tools for a logistics startup and maintained its customer support portal.",
+    "Holds a degree in computer science and speaks at local meetups about reliability and payments.",
+])
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(near_dup, "_indexes", {})
+
+
+def test_pack_documents_respects_budget_and_count():
+    texts = ["short resume"] * 5 + ["x " * 3000, "short resume"]
+    packs = pack_documents(texts, token_budget=1000, max_documents=2)
+    assert [i for pack in packs for i in pack] == list(range(7))
+    assert packs[:3] == [[0, 1], [2, 3], [4]]
+    assert [5] in packs  # larger than the budget: alone in its pack
+
+
+def test_parse_packed_tolerates_wrapping_and_missing_ids():
+    prompt, ids = build_packed_prompt(["a", "b", "c"], "Resume")
+    assert ids == ["doc1", "doc2", "doc3"] and "=== Resume doc2 ===" in prompt
+    raw = '```json\n{"documents": {"doc1": ["Python", " "], "doc3": ["Go"],}}\n```'
+    assert parse_packed(raw, ids) == {"doc1": ["Python"], "doc3": ["Go"]}
+
+
+def test_missing_documents_are_split_and_retried(monkeypatch):
+    prompts = []
+
+    def fake_run_prompt(prompt, model_choice, api_key, prefer=None):
+        prompts.append(prompt)
+        if "doc4" in prompt:  # the first, full pack: answers only doc1
+            return json.dumps({"doc1": ["Python"]})
+        if "doc2" in prompt:  # the half with two documents
+            return json.dumps({"doc1": ["Go"], "doc2": ["Rust"]})
+        return json.dumps({"resume_skills": ["SQL"]})  # lone document: single prompt
+
+    monkeypatch.setattr(packing, "run_prompt", fake_run_prompt)
+    results = extract_pack(["r1", "r2", "r3", "r4"], "resume", "key", "model")
+    assert results == [["Python"], ["Go"], ["Rust"], ["SQL"]]
+    assert len(prompts) == 3
+
+
+def test_plan_packs_returns_signatures_and_drops_removed_skills():
+    namespace = ("resume_skills", "model", "augment")
+    edited = RESUME.replace("Terraform modules", "deployment scripts")
+    signature, _ = near_dup.find_prior_extraction(namespace, RESUME)
+    near_dup.remember_extraction(namespace, signature, ["Python", "Terraform", "On-call"])
+
+    local, compacted, packs, signatures = plan_packs([edited, "Chef running a kitchen."], "augment",
+                                                     namespace=namespace)
+    # The edit reuses the prior extraction without Terraform; only the other text is packed
+    assert "Terraform" not in local[0] and "Python" in local[0] and "On-call" in local[0]
+    assert packs == [[1]] and set(compacted) == {1} and set(signatures) == {1}
+
+
+def test_fill_near_duplicates_drops_removed_skills():
+    edited = RESUME.replace("Docker", "containers")
+    filled = skill_extractor.fill_near_duplicates([RESUME, edited], [0, 0], [["Python", "Docker", "Payments"]],
+                                                  mode="augment")
+    assert filled[0] == ["Python", "Docker", "Payments"]
+    assert "Docker" not in filled[1] and "Python" in filled[1]
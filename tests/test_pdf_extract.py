@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from resume_skill_extractor import pdf_extract  # noqa: E402
+from resume_skill_extractor.pdf_extract import extract_pdf_text, get_pdf_pool  # noqa: E402
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i} Python Docker")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(pdf_extract, "_pool", None)
+    yield
+    if pdf_extract._pool is not None:
+        pdf_extract._pool.shutdown(wait=True)
+
+
+def test_pool_is_sized_once_and_never_swapped(fresh_pool):
+    pool = get_pdf_pool(2)
+    assert get_pdf_pool(3) is pool and get_pdf_pool(2) is pool
+
+
+def test_concurrent_callers_with_different_worker_counts(fresh_pool):
+    data = make_pdf(8)
+    expected = extract_pdf_text(data, workers=1)
+    with ThreadPoolExecutor(4) as threads:
+        texts = list(threads.map(lambda w: extract_pdf_text(data, workers=w, pages_per_worker=2), [2, 3, 4, 2]))
+    assert texts == [expected] * 4
+    assert "Page 7 Python Docker" in expected
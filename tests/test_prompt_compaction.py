@@ -0,0 +1,78 @@
+import pytest
+
+from resume_skill_extractor import prompt_compaction
+from resume_skill_extractor.prompt_compaction import compact_text, compaction_stats, estimate_tokens
+
+RESUME = """Jane Doe
+jane@example.com | +1 415 555 0100 | linkedin.com/in/jane
+Skills
+• Python, SQL, Docker
+• Python, SQL, Docker
+Experience
+- Built ETL pipelines on Airflow (2019 - 2021)
+- Built ETL pipelines on Airflow (2019 - 2021)
+Hobbies
+Chess and hiking
+References
+Available on request
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(prompt_compaction, "_stats",
+                        {"documents": 0, "original_tokens": 0, "compacted_tokens": 0})
+
+
+def test_drops_low_value_sections_contacts_and_duplicates():
+    result = compact_text(RESUME, 1000)
+    assert result.text == ("Jane Doe\nSkills:\nPython, SQL, Docker\n"
+                           "Experience:\nBuilt ETL pipelines on Airflow (2019 - 2021)")
+    assert result.sections_kept == ["header", "skills", "experience"]
+    assert result.sections_dropped == ["hobbies", "references"]
+
+
+def test_inline_headings_and_untitled_text():
+    assert compact_text("Tech stack: Go, Kafka\nBenefits: free lunch", 100).text == "Skills:\nGo, Kafka"
+    result = compact_text("We need a Go developer.\nKafka a plus.", 100)
+    assert result.sections_kept == ["body"] and result.text == "We need a Go developer.\nKafka a plus."
+
+
+def test_tight_budget_keeps_skill_sections_first():
+    result = compact_text(RESUME, 12)
+    # Experience's line does not fit; the lower-priority header line still does
+    assert result.text == "Jane Doe\nSkills:\nPython, SQL, Docker"
+    assert result.sections_dropped == ["hobbies", "references", "experience"]
+
+
+def test_single_line_over_budget_is_cut_not_emptied():
+    text = " ".join(f"skill{i}" for i in range(2000))
+    result = compact_text(text, 100)
+    assert result.text and text.startswith(result.text) and not result.text.endswith("skill")
+    assert estimate_tokens(result.text) <= 100
+    assert result.sections_dropped == ["body (truncated)"]
+
+
+def test_long_line_does_not_block_later_lines():
+    text = "Skills\nPython, SQL\n" + "x" * 2000 + "\nDocker\nKubernetes"
+    result = compact_text(text, 40)
+    lines = result.text.split("\n")
+    assert lines[:3] == ["Skills:", "Python, SQL", lines[2]] and lines[2].startswith("xxx")
+    assert lines[3:] == ["Docker", "Kubernetes"]
+    assert result.sections_dropped == ["skills (truncated)"]
+
+
+def test_leftover_below_the_minimum_is_not_cut():
+    text = "Skills\nPython\n" + "y" * 400
+    result = compact_text(text, estimate_tokens("Python") + 1 + prompt_compaction.MIN_CUT_TOKENS)
+    assert result.text == "Skills:\nPython"
+
+
+def test_fully_dropped_document_falls_back_to_a_cut_and_stats_match():
+    text = "References\n" + "Available on request. " * 100
+    result = compact_text(text, 20)
+    assert result.text and text.startswith(result.text) and result.sections_kept == []
+    stats = compaction_stats()
+    assert stats["compacted_tokens"] == result.compacted_tokens == estimate_tokens(result.text)
+    assert stats["tokens_saved"] == result.tokens_saved
+    assert compact_text("", 20).text == ""
@@ -0,0 +1,35 @@
+import pytest
+
+from resume_skill_extractor.skill_canonical import (
+    SkillCanonicalizer, canonical_skill_id, canonicalize_skills, get_canonicalizer, skill_key,
+)
+
+
+@pytest.mark.parametrize("skill, expected", [
+    ("PyTorch 2.0", "PyTorch"),
+    ("py-torch", "PyTorch"),
+    ("python 3.11", "Python"),
+    ("Node.js v18", "Node.js"),
+    ("Angular 2+", "Angular"),
+    ("Vue.js 3.x", "Vue.js"),
+    ("Kubernetes (K8s)", "Kubernetes"),
+])
+def test_known_versioned_aliases_resolve_to_the_canonical(skill, expected):
+    assert get_canonicalizer().resolve(skill) == (skill_key(expected), expected)
+
+
+@pytest.mark.parametrize("skill", ["Web 3", "OAuth 2.0", "Industry 4.0", "Windows Server 2019"])
+def test_unknown_skills_keep_their_version(skill):
+    assert get_canonicalizer().resolve(skill) == (skill_key(skill), skill)
+
+
+def test_dedupe_on_canonical_ids():
+    assert canonicalize_skills(["pytorch", "PyTorch 2.0", " Node.js ", "nodejs", "OAuth 2.0", "OAuth"]) == \
+        ["PyTorch", "Node.js", "OAuth 2.0", "OAuth"]
+    assert canonical_skill_id("Industry 4.0") != canonical_skill_id("Industry")
+    assert canonical_skill_id("  ") is None
+
+
+def test_canonical_names_win_over_aliases():
+    canon = SkillCanonicalizer({"Go": ["golang"], "Golang Tools": ["go"]})
+    assert canon.resolve("GO")[1] == "Go" and canon.resolve("Golang 1.22")[1] == "Go"
@@ -0,0 +1,28 @@
+from resume_skill_extractor.skill_dictionary import extract_skills_local
+
+
+def test_word_boundaries():
+    assert extract_skills_local("JavaScript and PostgreSQL") == ["JavaScript", "PostgreSQL"]
+
+
+def test_length_changing_lowercase_keeps_case_insensitive_matching():
+    assert extract_skills_local("İstanbul. Python and DOCKER") == ["Python", "Docker"]
+    assert extract_skills_local("DOCKER, KUBERNETES İ") == ["Docker", "Kubernetes"]
+
+
+def test_names_and_seasons_are_not_skills():
+    header = "Ruby Jenkins\nSpring 2022 internship at Acme\nCassandra Lee, Swift Logistics"
+    assert extract_skills_local(header) == []
+
+
+def test_ambiguous_aliases_count_next_to_other_skills():
+    text = "Skills: Ruby, Jenkins, Docker, Cassandra\nBuilt services with Spring and Python in Spring 2022"
+    assert extract_skills_local(text) == ["Ruby", "Jenkins", "Docker", "Cassandra", "Spring Boot", "Python"]
+    assert extract_skills_local("Spring Boot") == ["Spring Boot"]
+
+
+def test_overlapping_matches_keep_the_longest():
+    assert extract_skills_local("Java Script and SQL") == ["JavaScript", "SQL"]
+    assert extract_skills_local("java script") == ["JavaScript"]
+    assert extract_skills_local("Java, JavaScript") == ["Java", "JavaScript"]
+    assert extract_skills_local("Spring Boot with Java") == ["Spring Boot", "Java"]
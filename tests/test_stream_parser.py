@@ -0,0 +1,38 @@
+import pytest
+
+from resume_skill_extractor.stream_parser import IncrementalSkillParser
+
+REPLY = ('Sure, "here" you go:\n```json\n{"summary": "not a skill", "resume_skills": '
+         '["Python", "C++", "Node.js", "say \\"hi\\"", "  "], "jd_skills": ["Go"]}\n```')
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(REPLY)])
+def test_chunk_boundaries_do_not_matter(size):
+    parser = IncrementalSkillParser("resume_skills")
+    out = []
+    for i in range(0, len(REPLY), size):
+        out.extend(parser.feed(REPLY[i:i + size]))
+    assert out == parser.skills == ["Python", "C++", "Node.js", 'say "hi"']
+    assert not parser.in_wanted_array
+
+
+def test_elements_arrive_as_soon_as_they_close():
+    parser = IncrementalSkillParser("resume_skills")
+    assert parser.feed('{"resume_skills": ["Pyt') == []
+    assert parser.feed('hon", "Dock') == ["Python"]
+    assert parser.feed('er"]}') == ["Docker"]
+
+
+def test_without_key_every_array_counts():
+    parser = IncrementalSkillParser()
+    parser.feed(REPLY)
+    assert parser.skills[-1] == "Go"
+
+
+def test_truncated_reply_reports_where_parsing_stopped():
+    raw = '{"resume_skills": ["Python", "Docker", "Kub'
+    parser = IncrementalSkillParser("resume_skills")
+    parser.feed(raw[:20])
+    parser.feed(raw[20:])
+    assert parser.in_wanted_array
+    assert raw[parser.parsed_until:] == ', "Kub'
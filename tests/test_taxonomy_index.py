@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from jd_skill_gap_analyzer import taxonomy_index
+from jd_skill_gap_analyzer.helper import match_skills
+from jd_skill_gap_analyzer.taxonomy_index import SkillTaxonomyIndex, taxonomy_labels
+
+
+def clustered(n, dim=16, centers=12, seed=0):
+    rng = np.random.default_rng(seed)
+    means = rng.normal(size=(centers, dim))
+    return (means[rng.integers(0, centers, n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+@pytest.fixture
+def index(tmp_path):
+    vectors = clustered(600)
+    return SkillTaxonomyIndex.build([f"skill{i}" for i in range(600)], vectors, str(tmp_path / "idx"),
+                                    nlist=12, backend="numpy", model_name="test-model")
+
+
+def reference_search(index, queries, k, nprobe):
+    """The per-query IVF scan: the probed clusters' rows, scored one query at a time."""
+    queries = taxonomy_index._unit_rows(queries)
+    probes = np.argpartition(-(queries @ index.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+    out = []
+    for row, clusters in enumerate(probes):
+        candidates = np.concatenate([np.arange(index.offsets[c], index.offsets[c + 1]) for c in clusters])
+        sims = np.asarray(index.vectors[candidates]) @ queries[row]
+        out.append(candidates[np.argsort(-sims)[:k]])
+    return out
+
+
+def test_batched_search_matches_per_query_scan(index):
+    queries = clustered(40, seed=1)
+    scores, ids = index.search(queries, k=5, nprobe=3)
+    assert scores.shape == ids.shape == (40, 5)
+    assert np.all(np.diff(scores, axis=1) <= 1e-6)
+    for row, expected in enumerate(reference_search(index, queries, 5, 3)):
+        assert ids[row].tolist() == expected.tolist()
+
+
+def test_probing_every_cluster_is_exact(index):
+    queries = clustered(20, seed=2)
+    _, ids = index.search(queries, k=3, nprobe=12)
+    _, exact = index.search_exact(queries, k=3)
+    assert np.array_equal(ids, exact)
+
+
+def test_fewer_candidates_than_k_are_padded(tmp_path):
+    small = SkillTaxonomyIndex.build(["a", "b", "c"], clustered(3), str(tmp_path / "small"), nlist=3,
+                                     backend="numpy")
+    scores, ids = small.search(clustered(2, seed=3), k=5, nprobe=1)
+    assert ids.shape == (2, 5)
+    assert np.all(ids[:, 1:] == -1) and np.all(np.isinf(scores[:, 1:]))
+
+
+def test_load_rejects_another_model(index):
+    assert SkillTaxonomyIndex.load(index.path, model_name="test-model").meta["model"] == "test-model"
+    with pytest.raises(ValueError, match="rebuild"):
+        SkillTaxonomyIndex.load(index.path, model_name="other-model")
+
+
+def test_taxonomy_mapping_in_match_skills(tmp_path, monkeypatch):
+    # Two taxonomy entries; skill vectors sit near one entry each but far from one another
+    base = np.eye(4, dtype=np.float32)
+    tax = SkillTaxonomyIndex.build(["Machine Learning", "Cooking"], base[:2], str(tmp_path / "tax"), nlist=1,
+                                   backend="numpy")
+    resume_vectors = np.array([[0.8, 0.0, 0.6, 0.0], [0.0, 1.0, 0.0, 0.0]], dtype=np.float32)
+    jd_vectors = np.array([[0.8, 0.0, 0.0, 0.6]], dtype=np.float32)  # cosine 0.64 to "ML models"
+    args = (["ML models", "Baking"], ["Statistical learning"], resume_vectors, jd_vectors)
+
+    monkeypatch.setattr(taxonomy_index, "TAXONOMY_MAPPING", False)
+    assert taxonomy_labels(["x"], base[:1]) is None
+    matched, missing, additional, _, _ = match_skills(*args)
+    assert matched == [] and missing == ["Statistical learning"]
+
+    monkeypatch.setattr(taxonomy_index, "TAXONOMY_MAPPING", True)
+    monkeypatch.setattr(taxonomy_index, "get_taxonomy_index", lambda: tax)
+    assert taxonomy_labels(["ML models", "Baking"], resume_vectors) == ["Machine Learning", "Cooking"]
+    matched, missing, additional, score, _ = match_skills(*args)
+    assert matched == [("Statistical learning", "ML models", 0.64)]
+    assert missing == [] and additional == ["Baking"] and score == 100.0